@@ -0,0 +1,103 @@
+#
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+#
+
+
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, List, Mapping
+
+
+logger = logging.getLogger("airbyte")
+
+# https://docs.aws.amazon.com/AWSSimpleQueueService/latest/APIReference/API_SendMessageBatch.html
+MAX_BATCH_ENTRIES = 10
+MAX_BATCH_BYTES = 256 * 1024
+
+MAX_SEND_ATTEMPTS = 5
+RETRY_BACKOFF_SECONDS = 0.5
+
+
+def message_size(message: Mapping[str, Any]) -> int:
+    # The body and the name, type and value of each attribute count towards the SQS payload limit
+    size = len(message["MessageBody"].encode("utf-8"))
+    for name, attribute in message.get("MessageAttributes", {}).items():
+        size += len(name.encode("utf-8")) + len(attribute["DataType"].encode("utf-8"))
+        size += len(attribute.get("StringValue", "").encode("utf-8"))
+    return size
+
+
+class SqsBatchSender:
+    """
+    Groups messages into SendMessageBatch requests, within the SQS limits of 10 messages and 256KB per batch,
+    and sends the batches on a pool of `max_concurrent_senders` threads.
+
+    When a batch partially fails, only the failed entries are sent again.
+    FIFO queues must receive the messages of a group in order, so their batches are always sent one at a time.
+    """
+
+    def __init__(
+        self, client, queue_url: str, max_batch_size: int = MAX_BATCH_ENTRIES, max_concurrent_senders: int = 1, fifo: bool = False
+    ):
+        self.client = client
+        self.queue_url = queue_url
+        self.max_batch_size = min(max(max_batch_size, 1), MAX_BATCH_ENTRIES)
+        self.max_concurrent_senders = 1 if fifo else max(max_concurrent_senders, 1)
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent_senders, thread_name_prefix="sqs-sender")
+        self._in_flight: List[Future] = []
+        self._batch: List[Mapping[str, Any]] = []
+        self._batch_bytes = 0
+
+    def add(self, message: Mapping[str, Any]) -> None:
+        size = message_size(message)
+        if self._batch and (len(self._batch) >= self.max_batch_size or self._batch_bytes + size > MAX_BATCH_BYTES):
+            self._submit_batch()
+
+        self._batch.append(message)
+        self._batch_bytes += size
+
+    def flush(self) -> None:
+        """
+        Sends the pending messages and waits until every batch was sent, raising the first error.
+        """
+        if self._batch:
+            self._submit_batch()
+
+        in_flight, self._in_flight = self._in_flight, []
+        for future in in_flight:
+            future.result()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _submit_batch(self) -> None:
+        entries = [{"Id": str(i), **message} for i, message in enumerate(self._batch)]
+        self._batch = []
+        self._batch_bytes = 0
+
+        # Bound the number of batches waiting to be sent so that reading doesn't outpace sending
+        while len(self._in_flight) >= 2 * self.max_concurrent_senders:
+            self._in_flight.pop(0).result()
+
+        self._in_flight.append(self._executor.submit(self.send_batch, entries))
+
+    def send_batch(self, entries: List[Mapping[str, Any]]) -> None:
+        for attempt in range(1, MAX_SEND_ATTEMPTS + 1):
+            response = self.client.send_message_batch(QueueUrl=self.queue_url, Entries=entries)
+            failed = response.get("Failed", [])
+            if not failed:
+                return
+
+            sender_faults = [failure for failure in failed if failure.get("SenderFault")]
+            if sender_faults:
+                raise Exception(f"Amazon SQS rejected messages: {sender_faults}")
+
+            if attempt == MAX_SEND_ATTEMPTS:
+                raise Exception(f"Failed to send {len(failed)} messages to Amazon SQS after {MAX_SEND_ATTEMPTS} attempts: {failed}")
+
+            logger.warning(f"Failed to send {len(failed)} of {len(entries)} messages to Amazon SQS, retrying them")
+            failed_ids = {failure["Id"] for failure in failed}
+            entries = [entry for entry in entries if entry["Id"] in failed_ids]
+            time.sleep(RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
@@ -14,6 +14,8 @@ from botocore.exceptions import ClientError
 from airbyte_cdk.destinations import Destination
 from airbyte_cdk.models import AirbyteConnectionStatus, AirbyteMessage, ConfiguredAirbyteCatalog, Status, Type
 
+from .batch_sender import MAX_BATCH_ENTRIES, SqsBatchSender
+
 
 class DestinationAmazonSqs(Destination):
     def queue_is_fifo(self, url: str) -> bool:
@@ -63,20 +65,6 @@ class DestinationAmazonSqs(Destination):
         #     message['MessageDeduplicationId'] = message_dedupe_id
         return message
 
-    # TODO: Support batch send
-    # def send_batch_messages(messages, queue):
-    #     entry = {
-    #         'Id': "1",
-    #         'MessageBody': str(record.data),
-    #     }
-    #     response = queue.send_messages(Entries=messages)
-    #     if 'Successful' in response:
-    #         for status in response['Successful']:
-    #             print("Message sent: " + status['MessageId'])
-    #     if 'Failed' in response:
-    #         for status in response['Failed']:
-    #             print("Message sent: " + status['MessageId'])
-
     # https://docs.aws.amazon.com/AWSSimpleQueueService/latest/APIReference/API_SendMessage.html
     def write(
         self, config: Mapping[str, Any], configured_catalog: ConfiguredAirbyteCatalog, input_messages: Iterable[AirbyteMessage]
@@ -85,10 +73,9 @@ class DestinationAmazonSqs(Destination):
         queue_url = config["queue_url"]
         queue_region = config["region"]
 
-        # TODO: Implement optional params for batch
         # Optional Properties
-        # max_batch_size = config.get("max_batch_size", 10)
-        # send_as_batch = config.get("send_as_batch", False)
+        max_batch_size = config.get("max_batch_size", MAX_BATCH_ENTRIES)
+        max_concurrent_senders = config.get("max_concurrent_senders", 1)
         message_delay = config.get("message_delay")
         message_body_key = config.get("message_body_key")
 
@@ -103,26 +90,46 @@ class DestinationAmazonSqs(Destination):
         sqs = session.resource("sqs")
         queue = sqs.Queue(url=queue_url)
 
+        # The queue attributes don't change during a sync, only load them once
+        is_fifo = self.queue_is_fifo(queue_url)
+        use_content_dedupe = False
+        if is_fifo:
+            use_content_dedupe = False if queue.attributes.get("ContentBasedDeduplication") == "false" else "true"
+
         # TODO: Make access/secret key optional, support public access & profiles
         # TODO: Support adding/setting attributes in the UI
         # TODO: Support extract a specific path as message attributes
 
-        for message in input_messages:
-            if message.type == Type.RECORD:
-                sqs_message = self.build_sqs_message(message.record, message_body_key)
+        # boto3 clients can be shared between threads, resources can't
+        sender = SqsBatchSender(
+            session.client("sqs"),
+            queue_url,
+            max_batch_size=max_batch_size,
+            max_concurrent_senders=max_concurrent_senders,
+            fifo=is_fifo,
+        )
+        try:
+            for message in input_messages:
+                if message.type == Type.RECORD:
+                    sqs_message = self.build_sqs_message(message.record, message_body_key)
 
-                if message_delay:
-                    sqs_message = self.set_message_delay(sqs_message, message_delay)
+                    if message_delay:
+                        sqs_message = self.set_message_delay(sqs_message, message_delay)
 
-                sqs_message = self.add_attributes_to_message(message.record, sqs_message)
+                    sqs_message = self.add_attributes_to_message(message.record, sqs_message)
 
-                if self.queue_is_fifo(queue_url):
-                    use_content_dedupe = False if queue.attributes.get("ContentBasedDeduplication") == "false" else "true"
-                    self.set_message_fifo_properties(sqs_message, message_group_id, use_content_dedupe)
+                    if is_fifo:
+                        self.set_message_fifo_properties(sqs_message, message_group_id, use_content_dedupe)
+
+                    sender.add(sqs_message)
+                if message.type == Type.STATE:
+                    # Only emit the state once every message received before it was sent
+                    sender.flush()
+                    yield message
 
-                self.send_single_message(queue, sqs_message)
-            if message.type == Type.STATE:
-                yield message
+            sender.flush()
+        finally:
+            sender.close()
 
     def check(self, logger: logging.Logger, config: Mapping[str, Any]) -> AirbyteConnectionStatus:
         try:
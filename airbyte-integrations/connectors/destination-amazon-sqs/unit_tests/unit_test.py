@@ -6,15 +6,17 @@ import json
 import logging
 import time
 from typing import Any, Mapping
+from unittest.mock import MagicMock
 
 import boto3
-from destination_amazon_sqs import DestinationAmazonSqs
+from destination_amazon_sqs import DestinationAmazonSqs, batch_sender
+from destination_amazon_sqs.batch_sender import SqsBatchSender
 
 # from airbyte_cdk.sources.source import Source
 from moto import mock_iam, mock_sqs
 from moto.core import set_initial_no_auth_action_count
 
-from airbyte_cdk.models import AirbyteMessage, ConfiguredAirbyteCatalog, Status
+from airbyte_cdk.models import AirbyteMessage, AirbyteRecordMessage, AirbyteStateMessage, ConfiguredAirbyteCatalog, Status, Type
 
 
 @mock_iam
@@ -225,3 +227,57 @@ def test_write():
         if time.time() > timeout:
             print("Timed out waiting for message after 20 seconds.")
             assert False
+
+
+@set_initial_no_auth_action_count(4)
+@mock_sqs
+@mock_iam
+def test_write_sends_batches():
+    user = create_user_with_all_permissions()
+    queue_region = "eu-west-1"
+    client = boto3.client(
+        "sqs", aws_access_key_id=user["AccessKeyId"], aws_secret_access_key=user["SecretAccessKey"], region_name=queue_region
+    )
+    queue_url = client.create_queue(QueueName="amazon-sqs-mock-batch-queue")["QueueUrl"]
+    config = create_config(queue_url, queue_region, user["AccessKeyId"], user["SecretAccessKey"], None)
+    config["max_concurrent_senders"] = 3
+    catalog = ConfiguredAirbyteCatalog(streams=get_catalog()["streams"])
+
+    records = [
+        AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="ab-airbyte-testing", data={"id": i}, emitted_at=0))
+        for i in range(25)
+    ]
+    state = AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data={"cursor": 25}))
+
+    output = list(DestinationAmazonSqs().write(config, catalog, records + [state]))
+    assert output == [state]
+
+    received = []
+    while True:
+        response = client.receive_message(QueueUrl=queue_url, MaxNumberOfMessages=10)
+        if not response.get("Messages"):
+            break
+        received.extend(json.loads(message["Body"])["id"] for message in response["Messages"])
+
+    assert sorted(received) == list(range(25))
+
+
+def test_batch_sender_limits_and_retries_failed_entries(monkeypatch):
+    monkeypatch.setattr(batch_sender, "RETRY_BACKOFF_SECONDS", 0)
+    client = MagicMock()
+    responses = iter([{"Failed": [{"Id": "0", "SenderFault": False, "Code": "InternalError"}]}])
+    client.send_message_batch.side_effect = lambda **kwargs: next(responses, {})
+    sender = SqsBatchSender(client, "queue-url")
+
+    for i in range(10):
+        sender.add({"MessageBody": f"message {i}"})
+    # too large to fit in the same batch as the next message
+    sender.add({"MessageBody": "x" * batch_sender.MAX_BATCH_BYTES})
+    sender.add({"MessageBody": "y"})
+    sender.flush()
+    sender.close()
+
+    sent_batches = [call.kwargs["Entries"] for call in client.send_message_batch.call_args_list]
+    assert [len(entries) for entries in sent_batches] == [10, 1, 1, 1]
+    assert sent_batches[1] == [{"Id": "0", "MessageBody": "message 0"}]
+    assert sent_batches[3] == [{"Id": "0", "MessageBody": "y"}]
@@ -1,10 +1,21 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 
 import requests
 import urllib3
+from requests.adapters import HTTPAdapter
+
+
+# the Data API accepts at most 20 documents per insertMany command
+MAX_DOCUMENTS_PER_INSERT = 20
+
+MAX_INSERT_ATTEMPTS = 3
+
+INSERT_RETRY_BACKOFF_SECONDS = 1
 
 
 class AstraClient:
@@ -15,6 +26,7 @@ class AstraClient:
         keyspace_name: str,
         embedding_dim: int,
         similarity_function: str,
+        max_concurrent_requests: int = 1,
     ):
         self.astra_endpoint = astra_endpoint
         self.astra_application_token = astra_application_token
@@ -29,19 +41,23 @@ class AstraClient:
             "User-Agent": "airbyte",
         }
 
+        # one keep-alive connection per concurrent request instead of a new connection for every command
+        self.max_concurrent_requests = max_concurrent_requests
+        self.session = requests.Session()
+        self.session.headers.update(self.request_header)
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrent_requests))
+
+    def _post(self, request_url: str, query: Dict) -> Dict:
+        response = self.session.post(request_url, data=json.dumps(query))
+        if response.status_code == 200:
+            return json.loads(response.text)
+        raise urllib3.exceptions.HTTPError(f"Astra DB not available. Status code: {response.status_code}, {response.text}")
+
     def _run_query(self, request_url: str, query: Dict):
-        try:
-            response = requests.request("POST", request_url, headers=self.request_header, data=json.dumps(query))
-            if response.status_code == 200:
-                response_dict = json.loads(response.text)
-                if "errors" in response_dict:
-                    raise Exception(f"Astra DB request error - {response_dict['errors']}")
-                else:
-                    return response_dict
-            else:
-                raise urllib3.exceptions.HTTPError(f"Astra DB not available. Status code: {response.status_code}, {response.text}")
-        except Exception:
-            raise
+        response_dict = self._post(request_url, query)
+        if "errors" in response_dict:
+            raise Exception(f"Astra DB request error - {response_dict['errors']}")
+        return response_dict
 
     def find_collections(self, include_detail: bool = True):
         query = {"findCollections": {"options": {"explain": include_detail}}}
@@ -120,10 +136,56 @@ class AstraClient:
         return result["status"]["insertedIds"][0]
 
     def insert_documents(self, collection_name: str, documents: List[Dict]) -> List[str]:
-        query = {"insertMany": {"documents": documents}}
-        result = self._run_query(self._build_collection_query(collection_name), query)
-
-        return result["status"]["insertedIds"]
+        """
+        Inserts the documents with one insertMany command per 20 documents, running up to
+        `max_concurrent_requests` commands in parallel. Returns the ids of the inserted documents.
+        """
+        if not documents:
+            return []
+        batches = [documents[i : i + MAX_DOCUMENTS_PER_INSERT] for i in range(0, len(documents), MAX_DOCUMENTS_PER_INSERT)]
+        if len(batches) == 1:
+            return self._insert_batch(collection_name, batches[0])
+
+        max_workers = min(self.max_concurrent_requests, len(batches))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="astra-insert") as executor:
+            futures = [executor.submit(self._insert_batch, collection_name, batch) for batch in batches]
+            try:
+                return [inserted_id for future in futures for inserted_id in future.result()]
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def _insert_batch(self, collection_name: str, documents: List[Dict]) -> List[str]:
+        """
+        Sends one unordered insertMany command and retries the documents that were not inserted.
+        Documents need an "_id" so that the failed ones can be told apart from the inserted ones.
+        """
+        request_url = self._build_collection_query(collection_name)
+        inserted_ids: List[str] = []
+        remaining = documents
+        errors: List = []
+        for attempt in range(1, MAX_INSERT_ATTEMPTS + 1):
+            try:
+                result = self._post(request_url, {"insertMany": {"documents": remaining, "options": {"ordered": False}}})
+            except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+                errors = [str(e)]
+            else:
+                batch_ids = result.get("status", {}).get("insertedIds", [])
+                inserted_ids.extend(batch_ids)
+                errors = result.get("errors", [])
+                inserted = set(batch_ids)
+                remaining = [document for document in remaining if document["_id"] not in inserted]
+                if not remaining:
+                    return inserted_ids
+                if attempt > 1 and errors and all(error.get("errorCode") == "DOCUMENT_ALREADY_EXISTS" for error in errors):
+                    # the documents were written by an earlier attempt whose response got lost
+                    return inserted_ids + [document["_id"] for document in remaining]
+            if attempt < MAX_INSERT_ATTEMPTS:
+                time.sleep(INSERT_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+        raise Exception(
+            f"Astra DB request error - failed to insert {len(remaining)} document(s) after {MAX_INSERT_ATTEMPTS} attempts: {errors}"
+        )
 
     def update_document(self, collection_name: str, filter: Dict, update: Dict, upsert: bool = True) -> Dict:
         query = {"findOneAndUpdate": {"filter": filter, "update": update, "options": {"returnDocument": "after", "upsert": upsert}}}
@@ -9,7 +9,7 @@ import urllib3
 
 from airbyte_cdk.destinations.vector_db_based.document_processor import METADATA_RECORD_ID_FIELD, METADATA_STREAM_FIELD
 from airbyte_cdk.destinations.vector_db_based.indexer import Indexer
-from airbyte_cdk.destinations.vector_db_based.utils import create_chunks, create_stream_identifier, format_exception
+from airbyte_cdk.destinations.vector_db_based.utils import create_stream_identifier, format_exception
 from airbyte_cdk.models.airbyte_protocol import ConfiguredAirbyteCatalog, DestinationSyncMode
 from destination_astra.astra_client import AstraClient
 from destination_astra.config import AstraIndexingModel
@@ -30,7 +30,12 @@ class AstraIndexer(Indexer):
         super().__init__(config)
 
         self.client = AstraClient(
-            config.astra_db_endpoint, config.astra_db_app_token, config.astra_db_keyspace, embedding_dimensions, "cosine"
+            config.astra_db_endpoint,
+            config.astra_db_app_token,
+            config.astra_db_keyspace,
+            embedding_dimensions,
+            "cosine",
+            max_concurrent_requests=PARALLELISM_LIMIT,
         )
 
         self.embedding_dimensions = embedding_dimensions
@@ -60,11 +65,9 @@ class AstraIndexer(Indexer):
                 **metadata,
             }
             docs.append(doc)
-        serial_batches = create_chunks(docs, batch_size=PARALLELISM_LIMIT)
-
-        for batch in serial_batches:
-            results = [chunk for chunk in batch]
-            self.client.insert_documents(collection_name=self.config.collection, documents=results)
+        if docs:
+            # the client splits the documents into insertMany commands and sends up to PARALLELISM_LIMIT of them at once
+            self.client.insert_documents(collection_name=self.config.collection, documents=docs)
 
     def delete(self, delete_ids, namespace, stream):
         if len(delete_ids) > 0:
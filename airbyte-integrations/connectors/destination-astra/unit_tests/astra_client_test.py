@@ -0,0 +1,119 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import urllib3
+from destination_astra.astra_client import MAX_INSERT_ATTEMPTS, AstraClient
+
+
+def create_client(max_concurrent_requests=4):
+    client = AstraClient(
+        "https://8292d414-dd1b-4c33-8431-e838bedc04f7-us-east1.apps.astra.datastax.com",
+        "mytoken",
+        "mykeyspace",
+        3,
+        "cosine",
+        max_concurrent_requests=max_concurrent_requests,
+    )
+    client._post = MagicMock()
+    return client
+
+
+def create_documents(count):
+    return [{"_id": f"id{i}", "$vector": [i, i, i]} for i in range(count)]
+
+
+def insert_all(url, query):
+    return {"status": {"insertedIds": [document["_id"] for document in query["insertMany"]["documents"]]}}
+
+
+def test_insert_documents_splits_into_commands_of_20():
+    client = create_client()
+    client._post.side_effect = insert_all
+
+    inserted_ids = client.insert_documents("mycollection", create_documents(50))
+
+    assert inserted_ids == [f"id{i}" for i in range(50)]
+    sizes = sorted(len(call.args[1]["insertMany"]["documents"]) for call in client._post.call_args_list)
+    assert sizes == [10, 20, 20]
+    for call in client._post.call_args_list:
+        assert call.args[0].endswith("/api/json/v1/mykeyspace/mycollection")
+        assert call.args[1]["insertMany"]["options"] == {"ordered": False}
+
+
+def test_insert_documents_runs_commands_concurrently():
+    client = create_client(max_concurrent_requests=3)
+    in_flight = []
+    max_in_flight = []
+    lock = threading.Lock()
+
+    def slow_insert(url, query):
+        with lock:
+            in_flight.append(1)
+            max_in_flight.append(len(in_flight))
+        time.sleep(0.05)
+        with lock:
+            in_flight.pop()
+        return insert_all(url, query)
+
+    client._post.side_effect = slow_insert
+
+    client.insert_documents("mycollection", create_documents(120))
+
+    assert client._post.call_count == 6
+    assert max(max_in_flight) == 3
+
+
+def test_insert_documents_empty():
+    client = create_client()
+    assert client.insert_documents("mycollection", []) == []
+    client._post.assert_not_called()
+
+
+@patch("destination_astra.astra_client.time.sleep")
+def test_insert_retries_only_failed_documents(sleep):
+    client = create_client()
+    client._post.side_effect = iter(
+        [
+            {"status": {"insertedIds": ["id0", "id2"]}, "errors": [{"message": "timeout", "errorCode": "SERVER_TIMEOUT"}]},
+            {"status": {"insertedIds": ["id1"]}},
+        ]
+    )
+
+    inserted_ids = client.insert_documents("mycollection", create_documents(3))
+
+    assert sorted(inserted_ids) == ["id0", "id1", "id2"]
+    assert client._post.call_count == 2
+    assert client._post.call_args_list[1].args[1]["insertMany"]["documents"] == [{"_id": "id1", "$vector": [1, 1, 1]}]
+    sleep.assert_called_once()
+
+
+@patch("destination_astra.astra_client.time.sleep")
+def test_insert_retries_whole_command_on_http_error(sleep):
+    client = create_client()
+    client._post.side_effect = iter(
+        [
+            urllib3.exceptions.HTTPError("Astra DB not available. Status code: 503"),
+            {"status": {"insertedIds": ["id0"]}, "errors": [{"message": "exists", "errorCode": "DOCUMENT_ALREADY_EXISTS"}]},
+        ]
+    )
+
+    # id1 was written by the first attempt although its response was lost
+    inserted_ids = client.insert_documents("mycollection", create_documents(2))
+
+    assert sorted(inserted_ids) == ["id0", "id1"]
+    assert client._post.call_count == 2
+
+
+@patch("destination_astra.astra_client.time.sleep")
+def test_insert_fails_after_max_attempts(sleep):
+    client = create_client()
+    client._post.return_value = {"status": {"insertedIds": []}, "errors": [{"message": "bad document", "errorCode": "SHRED_BAD_DOCUMENT"}]}
+
+    with pytest.raises(Exception, match="failed to insert 2 document"):
+        client.insert_documents("mycollection", create_documents(2))
+    assert client._post.call_count == MAX_INSERT_ATTEMPTS
@@ -68,23 +68,12 @@ def test_astra_index_upsert_batching():
         "ns1",
         "some_stream",
     )
-    assert indexer.client.insert_documents.call_count == 3
-    for i in range(20):
-        assert indexer.client.insert_documents.call_args_list[0].kwargs.get("documents")[i] == {
-            "_id": ANY,
-            "$vector": [i, i, i],
-            "_ab_stream": "abc",
-            "text": f"test {i}",
-        }
-    for i in range(20, 40):
-        assert indexer.client.insert_documents.call_args_list[1].kwargs.get("documents")[i - 20] == {
-            "_id": ANY,
-            "$vector": [i, i, i],
-            "_ab_stream": "abc",
-            "text": f"test {i}",
-        }
-    for i in range(40, 50):
-        assert indexer.client.insert_documents.call_args_list[2].kwargs.get("documents")[i - 40] == {
+    # splitting into insertMany commands happens in the client
+    indexer.client.insert_documents.assert_called_once()
+    documents = indexer.client.insert_documents.call_args.kwargs.get("documents")
+    assert len(documents) == 50
+    for i in range(50):
+        assert documents[i] == {
             "_id": ANY,
             "$vector": [i, i, i],
             "_ab_stream": "abc",
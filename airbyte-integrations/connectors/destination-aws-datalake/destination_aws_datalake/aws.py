@@ -3,8 +3,9 @@
 #
 
 import logging
+import threading
 from decimal import Decimal
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import awswrangler as wr
 import boto3
@@ -18,7 +19,7 @@ from retrying import retry
 from airbyte_cdk.destinations import Destination
 
 from .config_reader import CompressionCodec, ConnectorConfig, CredentialsType, OutputFormat
-from .constants import BOOLEAN_VALUES, EMPTY_VALUES
+from .constants import BOOLEAN_VALUES, EMPTY_VALUES, PARQUET_ROW_GROUP_SIZE
 
 
 logger = logging.getLogger("airbyte")
@@ -99,6 +100,8 @@ class AwsHandler:
         self._config: ConnectorConfig = connector_config
         self._destination: Destination = destination
         self._session: boto3.Session = None
+        # boto3 sessions are not thread safe, concurrent uploads use one session per thread
+        self._thread_local = threading.local()
 
         self.create_session()
         self.glue_client = self._session.client("glue")
@@ -109,8 +112,11 @@ class AwsHandler:
 
     @retry(stop_max_attempt_number=10, wait_random_min=1000, wait_random_max=2000)
     def create_session(self) -> None:
+        self._session = self._new_session()
+
+    def _new_session(self) -> boto3.Session:
         if self._config.credentials_type == CredentialsType.IAM_USER:
-            self._session = boto3.Session(
+            return boto3.Session(
                 aws_access_key_id=self._config.aws_access_key,
                 aws_secret_access_key=self._config.aws_secret_key,
                 region_name=self._config.region,
@@ -120,7 +126,19 @@ class AwsHandler:
             botocore_session = AssumeRoleProvider.assume_role_refreshable(
                 session=botocore.session.Session(), role_arn=self._config.role_arn, session_name="airbyte-destination-aws-datalake"
             )
-            self._session = boto3.session.Session(region_name=self._config.region, botocore_session=botocore_session)
+            return boto3.session.Session(region_name=self._config.region, botocore_session=botocore_session)
+
+    @retry(stop_max_attempt_number=10, wait_random_min=1000, wait_random_max=2000)
+    def _get_thread_session(self) -> boto3.Session:
+        if threading.current_thread() is threading.main_thread():
+            return self._session
+
+        session = getattr(self._thread_local, "session", None)
+        if session is None:
+            session = self._new_session()
+            self._thread_local.session = session
+
+        return session
 
     def _get_s3_path(self, database: str, table: str) -> str:
         bucket = f"s3://{self._config.bucket_name}"
@@ -143,12 +161,20 @@ class AwsHandler:
         self,
         df: pd.DataFrame,
         path: str,
-        database: str,
-        table: str,
+        database: Optional[str],
+        table: Optional[str],
         mode: str,
         dtype: Optional[Dict[str, str]],
         partition_cols: list = None,
+        boto3_session: Optional[boto3.Session] = None,
     ) -> Any:
+        pyarrow_additional_kwargs = None
+        if not partition_cols:
+            # Write bounded row groups instead of a single one per flush.
+            # awswrangler consumes these arguments on the first file it writes,
+            # so they are only passed when a single file is written.
+            pyarrow_additional_kwargs = {"write_table_args": {"row_group_size": PARQUET_ROW_GROUP_SIZE}}
+
         return wr.s3.to_parquet(
             df=df,
             path=path,
@@ -161,21 +187,23 @@ class AwsHandler:
             mode=mode,
             use_threads=False,  # True causes s3 NoCredentialsError error
             catalog_versioning=True,
-            boto3_session=self._session,
+            boto3_session=boto3_session or self._session,
             partition_cols=partition_cols,
             compression=self._get_compression_type(self._config.compression_codec),
             dtype=dtype,
+            pyarrow_additional_kwargs=pyarrow_additional_kwargs,
         )
 
     def _write_json(
         self,
         df: pd.DataFrame,
         path: str,
-        database: str,
-        table: str,
+        database: Optional[str],
+        table: Optional[str],
         mode: str,
         dtype: Optional[Dict[str, str]],
         partition_cols: list = None,
+        boto3_session: Optional[boto3.Session] = None,
     ) -> Any:
         return wr.s3.to_json(
             df=df,
@@ -191,7 +219,7 @@ class AwsHandler:
             orient="records",
             lines=True,
             catalog_versioning=True,
-            boto3_session=self._session,
+            boto3_session=boto3_session or self._session,
             partition_cols=partition_cols,
             dtype=dtype,
             compression=self._get_compression_type(self._config.compression_codec),
@@ -211,6 +239,23 @@ class AwsHandler:
         else:
             raise Exception(f"Unsupported output format: {self._config.format_type}")
 
+    def _upload(
+        self, df: pd.DataFrame, path: str, dtype: Dict[str, str], partition_cols: list, boto3_session: boto3.Session
+    ) -> Dict[str, List[str]]:
+        """
+        Writes the dataframe's files without touching the glue catalog, returns the values of the written partitions.
+        """
+        if self._config.format_type == OutputFormat.JSONL:
+            result = self._write_json(df, path, None, None, "append", dtype, partition_cols, boto3_session)
+
+        elif self._config.format_type == OutputFormat.PARQUET:
+            result = self._write_parquet(df, path, None, None, "append", dtype, partition_cols, boto3_session)
+
+        else:
+            raise Exception(f"Unsupported output format: {self._config.format_type}")
+
+        return result["partitions_values"]
+
     def _create_database_if_not_exists(self, database: str) -> None:
         tag_key = self._config.lakeformation_database_default_tag_key
         tag_values = self._config.lakeformation_database_default_tag_values
@@ -275,6 +320,41 @@ class AwsHandler:
             partition_cols,
         )
 
+    def upload(self, df: pd.DataFrame, database: str, table: str, dtype: Dict[str, str], partition_cols: list) -> Dict[str, List[str]]:
+        """
+        Appends the dataframe's files to an existing table, the partitions written must be registered with `add_partitions`.
+        Safe to call from multiple threads.
+        """
+        path = self._get_s3_path(database, table)
+        return self._upload(df, path, dtype, partition_cols, self._get_thread_session())
+
+    def add_partitions(self, database: str, table: str, partitions_values: Dict[str, List[str]], columns_types: Dict[str, str]) -> None:
+        logger.info(f"Registering {len(partitions_values)} partitions for table {database}.{table}")
+        compression = self._get_compression_type(self._config.compression_codec)
+
+        if self._config.format_type == OutputFormat.JSONL:
+            wr.catalog.add_json_partitions(
+                database=database,
+                table=table,
+                partitions_values=partitions_values,
+                compression=compression,
+                boto3_session=self._session,
+                columns_types=columns_types,
+            )
+
+        elif self._config.format_type == OutputFormat.PARQUET:
+            wr.catalog.add_parquet_partitions(
+                database=database,
+                table=table,
+                partitions_values=partitions_values,
+                compression=compression,
+                boto3_session=self._session,
+                columns_types=columns_types,
+            )
+
+        else:
+            raise Exception(f"Unsupported output format: {self._config.format_type}")
+
     def upsert(self, df: pd.DataFrame, database: str, table: str, dtype: Dict[str, str], partition_cols: list):
         path = self._get_s3_path(database, table)
         return self._write(
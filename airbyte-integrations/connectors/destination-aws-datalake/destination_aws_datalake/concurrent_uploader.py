@@ -0,0 +1,104 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Set
+
+
+logger = logging.getLogger("airbyte")
+
+
+class ConcurrentUploader:
+    """
+    Runs uploads on a thread pool while the caller keeps reading messages.
+
+    - Uploads submitted with the same key (e.g. the same table) run one after the other, in submission order.
+    - The total size of the submitted but unfinished uploads is bounded by `max_in_flight_bytes`,
+      `submit` blocks until enough uploads finished. An upload larger than the budget runs on its own.
+    - Uploads are numbered in submission order, `completed_through` is the highest number for which
+      the upload and all the ones submitted before it are done, which lets the caller know which
+      state messages are covered by durable uploads.
+    """
+
+    def __init__(self, max_workers: int, max_in_flight_bytes: int) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="aws-datalake-upload")
+        self._max_in_flight_bytes = max_in_flight_bytes
+
+        self._condition = threading.Condition()
+        self._in_flight_bytes = 0
+        self._submitted_count = 0
+        self._completed_through = 0
+        self._done: Set[int] = set()
+        self._last_futures: Dict[str, Future] = {}
+        self._error: Optional[BaseException] = None
+
+    @property
+    def submitted_count(self) -> int:
+        return self._submitted_count
+
+    @property
+    def completed_through(self) -> int:
+        self.raise_if_failed()
+        with self._condition:
+            return self._completed_through
+
+    def raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def submit(self, key: str, upload: Callable[[], None], num_bytes: int) -> int:
+        with self._condition:
+            while self._error is None and self._in_flight_bytes > 0 and self._in_flight_bytes + num_bytes > self._max_in_flight_bytes:
+                self._condition.wait()
+
+            self.raise_if_failed()
+            self._in_flight_bytes += num_bytes
+            self._submitted_count += 1
+            seq = self._submitted_count
+
+        previous = self._last_futures.get(key)
+
+        def run() -> None:
+            # the executor starts jobs in submission order, so the previous upload
+            # of this key is either running or finished when this one starts
+            if previous is not None:
+                previous.result()
+            upload()
+
+        future = self._executor.submit(run)
+        future.add_done_callback(lambda f: self._on_done(seq, num_bytes, f))
+        self._last_futures[key] = future
+        return seq
+
+    def wait(self) -> None:
+        """
+        Blocks until all submitted uploads are finished.
+        """
+        with self._condition:
+            while self._error is None and self._completed_through < self._submitted_count:
+                self._condition.wait()
+
+        self.raise_if_failed()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _on_done(self, seq: int, num_bytes: int, future: Future) -> None:
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Upload {seq} failed: {repr(error)}")
+
+        with self._condition:
+            if error is not None and self._error is None:
+                self._error = error
+
+            self._in_flight_bytes -= num_bytes
+            self._done.add(seq)
+            while self._completed_through + 1 in self._done:
+                self._completed_through += 1
+                self._done.remove(self._completed_through)
+
+            self._condition.notify_all()
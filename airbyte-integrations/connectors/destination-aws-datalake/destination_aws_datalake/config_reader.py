@@ -92,6 +92,8 @@ class ConnectorConfig:
         table_name: str = None,
         format: dict = {},
         partitioning: str = None,
+        max_concurrent_uploads: int = 1,
+        max_in_flight_megabytes: int = 1024,
     ):
         self.aws_account_id = aws_account_id
         self.credentials = credentials
@@ -111,6 +113,9 @@ class ConnectorConfig:
 
         self.partitioning = PartitionOptions.from_string(partitioning)
 
+        self.max_concurrent_uploads = max_concurrent_uploads
+        self.max_in_flight_megabytes = max_in_flight_megabytes
+
         if self.credentials_type == CredentialsType.IAM_USER:
             self.aws_access_key = self.credentials.get("aws_access_key_id")
             self.aws_secret_key = self.credentials.get("aws_secret_access_key")
@@ -26,3 +26,6 @@ GLUE_TYPE_MAPPING_DECIMAL = {
     **GLUE_TYPE_MAPPING_DOUBLE,
     "number": "decimal(38, 25)",
 }
+
+# Maximum number of rows per parquet row group
+PARQUET_ROW_GROUP_SIZE = 100_000
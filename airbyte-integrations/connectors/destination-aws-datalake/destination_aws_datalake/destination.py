@@ -5,7 +5,8 @@
 import logging
 import random
 import string
-from typing import Any, Dict, Iterable, Mapping
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Mapping, Optional, Tuple
 
 import pandas as pd
 from botocore.exceptions import ClientError, InvalidRegionError
@@ -14,6 +15,7 @@ from airbyte_cdk.destinations import Destination
 from airbyte_cdk.models import AirbyteConnectionStatus, AirbyteMessage, AirbyteStateType, ConfiguredAirbyteCatalog, Status, Type
 
 from .aws import AwsHandler
+from .concurrent_uploader import ConcurrentUploader
 from .config_reader import ConnectorConfig
 from .stream_writer import StreamWriter
 
@@ -29,6 +31,35 @@ class DestinationAwsDatalake(Destination):
         for stream in streams:
             streams[stream].flush()
 
+    @staticmethod
+    def _get_uploader(connector_config: ConnectorConfig) -> Optional[ConcurrentUploader]:
+        # governed tables are written in lake formation transactions, which requires going through the catalog
+        if connector_config.max_concurrent_uploads <= 1 or connector_config.lakeformation_governed_tables:
+            return None
+
+        return ConcurrentUploader(
+            max_workers=connector_config.max_concurrent_uploads,
+            max_in_flight_bytes=connector_config.max_in_flight_megabytes * 1024 * 1024,
+        )
+
+    @staticmethod
+    def _release_states(
+        streams: Dict[str, StreamWriter], uploader: ConcurrentUploader, pending_states: Deque[Tuple[int, AirbyteMessage]]
+    ) -> Iterable[AirbyteMessage]:
+        """
+        Yields the state messages whose records were all uploaded, after registering the uploaded partitions.
+        """
+        completed_through = uploader.completed_through
+        states = []
+        while pending_states and pending_states[0][0] <= completed_through:
+            states.append(pending_states.popleft()[1])
+
+        if states:
+            for stream in streams.values():
+                stream.commit_partitions()
+
+            yield from states
+
     @staticmethod
     def _get_random_string(length: int) -> str:
         return "".join(random.choice(string.ascii_letters) for i in range(length))
@@ -58,12 +89,39 @@ class DestinationAwsDatalake(Destination):
             logger.error(f"Could not create session due to exception {repr(e)}")
             raise Exception(f"Could not create session due to exception {repr(e)}")
 
+        # with concurrent uploads, state messages are held until the uploads they cover are done
+        uploader = self._get_uploader(connector_config)
+        pending_states: Deque[Tuple[int, AirbyteMessage]] = deque()
+
         # creating stream writers
         streams = {
-            s.stream.name: StreamWriter(aws_handler=aws_handler, config=connector_config, configured_stream=s)
+            s.stream.name: StreamWriter(aws_handler=aws_handler, config=connector_config, configured_stream=s, uploader=uploader)
             for s in configured_catalog.streams
         }
 
+        try:
+            yield from self._write_messages(streams, uploader, pending_states, input_messages)
+
+            # Flush all or remaining records
+            self._flush_streams(streams)
+
+            if uploader is not None:
+                uploader.wait()
+                for stream in streams.values():
+                    stream.commit_partitions()
+                for _, message in pending_states:
+                    yield message
+        finally:
+            if uploader is not None:
+                uploader.close()
+
+    def _write_messages(
+        self,
+        streams: Dict[str, StreamWriter],
+        uploader: Optional[ConcurrentUploader],
+        pending_states: Deque[Tuple[int, AirbyteMessage]],
+        input_messages: Iterable[AirbyteMessage],
+    ) -> Iterable[AirbyteMessage]:
         for message in input_messages:
             if message.type == Type.STATE and message.state.type == AirbyteStateType.STREAM:
                 state_stream = message.state.stream
@@ -85,7 +143,11 @@ class DestinationAwsDatalake(Destination):
                     else:
                         logger.warning(f"Trying to flush stream {stream} that is not in the configured catalog")
 
-                yield message
+                if uploader is None:
+                    yield message
+                else:
+                    pending_states.append((uploader.submitted_count, message))
+                    yield from self._release_states(streams, uploader, pending_states)
 
             elif message.type == Type.RECORD:
                 data = message.record.data
@@ -94,16 +156,13 @@ class DestinationAwsDatalake(Destination):
 
                 # Flush records every RECORD_FLUSH_INTERVAL records to limit memory consumption
                 # Records will either get flushed when a state message is received or when hitting the RECORD_FLUSH_INTERVAL
-                if len(streams[stream]._messages) > RECORD_FLUSH_INTERVAL:
+                if streams[stream].buffered_records > RECORD_FLUSH_INTERVAL:
                     logger.debug(f"Reached size limit: flushing records for {stream}")
                     streams[stream].flush(partial=True)
 
             else:
                 logger.info(f"Unhandled message type {message.type}: {message}")
 
-        # Flush all or remaining records
-        self._flush_streams(streams)
-
     def check(self, logger: logging.Logger, config: Mapping[str, Any]) -> AirbyteConnectionStatus:
         """
         Tests if the input configuration can be used to successfully connect to the destination with the needed permissions
@@ -0,0 +1,134 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Type, Union
+
+import pandas as pd
+import pyarrow as pa
+
+
+logger = logging.getLogger("airbyte")
+
+# Number of records converted to arrow arrays at a time
+RECORD_BATCH_SIZE = 5000
+
+# Keep the pandas dtypes the writer used to get from `astype(PANDAS_TYPE_MAPPING)`
+PANDAS_TYPES_FROM_ARROW = {
+    pa.int64(): pd.Int64Dtype(),
+    pa.string(): pd.StringDtype(),
+}
+
+Column = Union[pa.Array, List[Any]]
+
+
+def _to_arrow_array(values: List[Any], arrow_type: pa.DataType) -> pa.Array:
+    if pa.types.is_nested(arrow_type):
+        return pa.array(values, type=arrow_type, from_pandas=True)
+
+    # Infer first and cast afterwards, so that lossy conversions (e.g. 1.5 to an integer)
+    # fail instead of being silently truncated.
+    return pa.array(values, from_pandas=True).cast(arrow_type)
+
+
+class ColumnarRecordBuffer:
+    """
+    Buffers records column by column and converts them to typed arrow arrays in batches,
+    so that the records' dictionaries don't have to be kept around until the next flush.
+
+    Columns of a batch that can't be converted to their arrow type are kept as python
+    values, the pandas casts are then applied to them when the buffer is flushed.
+    """
+
+    def __init__(
+        self,
+        column_types: Dict[str, Optional[pa.DataType]],
+        json_columns: Iterable[str] = (),
+        datetime_columns: Iterable[str] = (),
+        json_encoder: Type[json.JSONEncoder] = json.JSONEncoder,
+        batch_size: int = RECORD_BATCH_SIZE,
+    ) -> None:
+        self._column_types = column_types
+        self._json_columns = set(json_columns)
+        self._datetime_columns = set(datetime_columns)
+        self._json_encoder = json_encoder
+        self._batch_size = batch_size
+
+        self._pending: Dict[str, List[Any]] = {col: [] for col in column_types}
+        self._num_pending = 0
+        self._batches: List[Dict[str, Column]] = []
+        self._num_records = 0
+
+    def __len__(self) -> int:
+        return self._num_records
+
+    def append(self, record: Dict[str, Any]) -> None:
+        for col, values in self._pending.items():
+            values.append(record.get(col))
+
+        self._num_pending += 1
+        self._num_records += 1
+        if self._num_pending >= self._batch_size:
+            self._convert_pending_records()
+
+    def clear(self) -> None:
+        self._pending = {col: [] for col in self._column_types}
+        self._num_pending = 0
+        self._batches = []
+        self._num_records = 0
+
+    def pop_dataframe(self) -> pd.DataFrame:
+        """
+        Returns the buffered records as a dataframe and empties the buffer.
+        Columns are converted one at a time and released from the buffer as soon as they are converted.
+        """
+        self._convert_pending_records()
+        batches = self._batches
+        self.clear()
+
+        data = {}
+        for col, arrow_type in self._column_types.items():
+            chunks = [batch.pop(col) for batch in batches]
+
+            # Nested values are kept as python lists and dicts rather than numpy arrays
+            if chunks and all(isinstance(chunk, pa.Array) for chunk in chunks) and not pa.types.is_nested(arrow_type):
+                data[col] = pa.chunked_array(chunks, type=arrow_type).to_pandas(types_mapper=PANDAS_TYPES_FROM_ARROW.get)
+            else:
+                values = []
+                for chunk in chunks:
+                    values.extend(chunk.to_pylist() if isinstance(chunk, pa.Array) else chunk)
+                data[col] = pd.Series(values, dtype=object)
+
+            del chunks
+
+        return pd.DataFrame(data, copy=False)
+
+    def _convert_column(self, col: str, values: List[Any]) -> Column:
+        # Make sure complex types that can't be converted
+        # to a struct or array are converted to a json string
+        # so they can be queried with json_extract
+        if col in self._json_columns:
+            values = [json.dumps(value, cls=self._json_encoder) for value in values]
+
+        arrow_type = self._column_types[col]
+        if arrow_type is None:
+            return values
+
+        try:
+            if col in self._datetime_columns:
+                return pa.Array.from_pandas(pd.to_datetime(pd.Series(values, dtype=object), format="mixed", utc=True), type=arrow_type)
+
+            return _to_arrow_array(values, arrow_type)
+        except (pa.ArrowException, TypeError, ValueError, OverflowError) as e:
+            logger.debug(f"Could not convert column {col} to {arrow_type}, keeping python values: {repr(e)}")
+            return values
+
+    def _convert_pending_records(self) -> None:
+        if self._num_pending == 0:
+            return
+
+        self._batches.append({col: self._convert_column(col, values) for col, values in self._pending.items()})
+        self._pending = {col: [] for col in self._column_types}
+        self._num_pending = 0
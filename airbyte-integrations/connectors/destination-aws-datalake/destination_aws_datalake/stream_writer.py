@@ -4,17 +4,22 @@
 
 import json
 import logging
+import threading
 from datetime import date, datetime
 from decimal import Decimal, getcontext
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import pandas as pd
+import pyarrow as pa
+from awswrangler import _data_types
 
 from airbyte_cdk.models import ConfiguredAirbyteStream, DestinationSyncMode
 
 from .aws import AwsHandler
+from .concurrent_uploader import ConcurrentUploader
 from .config_reader import ConnectorConfig, PartitionOptions
 from .constants import EMPTY_VALUES, GLUE_TYPE_MAPPING_DECIMAL, GLUE_TYPE_MAPPING_DOUBLE, PANDAS_TYPE_MAPPING
+from .record_buffer import ColumnarRecordBuffer
 
 
 # By default we set glue decimal type to decimal(28,25)
@@ -39,7 +44,13 @@ class DictEncoder(json.JSONEncoder):
 
 
 class StreamWriter:
-    def __init__(self, aws_handler: AwsHandler, config: ConnectorConfig, configured_stream: ConfiguredAirbyteStream) -> None:
+    def __init__(
+        self,
+        aws_handler: AwsHandler,
+        config: ConnectorConfig,
+        configured_stream: ConfiguredAirbyteStream,
+        uploader: Optional[ConcurrentUploader] = None,
+    ) -> None:
         self._aws_handler: AwsHandler = aws_handler
         self._config: ConnectorConfig = config
         self._configured_stream: ConfiguredAirbyteStream = configured_stream
@@ -50,9 +61,25 @@ class StreamWriter:
         self._table: str = configured_stream.stream.name
         self._database: str = self._configured_stream.stream.namespace or self._config.lakeformation_database_name
 
-        self._messages = []
         self._partial_flush_count = 0
 
+        # When an uploader is given, appends to a table that was already written during this sync
+        # are uploaded in the background and their partitions are registered by `commit_partitions`
+        self._uploader: Optional[ConcurrentUploader] = uploader
+        self._partitions_lock = threading.Lock()
+        self._pending_partitions: Dict[str, List[str]] = {}
+        self._partition_columns_types: Dict[str, str] = {}
+
+        # The schema doesn't change during a sync, so the types are only inferred once
+        self._glue_dtypes, self._json_casts = self._get_glue_dtypes_from_json_schema(self._schema)
+        self._date_columns = self._get_date_columns()
+        self._buffer = ColumnarRecordBuffer(
+            self._get_arrow_types(),
+            json_columns=self._json_casts,
+            datetime_columns=self._date_columns,
+            json_encoder=DictEncoder,
+        )
+
         logger.info(f"Creating StreamWriter for {self._database}:{self._table}")
 
     def _get_date_columns(self) -> List[str]:
@@ -365,6 +392,30 @@ class StreamWriter:
 
         return column_types, json_columns
 
+    def _get_arrow_types(self) -> Dict[str, Optional[pa.DataType]]:
+        """
+        Helper that maps each column to the arrow type its values are buffered as.
+        Columns without a matching arrow type are buffered as python values.
+        """
+        arrow_types = {}
+        for col, glue_type in self._glue_dtypes.items():
+            if col in self._date_columns:
+                # parsed as timestamps to build the partition columns, glue casts them to dates
+                arrow_types[col] = pa.timestamp("ns", tz="UTC")
+            elif col in self._json_casts:
+                arrow_types[col] = pa.string()
+            else:
+                try:
+                    arrow_types[col] = _data_types.athena2pyarrow(glue_type)
+                except Exception:
+                    arrow_types[col] = None
+
+        return arrow_types
+
+    @property
+    def buffered_records(self) -> int:
+        return len(self._buffer)
+
     @property
     def _cursor_fields(self) -> Optional[List[str]]:
         return self._configured_stream.cursor_field
@@ -372,48 +423,50 @@ class StreamWriter:
     def append_message(self, message: Dict[str, Any]):
         clean_message = self._drop_additional_top_level_properties(message)
         clean_message = self._json_schema_cast(clean_message)
-        self._messages.append(clean_message)
+        self._buffer.append(clean_message)
 
     def reset(self):
+        if self._uploader is not None:
+            self._uploader.wait()
+            self.commit_partitions()
+
         logger.info(f"Deleting table {self._database}:{self._table}")
+        self._table_exists = False
         success = self._aws_handler.delete_table(self._database, self._table)
 
         if not success:
             logger.warning(f"Failed to reset table {self._database}:{self._table}")
 
     def flush(self, partial: bool = False):
-        logger.debug(f"Flushing {len(self._messages)} messages to table {self._database}:{self._table}")
+        logger.debug(f"Flushing {len(self._buffer)} messages to table {self._database}:{self._table}")
 
-        df = pd.DataFrame(self._messages)
-        # best effort to convert pandas types
-        df = df.astype(self._get_pandas_dtypes_from_json_schema(df), errors="ignore")
-
-        if len(df) < 1:
+        if len(self._buffer) < 1:
             logger.info(f"No messages to write to {self._database}:{self._table}")
             return
 
+        df = self._buffer.pop_dataframe()
+
+        # best effort to convert pandas types of columns that couldn't be buffered as arrow arrays
+        pandas_dtypes = self._get_pandas_dtypes_from_json_schema(df)
+        df = df.astype(
+            {col: typ for col, typ in pandas_dtypes.items() if df[col].dtype == object and typ != "object"},
+            errors="ignore",
+        )
+
         partition_fields = {}
-        date_columns = self._get_date_columns()
-        for col in date_columns:
+        for col in self._date_columns:
             if col in df.columns:
-                df[col] = pd.to_datetime(df[col], format="mixed", utc=True)
+                if not pd.api.types.is_datetime64_any_dtype(df[col]):
+                    df[col] = pd.to_datetime(df[col], format="mixed", utc=True)
 
                 # Create date column for partitioning
                 if self._cursor_fields and col in self._cursor_fields:
                     fields = self._add_partition_column(col, df)
                     partition_fields.update(fields)
 
-        dtype, json_casts = self._get_glue_dtypes_from_json_schema(self._schema)
-        dtype = {**dtype, **partition_fields}
+        dtype = {**self._glue_dtypes, **partition_fields}
         partition_fields = list(partition_fields.keys())
 
-        # Make sure complex types that can't be converted
-        # to a struct or array are converted to a json string
-        # so they can be queried with json_extract
-        for col in json_casts:
-            if col in df.columns:
-                df[col] = df[col].apply(lambda x: json.dumps(x, cls=DictEncoder))
-
         if self._sync_mode == DestinationSyncMode.overwrite and self._partial_flush_count < 1:
             logger.debug(f"Overwriting {len(df)} records to {self._database}:{self._table}")
             self._aws_handler.write(
@@ -423,6 +476,15 @@ class StreamWriter:
                 dtype,
                 partition_fields,
             )
+            self._table_exists = True
+
+        elif (
+            self._uploader is not None
+            and self._table_exists
+            and (self._sync_mode == DestinationSyncMode.append or self._partial_flush_count > 0)
+        ):
+            logger.debug(f"Uploading {len(df)} records to {self._database}:{self._table} in the background")
+            self._submit_upload(df, dtype, partition_fields)
 
         elif self._sync_mode == DestinationSyncMode.append or self._partial_flush_count > 0:
             logger.debug(f"Appending {len(df)} records to {self._database}:{self._table}")
@@ -433,13 +495,37 @@ class StreamWriter:
                 dtype,
                 partition_fields,
             )
+            self._table_exists = True
 
         else:
-            self._messages = []
             raise Exception(f"Unsupported sync mode: {self._sync_mode}")
 
         if partial:
             self._partial_flush_count += 1
 
         del df
-        self._messages.clear()
+
+    def _submit_upload(self, df: pd.DataFrame, dtype: Dict[str, str], partition_fields: List[str]) -> None:
+        def upload() -> None:
+            partitions_values = self._aws_handler.upload(df, self._database, self._table, dtype, partition_fields)
+            if partitions_values:
+                columns_types, _ = _data_types.athena_types_from_pandas_partitioned(
+                    df=df, index=False, partition_cols=partition_fields, dtype=dtype
+                )
+                with self._partitions_lock:
+                    self._pending_partitions.update(partitions_values)
+                    self._partition_columns_types = columns_types
+
+        num_bytes = int(df.memory_usage(index=False, deep=True).sum())
+        self._uploader.submit(f"{self._database}.{self._table}", upload, num_bytes)
+
+    def commit_partitions(self) -> None:
+        """
+        Registers the partitions written by the finished background uploads in a single batch.
+        """
+        with self._partitions_lock:
+            partitions_values, self._pending_partitions = self._pending_partitions, {}
+            columns_types = self._partition_columns_types
+
+        if partitions_values:
+            self._aws_handler.add_partitions(self._database, self._table, partitions_values, columns_types)
@@ -0,0 +1,87 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+import threading
+import time
+
+import pytest
+from destination_aws_datalake.concurrent_uploader import ConcurrentUploader
+
+
+def test_uploads_with_the_same_key_run_in_order():
+    uploader = ConcurrentUploader(max_workers=4, max_in_flight_bytes=1024)
+    uploaded = []
+
+    def upload(i):
+        def run():
+            # the first uploads are the slowest, they must still finish first
+            time.sleep(0.01 * (5 - i))
+            uploaded.append(i)
+
+        return run
+
+    for i in range(5):
+        assert uploader.submit("db.table", upload(i), 1) == i + 1
+
+    uploader.wait()
+    uploader.close()
+
+    assert uploaded == [0, 1, 2, 3, 4]
+    assert uploader.completed_through == 5
+
+
+def test_completed_through_waits_for_earlier_uploads():
+    uploader = ConcurrentUploader(max_workers=2, max_in_flight_bytes=1024)
+    release = threading.Event()
+
+    uploader.submit("db.slow", release.wait, 1)
+    uploader.submit("db.fast", lambda: None, 1)
+
+    time.sleep(0.05)
+    assert uploader.completed_through == 0
+
+    release.set()
+    uploader.wait()
+    uploader.close()
+    assert uploader.completed_through == 2
+
+
+def test_submit_blocks_when_in_flight_bytes_exceed_budget():
+    uploader = ConcurrentUploader(max_workers=4, max_in_flight_bytes=100)
+    release = threading.Event()
+    submitted = threading.Event()
+
+    uploader.submit("db.first", release.wait, 80)
+
+    def submit_second():
+        uploader.submit("db.second", lambda: None, 80)
+        submitted.set()
+
+    thread = threading.Thread(target=submit_second)
+    thread.start()
+
+    assert not submitted.wait(0.05)
+    release.set()
+    assert submitted.wait(1)
+
+    thread.join()
+    uploader.wait()
+    uploader.close()
+
+
+def test_failed_upload_is_raised():
+    uploader = ConcurrentUploader(max_workers=2, max_in_flight_bytes=1024)
+
+    def fail():
+        raise ValueError("upload failed")
+
+    uploader.submit("db.table", fail, 1)
+
+    with pytest.raises(ValueError, match="upload failed"):
+        uploader.wait()
+
+    with pytest.raises(ValueError, match="upload failed"):
+        uploader.submit("db.table", lambda: None, 1)
+
+    uploader.close()
@@ -6,11 +6,13 @@ import json
 from datetime import datetime
 from decimal import Decimal
 from typing import Any, Dict, Mapping
+from unittest.mock import Mock
 
 import numpy as np
 import pandas as pd
 from destination_aws_datalake import DestinationAwsDatalake
 from destination_aws_datalake.aws import AwsHandler
+from destination_aws_datalake.concurrent_uploader import ConcurrentUploader
 from destination_aws_datalake.config_reader import ConnectorConfig
 from destination_aws_datalake.stream_writer import DictEncoder, StreamWriter
 
@@ -317,8 +319,95 @@ def test_append_messsage():
     writer = get_writer(get_config())
     message = {"string_col": "test", "int_col": 1, "datetime_col": "2021-01-01T00:00:00Z", "date_col": "2021-01-01"}
     writer.append_message(message)
-    assert len(writer._messages) == 1
-    assert writer._messages[0] == message
+    assert writer.buffered_records == 1
+
+    df = writer._buffer.pop_dataframe()
+    assert writer.buffered_records == 0
+    assert df.to_dict("records") == [
+        {
+            "string_col": "test",
+            "int_col": 1,
+            "datetime_col": pd.Timestamp("2021-01-01T00:00:00Z"),
+            "date_col": pd.Timestamp("2021-01-01T00:00:00Z"),
+        }
+    ]
+
+
+def test_flush_builds_typed_dataframe():
+    config = get_config()
+    config["partitioning"] = "YEAR"
+    writer = get_writer(config)
+    writer._buffer._batch_size = 2
+    writer._aws_handler.append = Mock()
+
+    for i in range(3):
+        writer.append_message({"string_col": f"test_{i}", "int_col": i, "datetime_col": "2021-01-01T00:00:00Z", "date_col": "2021-01-01"})
+    writer.flush()
+
+    df, database, table, dtype, partition_cols = writer._aws_handler.append.call_args[0]
+    assert (database, table) == ("test", "append_stream")
+    assert list(df["string_col"]) == ["test_0", "test_1", "test_2"]
+    assert df["string_col"].dtype == "string"
+    assert df["int_col"].dtype == "Int64"
+    assert str(df["datetime_col"].dtype) == "datetime64[ns, UTC]"
+    assert list(df["datetime_col_year"]) == [2021, 2021, 2021]
+    assert dtype == {
+        "string_col": "string",
+        "int_col": "bigint",
+        "datetime_col": "timestamp",
+        "date_col": "date",
+        "datetime_col_year": "bigint",
+    }
+    assert partition_cols == ["datetime_col_year"]
+    assert writer.buffered_records == 0
+
+
+def test_flush_keeps_values_that_cannot_be_typed():
+    writer = get_big_schema_writer(get_config())
+    writer._aws_handler.append = Mock()
+
+    writer.append_message({"appId": 1, "appName": "first", "object_with_additional_properties": {"id": 1, "extra": "x"}})
+    writer.append_message({"appId": 2.5, "appName": "second", "causedBy": {"id": "abc"}})
+    writer.flush()
+
+    df = writer._aws_handler.append.call_args[0][0]
+    assert list(df["appId"]) == [1, 2.5]
+    assert list(df["appName"]) == ["first", "second"]
+    assert list(df["object_with_additional_properties"]) == [json.dumps({"id": 1, "extra": "x"}), "null"]
+    assert list(df["causedBy"]) == [None, {"created": None, "id": "abc"}]
+
+
+def test_flush_uploads_appends_in_background():
+    config = get_config()
+    config["partitioning"] = "YEAR"
+    connector_config = ConnectorConfig(**config)
+    aws_handler = AwsHandler(connector_config, DestinationAwsDatalake())
+    aws_handler.append = Mock()
+    aws_handler.upload = Mock(side_effect=[{"s3://datalake-bucket/test/append_stream/datetime_col_year=2021/": ["2021"]}])
+    aws_handler.add_partitions = Mock()
+
+    uploader = ConcurrentUploader(max_workers=2, max_in_flight_bytes=1024 * 1024)
+    writer = StreamWriter(aws_handler, connector_config, get_configured_stream(), uploader=uploader)
+    message = {"string_col": "test", "int_col": 1, "datetime_col": "2021-01-01T00:00:00Z", "date_col": "2021-01-01"}
+
+    # the first write creates the table through the catalog
+    writer.append_message(dict(message))
+    writer.flush(partial=True)
+    assert aws_handler.append.call_count == 1
+
+    writer.append_message(dict(message))
+    writer.flush(partial=True)
+    uploader.wait()
+    assert aws_handler.append.call_count == 1
+    assert aws_handler.upload.call_count == 1
+    aws_handler.add_partitions.assert_not_called()
+
+    writer.commit_partitions()
+    uploader.close()
+    database, table, partitions_values, columns_types = aws_handler.add_partitions.call_args[0]
+    assert (database, table) == ("test", "append_stream")
+    assert partitions_values == {"s3://datalake-bucket/test/append_stream/datetime_col_year=2021/": ["2021"]}
+    assert "datetime_col_year" not in columns_types
 
 
 def test_get_cursor_field():
@@ -0,0 +1,91 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+import json
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Generic, List, TypeVar, Union
+
+
+Item = TypeVar("Item")
+State = TypeVar("State")
+
+
+class AsyncBatchWriter(Generic[Item, State]):
+    """
+    Groups items into batches bounded by item count and serialized size, and sends them
+    with up to `max_concurrent_requests` requests in flight.
+
+    State messages are queued in order with the batches. A state is only released once every
+    batch queued before it was sent successfully; a failed batch raises and no later state is released.
+    """
+
+    def __init__(
+        self,
+        send_batch: Callable[[List[Item]], Any],
+        max_batch_size: int = 1000,
+        max_batch_bytes: int = 4 * 1024 * 1024,
+        max_concurrent_requests: int = 4,
+    ):
+        self.send_batch = send_batch
+        self.max_batch_size = max_batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.max_concurrent_requests = max_concurrent_requests
+        self._buffer: List[Item] = []
+        self._buffer_bytes = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_requests, thread_name_prefix="batch-writer")
+        # batches (as futures) and states, in the order they were queued
+        self._pending: Deque[Union[Future, State]] = deque()
+
+    @staticmethod
+    def size_of(item: Item) -> int:
+        return len(json.dumps(item, default=str))
+
+    def add(self, item: Item) -> None:
+        item_bytes = self.size_of(item)
+        if self._buffer and self._buffer_bytes + item_bytes > self.max_batch_bytes:
+            self._submit()
+        self._buffer.append(item)
+        self._buffer_bytes += item_bytes
+        if len(self._buffer) >= self.max_batch_size:
+            self._submit()
+
+    def add_state(self, state: State) -> List[State]:
+        """Queues a state behind the items added so far, returns the states that can be emitted now."""
+        if self._buffer:
+            self._submit()
+        self._pending.append(state)
+        return self._release()
+
+    def flush(self) -> List[State]:
+        """Sends the buffered items, waits for every batch and returns the remaining states."""
+        if self._buffer:
+            self._submit()
+        return self._release(wait=True)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _submit(self) -> None:
+        batch = self._buffer
+        self._buffer, self._buffer_bytes = [], 0
+        in_flight = [entry for entry in self._pending if isinstance(entry, Future) and not entry.done()]
+        if len(in_flight) >= self.max_concurrent_requests:
+            # back-pressure: wait for the oldest request before queueing another batch
+            in_flight[0].result()
+        self._pending.append(self._executor.submit(self.send_batch, batch))
+
+    def _release(self, wait: bool = False) -> List[State]:
+        released = []
+        while self._pending:
+            entry = self._pending[0]
+            if isinstance(entry, Future):
+                if not wait and not entry.done():
+                    break
+                # raises if the batch failed, which fails the sync before any later state is emitted
+                entry.result()
+            else:
+                released.append(entry)
+            self._pending.popleft()
+        return released
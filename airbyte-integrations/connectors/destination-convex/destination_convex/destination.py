@@ -45,7 +45,6 @@ class DestinationConvex(Destination):
         :return: Iterable of AirbyteStateMessages wrapped in AirbyteMessage structs
         """
         config = cast(ConvexConfig, config)
-        writer = ConvexWriter(ConvexClient(config, self.table_metadata(configured_catalog.streams)))
 
         # Setup: Clear tables if in overwrite mode; add indexes if in append_dedup mode.
         streams_to_delete = []
@@ -55,6 +54,9 @@ class DestinationConvex(Destination):
                 streams_to_delete.append(configured_stream.stream.name)
             elif configured_stream.destination_sync_mode == DestinationSyncMode.append_dedup and configured_stream.primary_key:
                 indexes_to_add[configured_stream.stream.name] = configured_stream.primary_key
+
+        # Records of dedup streams are upserted by primary key, their batches must be applied in order
+        writer = ConvexWriter(ConvexClient(config, self.table_metadata(configured_catalog.streams)), ordered=len(indexes_to_add) != 0)
         if len(streams_to_delete) != 0:
             writer.delete_tables(streams_to_delete)
         if len(indexes_to_add) != 0:
@@ -63,10 +65,9 @@ class DestinationConvex(Destination):
         # Process records
         for message in input_messages:
             if message.type == Type.STATE:
-                # Emitting a state message indicates that all records which came before it have been written to the destination. So we flush
-                # the queue to ensure writes happen, then output the state message to indicate it's safe to checkpoint state
-                writer.flush()
-                yield message
+                # Emitting a state message indicates that all records which came before it have been written to the destination. So the
+                # writer only hands back a state message once every batch queued before it was written
+                yield from writer.queue_state(message)
             elif message.type == Type.RECORD and message.record is not None:
                 table_name = self.table_name_for_stream(
                     message.record.namespace,
@@ -82,7 +83,10 @@ class DestinationConvex(Destination):
                 continue
 
         # Make sure to flush any records still in the queue
-        writer.flush()
+        try:
+            yield from writer.flush()
+        finally:
+            writer.close()
 
     def table_name_for_stream(self, namespace: Optional[str], stream_name: str) -> str:
         if namespace is not None:
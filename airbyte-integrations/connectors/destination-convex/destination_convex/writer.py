@@ -6,6 +6,8 @@ import time
 from collections.abc import Mapping
 from typing import Any, List
 
+from airbyte_cdk.models import AirbyteMessage
+from destination_convex.batch_writer import AsyncBatchWriter
 from destination_convex.client import ConvexClient
 
 
@@ -14,11 +16,22 @@ class ConvexWriter:
     Buffers messages before sending them to Convex.
     """
 
-    write_buffer: List[Mapping[str, Any]] = []
     flush_interval = 1000
+    max_batch_bytes = 4 * 1024 * 1024
+    max_concurrent_requests = 4
 
-    def __init__(self, client: ConvexClient):
+    def __init__(self, client: ConvexClient, ordered: bool = False):
+        """
+        :param ordered: send one batch at a time. Convex upserts the records of append_dedup streams by primary key,
+            so a batch finishing after a newer one could otherwise leave a stale document behind.
+        """
         self.client = client
+        self.batch_writer = AsyncBatchWriter(
+            self.client.batch_write,
+            max_batch_size=self.flush_interval,
+            max_batch_bytes=self.max_batch_bytes,
+            max_concurrent_requests=1 if ordered else self.max_concurrent_requests,
+        )
 
     def delete_tables(self, table_names: List[str]) -> None:
         """Deletes all the records belonging to the input stream"""
@@ -41,13 +54,16 @@ class ConvexWriter:
         return
 
     def queue_write_operation(self, message: Mapping[str, Any]) -> None:
-        """Adds messages to the write queue and flushes if the buffer is full"""
-        self.write_buffer.append(message)
-        if len(self.write_buffer) == self.flush_interval:
-            self.flush()
+        """Adds messages to the write queue, a full batch is sent to Convex in the background"""
+        self.batch_writer.add(message)
 
-    def flush(self) -> None:
-        """Writes to Convex"""
+    def queue_state(self, state: AirbyteMessage) -> List[AirbyteMessage]:
+        """Queues a state message, returns the state messages whose records have all been written"""
+        return self.batch_writer.add_state(state)
 
-        self.client.batch_write(self.write_buffer)
-        self.write_buffer.clear()
+    def flush(self) -> List[AirbyteMessage]:
+        """Writes all queued messages to Convex, returns the remaining state messages"""
+        return self.batch_writer.flush()
+
+    def close(self) -> None:
+        self.batch_writer.close()
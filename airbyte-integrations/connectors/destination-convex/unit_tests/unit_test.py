@@ -2,14 +2,18 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 #
 
+import json
 import logging
+import threading
 from typing import Any, Dict
 
 import pytest
 import responses
+from destination_convex.batch_writer import AsyncBatchWriter
 from destination_convex.client import ConvexClient
 from destination_convex.config import ConvexConfig
 from destination_convex.destination import DestinationConvex
+from destination_convex.writer import ConvexWriter
 
 from airbyte_cdk.models import (
     AirbyteMessage,
@@ -168,3 +172,79 @@ def test_write(config: ConvexConfig, configured_catalog: ConfiguredAirbyteCatalo
         )
     )[0]
     assert second_state_message == output_state
+
+
+@responses.activate
+def test_write_sends_one_batch_at_a_time_for_dedup_streams(
+    config: ConvexConfig, configured_catalog: ConfiguredAirbyteCatalog, monkeypatch: pytest.MonkeyPatch
+):
+    setup_good_responses(config)
+    lock = threading.Lock()
+    in_flight = max_in_flight = 0
+    imported = []
+
+    def import_records(request):
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        threading.Event().wait(0.05)
+        with lock:
+            in_flight -= 1
+            imported.extend(message["data"]["str_col"] for message in json.loads(request.body)["messages"])
+        return 200, {}, ""
+
+    responses.remove(responses.POST, f"{config['deployment_url']}/api/streaming_import/import_airbyte_records")
+    responses.add_callback(responses.POST, f"{config['deployment_url']}/api/streaming_import/import_airbyte_records", import_records)
+    monkeypatch.setattr(ConvexWriter, "flush_interval", 2)
+
+    dedup_stream = configured_catalog.streams[2].stream.name
+    # the same primary keys are written twice, the later versions must be imported last
+    messages = [record(dedup_stream, str(i), i % 3) for i in range(6)]
+    output = list(DestinationConvex().write(config, configured_catalog, [*messages, state({"state": "1"})]))
+
+    assert output == [state({"state": "1"})]
+    assert imported == [str(i) for i in range(6)]
+    assert max_in_flight == 1
+
+
+def test_batch_writer_splits_batches_by_count_and_size():
+    batches = []
+    writer = AsyncBatchWriter(batches.append, max_batch_size=3, max_batch_bytes=30, max_concurrent_requests=2)
+    for i in range(4):
+        writer.add({"i": i})
+    writer.add({"big": "x" * 40})
+    assert writer.flush() == []
+    writer.close()
+    assert sorted(batches, key=len, reverse=True) == [[{"i": 0}, {"i": 1}, {"i": 2}], [{"i": 3}], [{"big": "x" * 40}]]
+
+
+def test_batch_writer_releases_states_in_order():
+    release_first_batch = threading.Event()
+
+    def send(batch):
+        if batch == ["a"]:
+            release_first_batch.wait(5)
+
+    writer = AsyncBatchWriter(send, max_batch_size=10, max_concurrent_requests=2)
+    writer.add("a")
+    assert writer.add_state("state_1") == []
+    writer.add("b")
+    assert writer.add_state("state_2") == []
+    release_first_batch.set()
+    assert writer.flush() == ["state_1", "state_2"]
+    writer.close()
+
+
+def test_batch_writer_withholds_states_after_failed_batch():
+    def send(batch):
+        if batch == ["bad"]:
+            raise ValueError("write failed")
+
+    writer = AsyncBatchWriter(send, max_batch_size=10)
+    writer.add("bad")
+    with pytest.raises(ValueError):
+        # the failure surfaces on whichever call reaches the failed batch first
+        writer.add_state("state_1")
+        writer.flush()
+    writer.close()
@@ -5,12 +5,20 @@ import logging
 import re
 import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 from uuid import uuid4
 
 from couchbase.auth import PasswordAuthenticator
 from couchbase.cluster import Cluster
-from couchbase.exceptions import BucketNotFoundException, CouchbaseException, DocumentExistsException, KeyspaceNotFoundException
+from couchbase.exceptions import (
+    AmbiguousTimeoutException,
+    BucketNotFoundException,
+    CouchbaseException,
+    DocumentExistsException,
+    KeyspaceNotFoundException,
+    TimeoutException,
+    UnAmbiguousTimeoutException,
+)
 from couchbase.options import ClusterOptions, ClusterTimeoutOptions, UpsertMultiOptions
 from jsonschema import validate
 from jsonschema.exceptions import ValidationError
@@ -29,6 +37,8 @@ from airbyte_cdk.models import (
     Type,
 )
 
+from .pipelined_writer import PipelinedWriter
+
 
 logger = logging.getLogger("airbyte")
 
@@ -38,6 +48,12 @@ class DestinationCouchbase(Destination):
     MAX_RETRIES = 3
     RETRY_DELAY = 1  # seconds
 
+    # Batch sizes adapt to the observed latency between these bounds, starting from the configured batch size
+    MIN_ADAPTIVE_BATCH_SIZE = 50
+    MAX_ADAPTIVE_BATCH_SIZE = 5000
+    TARGET_BATCH_LATENCY = 2  # seconds
+    MAX_IN_FLIGHT_BATCHES = 4  # per collection
+
     def check(self, logger: logging.Logger, config: Mapping[str, Any]) -> AirbyteConnectionStatus:
         """
         Tests if the input configuration can be used to successfully connect to the destination.
@@ -93,6 +109,7 @@ class DestinationCouchbase(Destination):
         bucket_name = config["bucket"]
         scope_name = config.get("scope", "_default")
         batch_size = min(config.get("batch_size", 1000), self.MAX_BATCH_SIZE)
+        max_in_flight = config.get("max_in_flight_batches", self.MAX_IN_FLIGHT_BATCHES)
 
         logger.info(f"Starting sync with config: {{'bucket': '{bucket_name}', 'scope': '{scope_name}', 'batch_size': {batch_size}}}")
 
@@ -130,16 +147,30 @@ class DestinationCouchbase(Destination):
                 yield self._emit_trace_message(error_msg, "config_error")
                 raise
 
-        # Initialize buffers and state tracking
-        buffer: Dict[str, List[Dict]] = {}
+        # Initialize the writer and state tracking
+        writer = PipelinedWriter(
+            upsert_batch=self._upsert_batch,
+            is_timeout=self._is_timeout,
+            initial_batch_size=batch_size,
+            min_batch_size=min(self.MIN_ADAPTIVE_BATCH_SIZE, batch_size),
+            max_batch_size=max(self.MAX_ADAPTIVE_BATCH_SIZE, batch_size),
+            target_latency=self.TARGET_BATCH_LATENCY,
+            max_in_flight=max_in_flight,
+            max_retries=self.MAX_RETRIES,
+            retry_delay=self.RETRY_DELAY,
+        )
+        for stream_name, collection in collections.items():
+            stream_config = stream_configs[stream_name]
+            writer.add_stream(stream_name, collection, stream_config["sync_mode"], ordered=self._has_primary_key_ids(stream_config))
+
         latest_state: Optional[AirbyteMessage] = None
         records_processed = 0
 
         try:
             for message in input_messages:
                 if message.type == Type.STATE:
-                    # Flush buffer before processing state message
-                    self._flush_all_buffers(collections, buffer, stream_configs)
+                    # Wait for every batch to be written before processing state message
+                    writer.flush()
                     latest_state = message
                     yield message
 
@@ -151,31 +182,20 @@ class DestinationCouchbase(Destination):
                             yield self._emit_trace_message(f"Skipping record from unknown stream: {stream_name}", "config_error")
                             continue
 
-                        # Initialize buffer for stream if needed
-                        if stream_name not in buffer:
-                            buffer[stream_name] = []
-
                         # Validate and prepare record
                         document = self._prepare_record(message.record, stream_configs[stream_name])
 
                         if document:
-                            buffer[stream_name].append(document)
+                            # Submitted in the background once the stream's batch size is reached
+                            writer.write(stream_name, document)
                             records_processed += 1
 
-                            # Flush if batch size reached
-                            if len(buffer[stream_name]) >= batch_size:
-                                self._flush_buffer(
-                                    collections[stream_name], buffer[stream_name], stream_name, stream_configs[stream_name]["sync_mode"]
-                                )
-                                buffer[stream_name] = []
-
                     except Exception as e:
                         yield self._emit_trace_message(f"Error processing record for stream {stream_name}: {str(e)}", "system_error")
                         raise
 
             # Final flush of any remaining records
-            if any(buffer.values()):
-                self._flush_all_buffers(collections, buffer, stream_configs)
+            writer.flush()
 
             logger.info(f"Sync completed successfully. Processed {records_processed} records.")
 
@@ -188,6 +208,8 @@ class DestinationCouchbase(Destination):
             logger.error(error_msg)
             yield self._emit_trace_message(error_msg, "system_error")
             raise
+        finally:
+            writer.close()
 
     def _get_cluster(self, config: Mapping[str, Any]) -> Cluster:
         """
@@ -263,6 +285,14 @@ class DestinationCouchbase(Destination):
         except Exception as e:
             logger.warning(f"Error clearing collection: {str(e)}")
 
+    @staticmethod
+    def _has_primary_key_ids(stream_config: Mapping[str, Any]) -> bool:
+        """
+        Whether the document ids of the stream are derived from its primary key (append_dedup and overwrite streams with a
+        primary key), rather than being random.
+        """
+        return bool(stream_config["primary_key"]) and stream_config["sync_mode"] != DestinationSyncMode.append
+
     def _prepare_record(self, record: AirbyteRecordMessage, stream_config: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Prepares a record for insertion, including validation and ID generation.
@@ -310,16 +340,10 @@ class DestinationCouchbase(Destination):
                 logger.info(f"Proceeding with cleaned data for stream {record.stream}")
 
             # Generate document ID based on sync mode
-            if stream_config["sync_mode"] == DestinationSyncMode.append_dedup and stream_config["primary_key"]:
+            if self._has_primary_key_ids(stream_config):
                 doc_id = self._generate_primary_key_id(cleaned_data, stream_config["primary_key"], record.stream)
-            elif stream_config["sync_mode"] == DestinationSyncMode.append:
+            else:
                 doc_id = f"{record.stream}::{str(uuid4())}"
-            else:  # DestinationSyncMode.overwrite
-                doc_id = (
-                    self._generate_primary_key_id(cleaned_data, stream_config["primary_key"], record.stream)
-                    if stream_config["primary_key"]
-                    else f"{record.stream}::{str(uuid4())}"
-                )
 
             # Prepare document
             document = {
@@ -384,14 +408,17 @@ class DestinationCouchbase(Destination):
         except Exception as e:
             raise ValueError(f"Error generating primary key ID: {str(e)}")
 
-    def _flush_buffer(self, collection, buffer: List[Dict], stream_name: str, sync_mode: DestinationSyncMode, retry_count: int = 0):
+    @staticmethod
+    def _is_timeout(ex: Exception) -> bool:
+        return isinstance(ex, (AmbiguousTimeoutException, UnAmbiguousTimeoutException, TimeoutException))
+
+    def _upsert_batch(
+        self, collection, buffer: List[Dict], stream_name: str, sync_mode: DestinationSyncMode
+    ) -> List[Tuple[str, Exception]]:
         """
-        Flushes a buffer of documents to Couchbase with retry logic.
+        Upserts a batch of documents to Couchbase and returns the documents that failed.
         Handles different behaviors for append, append_dedup, and overwrite modes.
         """
-        if not buffer:
-            return
-
         try:
             batch = {doc["id"]: doc for doc in buffer}
             timeout = timedelta(seconds=len(batch) * 2.5)
@@ -399,8 +426,8 @@ class DestinationCouchbase(Destination):
 
             result = collection.upsert_multi(batch, options)
 
+            failed_docs = []
             if not result.all_ok:
-                failed_docs = []
                 for doc_id, ex in result.exceptions.items():
                     if isinstance(ex, DocumentExistsException):
                         if sync_mode == DestinationSyncMode.append_dedup:
@@ -421,22 +448,7 @@ class DestinationCouchbase(Destination):
                     else:
                         failed_docs.append((doc_id, ex))
 
-                if failed_docs:
-                    failed_count = len(failed_docs)
-                    if retry_count < self.MAX_RETRIES:
-                        delay = self.RETRY_DELAY * (2**retry_count)
-                        logger.warning(f"Retrying {failed_count} failed documents in {delay}s...")
-                        time.sleep(delay)
-
-                        # Retry failed documents
-                        retry_buffer = [doc for doc in buffer if doc["id"] in dict(failed_docs)]
-                        self._flush_buffer(collection, retry_buffer, stream_name, sync_mode, retry_count + 1)
-                    else:
-                        error_msg = f"Failed to write {failed_count} documents after {self.MAX_RETRIES} retries"
-                        logger.error(error_msg)
-                        raise RuntimeError(error_msg)
-
-            logger.info(f"Successfully wrote {len(batch)} documents to stream {stream_name} ({sync_mode} mode)")
+            return failed_docs
 
         except Exception as e:
             error_msg = f"Error flushing buffer for stream {stream_name}: {str(e)}"
@@ -455,16 +467,3 @@ class DestinationCouchbase(Destination):
                 error=AirbyteErrorTraceMessage(message=error_message, failure_type=failure_type),
             ),
         )
-
-    def _flush_all_buffers(self, collections: Dict[str, Any], buffer: Dict[str, list], stream_configs: Dict[str, dict]):
-        """
-        Flushes all buffers for all streams.
-        """
-        for stream_name, docs in buffer.items():
-            if docs:
-                try:
-                    self._flush_buffer(collections[stream_name], docs, stream_name, stream_configs[stream_name]["sync_mode"])
-                except Exception as e:
-                    logger.error(f"Error flushing buffer for stream {stream_name}: {str(e)}")
-                    raise
-        buffer.clear()
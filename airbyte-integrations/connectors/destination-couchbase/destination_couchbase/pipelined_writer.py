@@ -0,0 +1,171 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+from airbyte_cdk.models import DestinationSyncMode
+
+
+logger = logging.getLogger("airbyte")
+
+# Upserts a batch and returns the documents that failed, with their exception
+UpsertBatch = Callable[[Any, List[Dict], str, DestinationSyncMode], List[Tuple[str, Exception]]]
+
+
+class AdaptiveBatchSize:
+    """
+    Adapts the number of documents per batch to the observed upsert latency.
+
+    The batch size is halved when a batch times out or takes longer than the target latency,
+    and grows by a quarter when a batch completes well within it.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int, target_latency: float):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self._size = max(minimum, min(initial, maximum))
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def record(self, latency: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out or latency > self.target_latency:
+                self._size = max(self.minimum, self._size // 2)
+            elif latency < self.target_latency / 2:
+                self._size = min(self.maximum, self._size + max(1, self._size // 4))
+
+
+class _StreamWriter:
+    def __init__(self, collection, stream_name: str, sync_mode: DestinationSyncMode, batch_size: AdaptiveBatchSize, max_in_flight: int):
+        self.collection = collection
+        self.stream_name = stream_name
+        self.sync_mode = sync_mode
+        self.batch_size = batch_size
+        self.buffer: List[Dict] = []
+        # bounds the number of batches of this collection submitted but not completed
+        self.in_flight = threading.BoundedSemaphore(max_in_flight)
+
+
+class PipelinedWriter:
+    """
+    Writes documents to several collections at once, keeping up to `max_in_flight` batches in flight per collection.
+
+    Batches are upserted on a shared thread pool, the Couchbase SDK releases the GIL while waiting for
+    the cluster so the batches of every stream overlap. Documents that fail are retried with an exponential
+    backoff on the worker thread, without blocking the other batches or the caller.
+
+    Streams added with `ordered=True` keep a single batch (including its retries) in flight, so that batches
+    upserting the same document ids are applied in the order the records arrived.
+    """
+
+    def __init__(
+        self,
+        upsert_batch: UpsertBatch,
+        is_timeout: Callable[[Exception], bool],
+        initial_batch_size: int,
+        min_batch_size: int,
+        max_batch_size: int,
+        target_latency: float,
+        max_in_flight: int,
+        max_retries: int,
+        retry_delay: float,
+    ):
+        self._upsert_batch = upsert_batch
+        self._is_timeout = is_timeout
+        self._initial_batch_size = initial_batch_size
+        self._min_batch_size = min_batch_size
+        self._max_batch_size = max_batch_size
+        self._target_latency = target_latency
+        self._max_in_flight = max_in_flight
+        self._max_retries = max_retries
+        self._retry_delay = retry_delay
+
+        self._streams: Dict[str, _StreamWriter] = {}
+        self._executor: ThreadPoolExecutor = None
+        self._futures: List[Future] = []
+
+    def add_stream(self, stream_name: str, collection, sync_mode: DestinationSyncMode, ordered: bool = False) -> None:
+        """
+        :param ordered: whether later batches of the stream can overwrite documents of earlier ones, e.g. when document ids
+            are derived from the primary key. Such a batch can only start once the previous one completed.
+        """
+        batch_size = AdaptiveBatchSize(self._initial_batch_size, self._min_batch_size, self._max_batch_size, self._target_latency)
+        max_in_flight = 1 if ordered else self._max_in_flight
+        self._streams[stream_name] = _StreamWriter(collection, stream_name, sync_mode, batch_size, max_in_flight)
+
+    def write(self, stream_name: str, document: Dict) -> None:
+        stream = self._streams[stream_name]
+        stream.buffer.append(document)
+        if len(stream.buffer) >= stream.batch_size.size:
+            self._submit(stream)
+
+    def flush(self) -> None:
+        """
+        Submits the buffered documents of every stream and waits for all the batches to complete.
+        """
+        for stream in self._streams.values():
+            if stream.buffer:
+                self._submit(stream)
+
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _submit(self, stream: _StreamWriter) -> None:
+        if self._executor is None:
+            max_workers = max(1, self._max_in_flight * len(self._streams))
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="couchbase-writer")
+
+        # raise errors of completed batches early and don't keep their futures around
+        pending = []
+        for future in self._futures:
+            if future.done():
+                future.result()
+            else:
+                pending.append(future)
+        self._futures = pending
+
+        documents, stream.buffer = stream.buffer, []
+        stream.in_flight.acquire()
+        try:
+            future = self._executor.submit(self._write_batch, stream, documents)
+        except Exception:
+            stream.in_flight.release()
+            raise
+
+        future.add_done_callback(lambda _: stream.in_flight.release())
+        self._futures.append(future)
+
+    def _write_batch(self, stream: _StreamWriter, documents: List[Dict]) -> None:
+        for attempt in range(self._max_retries + 1):
+            start = time.monotonic()
+            failed_docs = self._upsert_batch(stream.collection, documents, stream.stream_name, stream.sync_mode)
+            stream.batch_size.record(time.monotonic() - start, any(self._is_timeout(ex) for _, ex in failed_docs))
+
+            if not failed_docs:
+                logger.info(f"Successfully wrote {len(documents)} documents to stream {stream.stream_name} ({stream.sync_mode} mode)")
+                return
+
+            if attempt == self._max_retries:
+                error_msg = f"Failed to write {len(failed_docs)} documents after {self._max_retries} retries"
+                logger.error(error_msg)
+                raise RuntimeError(f"Error flushing buffer for stream {stream.stream_name}: {error_msg}")
+
+            delay = self._retry_delay * (2**attempt)
+            logger.warning(f"Retrying {len(failed_docs)} failed documents of stream {stream.stream_name} in {delay}s...")
+            time.sleep(delay)
+
+            failed_ids = {doc_id for doc_id, _ in failed_docs}
+            documents = [doc for doc in documents if doc["id"] in failed_ids]
@@ -1,10 +1,13 @@
 # Copyright (c) 2024 Airbyte, Inc., all rights reserved.
 from __future__ import annotations
 
+import threading
 from unittest.mock import Mock, patch
 
 import pytest
+from couchbase.exceptions import UnAmbiguousTimeoutException
 from destination_couchbase.destination import DestinationCouchbase
+from destination_couchbase.pipelined_writer import AdaptiveBatchSize
 
 from airbyte_cdk.models import (
     AirbyteMessage,
@@ -214,5 +217,150 @@ def test_write_multiple_streams(mock_cluster, config, mock_scope_info):
     mock_collection2.upsert_multi.assert_called_once()
 
 
+@patch("destination_couchbase.pipelined_writer.time.sleep")
+@patch("destination_couchbase.destination.Cluster")
+def test_write_retries_only_failed_documents(mock_cluster, mock_sleep, config, configured_catalog, mock_scope_info):
+    mock_bucket = Mock()
+    mock_scope = Mock()
+    mock_collection = Mock()
+    mock_bucket_manager = Mock()
+
+    mock_cluster.return_value.bucket.return_value = mock_bucket
+    mock_bucket.collections.return_value = mock_bucket_manager
+    mock_bucket_manager.get_all_scopes.return_value = mock_scope_info
+    mock_bucket.scope.return_value = mock_scope
+    mock_scope.collection.return_value = mock_collection
+
+    # The first document times out on the first attempt
+    failed_result = Mock(all_ok=False, exceptions={"test_stream::1": UnAmbiguousTimeoutException()})
+    ok_result = Mock(all_ok=True)
+    mock_collection.upsert_multi.side_effect = [failed_result, ok_result]
+
+    configured_catalog.streams[0].primary_key = [["id"]]
+    messages = [
+        AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="test_stream", data={"id": i}, emitted_at=1)) for i in range(3)
+    ]
+
+    destination = DestinationCouchbase()
+    list(destination.write(config, configured_catalog, messages))
+
+    assert mock_collection.upsert_multi.call_count == 2
+    retried_batch = mock_collection.upsert_multi.call_args_list[1][0][0]
+    assert list(retried_batch.keys()) == ["test_stream::1"]
+    mock_sleep.assert_called_once_with(DestinationCouchbase.RETRY_DELAY)
+
+
+@patch("destination_couchbase.destination.Cluster")
+def test_write_overlaps_batches_of_multiple_streams(mock_cluster, config, mock_scope_info):
+    mock_bucket = Mock()
+    mock_scope = Mock()
+    mock_collection1 = Mock()
+    mock_collection2 = Mock()
+    mock_bucket_manager = Mock()
+
+    mock_cluster.return_value.bucket.return_value = mock_bucket
+    mock_bucket.collections.return_value = mock_bucket_manager
+    mock_bucket_manager.get_all_scopes.return_value = mock_scope_info
+    mock_bucket.scope.return_value = mock_scope
+    mock_scope.collection.side_effect = [mock_collection1, mock_collection2]
+
+    # Each collection only completes its batch once the other collection started writing
+    barrier = threading.Barrier(2, timeout=5)
+
+    def upsert_multi(batch, options):
+        barrier.wait()
+        return Mock(all_ok=True)
+
+    mock_collection1.upsert_multi.side_effect = upsert_multi
+    mock_collection2.upsert_multi.side_effect = upsert_multi
+
+    configured_catalog = ConfiguredAirbyteCatalog(
+        streams=[
+            ConfiguredAirbyteStream(
+                stream=AirbyteStream(name=name, json_schema={}, supported_sync_modes=[SyncMode.full_refresh]),
+                sync_mode=SyncMode.full_refresh,
+                destination_sync_mode=DestinationSyncMode.append,
+            )
+            for name in ["stream1", "stream2"]
+        ]
+    )
+    messages = [
+        AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream=name, data={"id": 1}, emitted_at=1))
+        for name in ["stream1", "stream2"]
+    ]
+
+    destination = DestinationCouchbase()
+    list(destination.write({**config, "batch_size": 1}, configured_catalog, messages))
+
+    mock_collection1.upsert_multi.assert_called_once()
+    mock_collection2.upsert_multi.assert_called_once()
+
+
+@patch("destination_couchbase.destination.Cluster")
+def test_write_keeps_batches_of_primary_key_streams_in_order(mock_cluster, config, mock_scope_info):
+    mock_bucket = Mock()
+    mock_scope = Mock()
+    mock_collection = Mock()
+    mock_bucket_manager = Mock()
+
+    mock_cluster.return_value.bucket.return_value = mock_bucket
+    mock_bucket.collections.return_value = mock_bucket_manager
+    mock_bucket_manager.get_all_scopes.return_value = mock_scope_info
+    mock_bucket.scope.return_value = mock_scope
+    mock_scope.collection.return_value = mock_collection
+
+    # The first batch is slow; the second one carries a newer version of the same document
+    events = []
+
+    def upsert_multi(batch, options):
+        (document,) = batch.values()
+        events.append(("start", document["data"]["name"]))
+        if document["data"]["name"] == "old":
+            threading.Event().wait(0.2)
+        events.append(("end", document["data"]["name"]))
+        return Mock(all_ok=True)
+
+    mock_collection.upsert_multi.side_effect = upsert_multi
+
+    configured_catalog = ConfiguredAirbyteCatalog(
+        streams=[
+            ConfiguredAirbyteStream(
+                stream=AirbyteStream(name="test_stream", json_schema={}, supported_sync_modes=[SyncMode.incremental]),
+                sync_mode=SyncMode.incremental,
+                destination_sync_mode=DestinationSyncMode.append_dedup,
+                primary_key=[["id"]],
+            )
+        ]
+    )
+    messages = [
+        AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="test_stream", data={"id": 1, "name": name}, emitted_at=1))
+        for name in ["old", "new"]
+    ]
+
+    destination = DestinationCouchbase()
+    list(destination.write({**config, "batch_size": 1, "max_in_flight_batches": 4}, configured_catalog, messages))
+
+    batches = [call[0][0] for call in mock_collection.upsert_multi.call_args_list]
+    assert [list(batch.keys()) for batch in batches] == [["test_stream::1"], ["test_stream::1"]]
+    assert events == [("start", "old"), ("end", "old"), ("start", "new"), ("end", "new")]
+
+
+def test_adaptive_batch_size():
+    batch_size = AdaptiveBatchSize(initial=1000, minimum=50, maximum=5000, target_latency=2)
+
+    batch_size.record(latency=0.5, timed_out=False)
+    assert batch_size.size == 1250
+
+    batch_size.record(latency=1.5, timed_out=False)
+    assert batch_size.size == 1250
+
+    batch_size.record(latency=3, timed_out=False)
+    assert batch_size.size == 625
+
+    for _ in range(10):
+        batch_size.record(latency=0.1, timed_out=True)
+    assert batch_size.size == 50
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -4,9 +4,14 @@
 
 import json
 import logging
+import os
+import shutil
+import tempfile
 from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from time import time
+from typing import Dict, List, Tuple
 from uuid import uuid4
 
 import pyarrow as pa
@@ -89,13 +94,29 @@ class FireboltWriter:
 
 class FireboltS3Writer(FireboltWriter):
     """
-    Data writer using the S3 strategy. Data is buffered in memory
-    before being flushed to S3 in .parquet format. At the end of
-    the operation data is written to Firebolt databse from S3, allowing
-    greater ingestion speed.
+    Data writer using the S3 strategy. Data is buffered in memory as
+    columns and appended as row groups to one open local .parquet file
+    per stream. Completed files are uploaded to S3 in the background.
+    At the end of the operation data is written to Firebolt databse from
+    S3, one table at a time per ingestion worker, allowing greater ingestion speed.
     """
 
+    # Rows kept in memory across all streams before they are written out as row groups
     flush_interval = 100000
+    # Rows of a single stream written out as one row group
+    row_group_size = 10000
+    # Uncompressed bytes written to a local file before it is closed and uploaded
+    file_size = 128 * 1024 * 1024
+    upload_concurrency = 4
+    ingest_concurrency = 4
+
+    schema = pa.schema(
+        [
+            ("_airbyte_ab_id", pa.string()),
+            ("_airbyte_emitted_at", pa.timestamp("us")),
+            ("_airbyte_data", pa.string()),
+        ]
+    )
 
     def __init__(self, connection: Connection, s3_bucket: str, access_key: str, secret_key: str, s3_region: str) -> None:
         """
@@ -114,33 +135,110 @@ class FireboltS3Writer(FireboltWriter):
         self._updated_tables = set()
         self.unique_dir = f"{int(time())}_{uuid4()}"
         self.fs = fs.S3FileSystem(access_key=access_key, secret_key=secret_key, region=s3_region)
+        # id, written_at and data columns of the rows not yet written to a file
+        self._buffer = defaultdict(lambda: ([], [], []))
+        self._local_dir = tempfile.mkdtemp(prefix="airbyte_firebolt_")
+        # stream name -> (local path, open parquet writer, bytes written)
+        self._files: Dict[str, Tuple[str, pq.ParquetWriter, int]] = {}
+        self._uploader = ThreadPoolExecutor(max_workers=self.upload_concurrency, thread_name_prefix="firebolt-s3-upload")
+        self._uploads: List[Future] = []
+
+    def queue_write_data(self, stream_name: str, id: str, time: datetime, record: str) -> None:
+        """
+        Queue up data in a columnar buffer in memory before writing it to a local file.
+        A stream's rows are written once they fill a row group, and all streams are
+        written when flush_interval rows are buffered in total.
+
+        :param stream_name: name of the stream for which the data corresponds.
+        :param id: unique identifier of this data row.
+        :param time: time of writing.
+        :param record: string representation of the json data payload.
+        """
+        ids, times, records = self._buffer[stream_name]
+        ids.append(id)
+        times.append(time)
+        records.append(record)
+        self._values += 1
+        if len(ids) >= self.row_group_size:
+            self._write_row_group(stream_name)
+        if self._values >= self.flush_interval:
+            self._flush()
+
+    def _write_row_group(self, stream_name: str) -> None:
+        """
+        Append the buffered rows of a stream to its local .parquet file,
+        uploading the file once it reaches file_size.
+
+        :param stream_name: name of the stream to write.
+        """
+        ids, times, records = self._buffer.pop(stream_name)
+        self._values -= len(ids)
+        pa_table = pa.Table.from_arrays(
+            [pa.array(ids, type=pa.string()), pa.array(times, type=pa.timestamp("us")), pa.array(records, type=pa.string())],
+            schema=self.schema,
+        )
+        if stream_name in self._files:
+            path, parquet_writer, written = self._files[stream_name]
+        else:
+            path = os.path.join(self._local_dir, f"{stream_name}_{uuid4()}.parquet")
+            parquet_writer, written = pq.ParquetWriter(path, self.schema), 0
+        parquet_writer.write_table(pa_table, row_group_size=self.row_group_size)
+        self._files[stream_name] = (path, parquet_writer, written + pa_table.nbytes)
+        self._updated_tables.add(stream_name)
+        if written + pa_table.nbytes >= self.file_size:
+            self._upload_file(stream_name)
+
+    def _upload_file(self, stream_name: str) -> None:
+        """
+        Close the local file of a stream and upload it to S3 in the background.
+
+        :param stream_name: name of the stream whose file is uploaded.
+        """
+        path, parquet_writer, _ = self._files.pop(stream_name)
+        parquet_writer.close()
+        # Surface failures of finished uploads early instead of at the final flush
+        for upload in [u for u in self._uploads if u.done()]:
+            upload.result()
+            self._uploads.remove(upload)
+        self._uploads.append(self._uploader.submit(self._upload, path, stream_name))
+
+    def _upload(self, path: str, stream_name: str) -> None:
+        destination = f"{self.s3_bucket}/airbyte_output/{self.unique_dir}/{stream_name}/{os.path.basename(path)}"
+        fs.copy_files(path, destination, destination_filesystem=self.fs)
+        os.remove(path)
 
     def _flush(self) -> None:
         """
         Intermediate data flush that's triggered during the
-        buffering operation. Uploads data stored in memory to the S3.
+        buffering operation. Writes data stored in memory to the local files.
         """
-        for table, data in self._buffer.items():
-            key_list, ts_list, payload = zip(*data)
-            upload_data = [pa.array(key_list), pa.array(ts_list), pa.array(payload)]
-            pa_table = pa.table(upload_data, names=["_airbyte_ab_id", "_airbyte_emitted_at", "_airbyte_data"])
-            pq.write_to_dataset(table=pa_table, root_path=f"{self.s3_bucket}/airbyte_output/{self.unique_dir}/{table}", filesystem=self.fs)
-        # Update tables
-        self._updated_tables.update(self._buffer.keys())
-        self._buffer.clear()
-        self._values = 0
+        for stream_name in list(self._buffer.keys()):
+            self._write_row_group(stream_name)
+
+    def _load_table(self, name: str) -> None:
+        self.create_raw_table(name)
+        self.create_external_table(name)
+        self.ingest_data(name)
+        self.cleanup(name)
 
     def flush(self) -> None:
         """
-        Flush any leftover data after ingestion and write from S3 to Firebolt.
+        Flush any leftover data, wait for the uploads and write from S3 to Firebolt.
         Intermediate data on S3 and External Table will be deleted after write is complete.
         """
         self._flush()
-        for table in self._updated_tables:
-            self.create_raw_table(table)
-            self.create_external_table(table)
-            self.ingest_data(table)
-            self.cleanup(table)
+        for stream_name in list(self._files.keys()):
+            self._upload_file(stream_name)
+        try:
+            for upload in self._uploads:
+                upload.result()
+        finally:
+            self._uploads = []
+            self._uploader.shutdown()
+            shutil.rmtree(self._local_dir, ignore_errors=True)
+        with ThreadPoolExecutor(max_workers=self.ingest_concurrency, thread_name_prefix="firebolt-ingest") as executor:
+            # list() re-raises the first failed table
+            list(executor.map(self._load_table, self._updated_tables))
 
     def create_external_table(self, name: str) -> None:
         """
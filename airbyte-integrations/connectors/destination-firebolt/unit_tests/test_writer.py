@@ -3,8 +3,9 @@
 #
 
 from typing import Any, Union
-from unittest.mock import ANY, MagicMock, call, patch
+from unittest.mock import ANY, MagicMock, patch
 
+import pyarrow.parquet as pq
 from destination_firebolt.writer import FireboltS3Writer, FireboltSQLWriter
 from pytest import fixture, mark
 
@@ -100,40 +101,57 @@ def test_s3_delete_tables(connection: MagicMock, s3_writer: FireboltS3Writer) ->
     connection.cursor.return_value.execute.assert_called_once_with(expected_sql)
 
 
-@patch("pyarrow.parquet.write_to_dataset")
-def test_s3_data_auto_flush_one_table(mock_write: MagicMock, s3_writer: FireboltS3Writer) -> None:
-    s3_writer.flush_interval = 2
+def test_s3_row_group_per_stream(s3_writer: FireboltS3Writer) -> None:
+    s3_writer.row_group_size = 2
     s3_writer.queue_write_data("dummy", "id1", 20200101, '{"key": "value"}')
-    mock_write.assert_not_called()
+    s3_writer.queue_write_data("dummy2", "id1", 20200101, '{"key": "value"}')
+    assert s3_writer._values == 2
+    assert s3_writer._files == {}
+    s3_writer.queue_write_data("dummy", "id2", 20200101, '{"key": "value"}')
     assert s3_writer._values == 1
-    s3_writer.queue_write_data("dummy", "id1", 20200101, '{"key": "value"}')
-    mock_write.assert_called_once_with(table=ANY, root_path="dummy_bucket/airbyte_output/111_dummy-uuid/dummy", filesystem=s3_writer.fs)
-    assert len(s3_writer._buffer.keys()) == 0
-    assert s3_writer._values == 0
-    assert s3_writer._updated_tables == set(["dummy"])
-    mock_write.reset_mock()
-    s3_writer.queue_write_data("dummy", "id1", 20200101, '{"key": "value"}')
-    mock_write.assert_not_called()
-    assert len(s3_writer._buffer.keys()) == 1
+    assert list(s3_writer._buffer.keys()) == ["dummy2"]
+    assert list(s3_writer._files.keys()) == ["dummy"]
     assert s3_writer._updated_tables == set(["dummy"])
 
 
-@patch("pyarrow.parquet.write_to_dataset")
-def test_s3_data_auto_flush_multi_tables(mock_write: MagicMock, s3_writer: FireboltS3Writer) -> None:
+def test_s3_data_auto_flush_multi_tables(s3_writer: FireboltS3Writer) -> None:
     s3_writer.flush_interval = 2
     s3_writer.queue_write_data("dummy", "id1", 20200101, '{"key": "value"}')
-    mock_write.assert_not_called()
     assert s3_writer._values == 1
     s3_writer.queue_write_data("dummy2", "id1", 20200101, '{"key": "value"}')
-    assert mock_write.mock_calls == [
-        call(table=ANY, root_path="dummy_bucket/airbyte_output/111_dummy-uuid/dummy", filesystem=s3_writer.fs),
-        call(table=ANY, root_path="dummy_bucket/airbyte_output/111_dummy-uuid/dummy2", filesystem=s3_writer.fs),
-    ]
     assert len(s3_writer._buffer.keys()) == 0
     assert s3_writer._values == 0
+    assert set(s3_writer._files.keys()) == set(["dummy", "dummy2"])
     assert s3_writer._updated_tables == set(["dummy", "dummy2"])
 
 
+@patch("destination_firebolt.writer.fs.copy_files")
+def test_s3_file_uploaded_when_full(mock_copy: MagicMock, s3_writer: FireboltS3Writer) -> None:
+    uploaded_rows = []
+    mock_copy.side_effect = lambda source, destination, **kwargs: uploaded_rows.append(pq.read_table(source).num_rows)
+    s3_writer.row_group_size = 1
+    s3_writer.file_size = 1
+    s3_writer.queue_write_data("dummy", "id1", 20200101, '{"key": "value"}')
+    assert s3_writer._files == {}
+    s3_writer._uploads[0].result()
+    source, destination = mock_copy.call_args.args
+    assert source.endswith(".parquet")
+    assert destination.startswith("dummy_bucket/airbyte_output/111_dummy-uuid/dummy/")
+    assert mock_copy.call_args.kwargs == {"destination_filesystem": s3_writer.fs}
+    assert uploaded_rows == [1]
+
+
+@patch("destination_firebolt.writer.fs.copy_files")
+def test_s3_final_flush_uploads_and_ingests(mock_copy: MagicMock, connection: MagicMock, s3_writer: FireboltS3Writer) -> None:
+    s3_writer.queue_write_data("dummy", "id1", 20200101, '{"key": "value"}')
+    s3_writer.queue_write_data("dummy2", "id1", 20200101, '{"key": "value"}')
+    s3_writer.flush()
+    assert mock_copy.call_count == 2
+    assert len(connection.cursor.return_value.execute.mock_calls) == 8
+    connection.cursor.return_value.execute.assert_any_call("INSERT INTO _airbyte_raw_dummy SELECT * FROM ex_airbyte_raw_dummy")
+    connection.cursor.return_value.execute.assert_any_call("INSERT INTO _airbyte_raw_dummy2 SELECT * FROM ex_airbyte_raw_dummy2")
+
+
 def test_s3_final_flush(connection: MagicMock, s3_writer: FireboltS3Writer) -> None:
     s3_writer._updated_tables = set(["dummy", "dummy2"])
     s3_writer.flush()
@@ -39,6 +39,7 @@ class DestinationFirestore(Destination):
 
         for message in input_messages:
             if message.type == Type.STATE:
+                writer.flush()
                 yield message
             elif message.type == Type.RECORD:
                 record = message.record
@@ -47,6 +48,8 @@ class DestinationFirestore(Destination):
                 # ignore other message types for now
                 continue
 
+        writer.close()
+
     def check(self, logger: logging.Logger, config: Mapping[str, Any]) -> AirbyteConnectionStatus:
         """
         Tests if the input configuration can be used to successfully connect to the destination with the needed permissions
@@ -3,14 +3,29 @@
 #
 
 import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from google.cloud import firestore
+from google.cloud.firestore_v1.bulk_writer import BulkRetry, BulkWriteFailure, BulkWriter, BulkWriterOptions, SendMode
 from google.oauth2 import service_account
 
 
+# gRPC status codes worth retrying: DEADLINE_EXCEEDED, RESOURCE_EXHAUSTED, ABORTED (contention), INTERNAL, UNAVAILABLE
+RETRYABLE_STATUS_CODES = {4, 8, 10, 13, 14}
+
+
 class FirestoreWriter:
-    def __init__(self, project_id: str, credentials_json: Optional[str] = None):
+    DEFAULT_MAX_WRITES_PER_SECOND = 500
+    # with exponential retries the n-th attempt waits n^2 seconds, so 6 attempts wait up to ~1 minute in total
+    MAX_WRITE_ATTEMPTS = 6
+    PURGE_PAGE_SIZE = 1000
+
+    def __init__(
+        self,
+        project_id: str,
+        credentials_json: Optional[str] = None,
+        max_writes_per_second: int = DEFAULT_MAX_WRITES_PER_SECOND,
+    ):
         connection = {}
 
         connection["project"] = project_id
@@ -24,13 +39,66 @@ class FirestoreWriter:
             connection["credentials"] = credentials
 
         self.client = firestore.Client(**connection)
+        self.max_writes_per_second = max_writes_per_second
+        self.failures: List[BulkWriteFailure] = []
+        self._bulk_writer: Optional[BulkWriter] = None
 
     def check(self) -> bool:
         return bool(list(self.client.collections()))
 
+    @property
+    def bulk_writer(self) -> BulkWriter:
+        if self._bulk_writer is None:
+            # BulkWriter ramps up to `max_ops_per_second` and never keeps more documents than that in flight.
+            # Batches are committed in parallel on the writer's own executor.
+            self._bulk_writer = self.client.bulk_writer(
+                options=BulkWriterOptions(
+                    initial_ops_per_second=min(500, self.max_writes_per_second),
+                    max_ops_per_second=self.max_writes_per_second,
+                    mode=SendMode.parallel,
+                    retry=BulkRetry.exponential,
+                )
+            )
+            self._bulk_writer.on_write_error(self._on_write_error)
+        return self._bulk_writer
+
+    def _on_write_error(self, failure: BulkWriteFailure, bulk_writer: BulkWriter) -> bool:
+        if failure.code in RETRYABLE_STATUS_CODES and failure.attempts < self.MAX_WRITE_ATTEMPTS:
+            return True
+        self.failures.append(failure)
+        return False
+
     def write(self, stream: str, data: Dict[str, Any]) -> None:
-        self.client.collection(stream).add(data)
+        self.bulk_writer.create(self.client.collection(stream).document(), data)
+
+    def flush(self) -> None:
+        """
+        Blocks until every queued write was committed.
+        Raises if any of them failed after retries, so that no state message is emitted for them.
+        """
+        if self._bulk_writer is None:
+            return
+        self._bulk_writer.flush()
+        self._raise_on_failures()
+
+    def close(self) -> None:
+        if self._bulk_writer is None:
+            return
+        self._bulk_writer.close()
+        self._bulk_writer = None
+        self._raise_on_failures()
+
+    def _raise_on_failures(self) -> None:
+        if self.failures:
+            failures, self.failures = self.failures, []
+            first = failures[0]
+            raise RuntimeError(
+                f"Failed to write {len(failures)} document(s) to Firestore, first error (code {first.code}): {first.message}"
+            )
 
     def purge(self, stream: str) -> None:
-        for doc in self.client.collection(stream).stream():
-            doc.reference.delete()
+        # list_documents only fetches document references, one page at a time; the deletes of each
+        # page are spread over batches that the bulk writer commits in parallel
+        for reference in self.client.collection(stream).list_documents(page_size=self.PURGE_PAGE_SIZE):
+            self.bulk_writer.delete(reference)
+        self.flush()
@@ -2,6 +2,43 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 #
 
+from unittest.mock import MagicMock, patch
 
-def test_example_method():
-    assert True
+import pytest
+from destination_firestore.writer import FirestoreWriter
+
+
+@pytest.fixture(name="writer")
+def writer_fixture() -> FirestoreWriter:
+    with patch("destination_firestore.writer.firestore.Client"):
+        return FirestoreWriter(project_id="test-project")
+
+
+def test_write_uses_one_bulk_writer(writer: FirestoreWriter):
+    writer.write("stream", {"a": 1})
+    writer.write("stream", {"a": 2})
+    writer.client.bulk_writer.assert_called_once()
+    assert writer.client.bulk_writer.return_value.create.call_count == 2
+
+
+def test_contention_errors_are_retried(writer: FirestoreWriter):
+    assert writer._on_write_error(MagicMock(code=10, attempts=1), MagicMock())
+    assert not writer._on_write_error(MagicMock(code=10, attempts=FirestoreWriter.MAX_WRITE_ATTEMPTS), MagicMock())
+    assert not writer._on_write_error(MagicMock(code=3, attempts=1), MagicMock())
+
+
+def test_flush_raises_on_failed_writes(writer: FirestoreWriter):
+    writer.write("stream", {"a": 1})
+    writer._on_write_error(MagicMock(code=3, attempts=1, message="invalid argument"), writer.bulk_writer)
+    with pytest.raises(RuntimeError, match="invalid argument"):
+        writer.flush()
+    writer.flush()
+
+
+def test_purge_deletes_listed_documents(writer: FirestoreWriter):
+    references = [MagicMock(), MagicMock()]
+    writer.client.collection.return_value.list_documents.return_value = references
+    writer.purge("stream")
+    bulk_writer = writer.client.bulk_writer.return_value
+    assert [c.args[0] for c in bulk_writer.delete.call_args_list] == references
+    bulk_writer.flush.assert_called_once()
@@ -3,7 +3,7 @@
 #
 
 
-from typing import Any, Mapping
+from typing import Any, List, Mapping
 
 from airbyte_cdk import AirbyteLogger
 from airbyte_cdk.models import AirbyteStream
@@ -13,12 +13,15 @@ class WriteBufferMixin:
     # Default instance of AirbyteLogger
     logger = AirbyteLogger()
     # intervals after which the records_buffer should be cleaned up for selected stream
-    flush_interval = 500  # records count
-    flush_interval_size_in_kb = 10 ^ 8  # memory allocation ~ 97656 Kb or 95 Mb
+    flush_interval = 10_000  # records count
+    # estimated size of the append request, Google recommends request payloads of at most 2 MB
+    flush_interval_size_in_kb = 2048
 
     def __init__(self):
         # Buffer for input records
         self.records_buffer = {}
+        # Estimated size in bytes of the buffered values, once serialized into an append request
+        self.records_buffer_size = {}
         # Placeholder for streams metadata
         self.stream_info = {}
 
@@ -39,6 +42,7 @@ class WriteBufferMixin:
         """
         stream = configured_stream.stream
         self.records_buffer[stream.name] = []
+        self.records_buffer_size[stream.name] = 0
         self.stream_info[stream.name] = {
             "headers": sorted(list(stream.json_schema.get("properties").keys())),
             "is_set": False,
@@ -56,12 +60,21 @@ class WriteBufferMixin:
         norm_record = self._normalize_record(stream_name, record)
         norm_values = list(map(str, norm_record.values()))
         self.records_buffer[stream_name].append(norm_values)
+        self.records_buffer_size[stream_name] = self.records_buffer_size.get(stream_name, 0) + self._row_size(norm_values)
+
+    @staticmethod
+    def _row_size(values: List[str]) -> int:
+        """
+        Estimates the size in bytes of a row in the JSON body of an append request: `["value", ...],`
+        """
+        return sum(len(value.encode("utf-8")) + 3 for value in values) + 2
 
     def clear_buffer(self, stream_name: str):
         """
         Cleans up the `records_buffer` values, belonging to input stream.
         """
         self.records_buffer[stream_name].clear()
+        self.records_buffer_size[stream_name] = 0
 
     def _normalize_record(self, stream_name: str, record: Mapping) -> Mapping[str, Any]:
         """
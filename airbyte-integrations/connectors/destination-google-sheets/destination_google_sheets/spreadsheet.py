@@ -2,9 +2,9 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 #
 
-from typing import List, Mapping
+from typing import Any, List, Mapping
 
-from pygsheets import Spreadsheet, Worksheet
+from pygsheets import Spreadsheet, ValueRenderOption, Worksheet
 from pygsheets.client import Client as pygsheets_client
 from pygsheets.exceptions import WorksheetNotFound
 
@@ -86,13 +86,77 @@ class GoogleSheets:
 
     def remove_duplicates(self, stream: Worksheet, rows_list: list):
         """
-        Removes duplicated rows, provided by `rows_list` as list of indexes.
+        Removes duplicated rows, provided by `rows_list` as list of indexes in descending order.
 
-        We are working with delete operation in offline mode, to decrease the number of API calls.
-        1) Unlink the spreadsheet (make it for offline use)
-        2) Perform delete operation and update the actual row index
-        3) Link the spreadsheet (sync with online version) using batch_update method.
+        All rows are deleted with a single `batchUpdate` call. The requests are applied in order,
+        so deleting from the bottom up keeps the indexes of the remaining rows valid.
         """
-        stream.unlink()
-        [stream.delete_rows(row, 1) for row in rows_list]
-        stream.link()
+        if not rows_list:
+            return
+        requests = [
+            {"deleteDimension": {"range": {"sheetId": stream.id, "dimension": "ROWS", "startIndex": row - 1, "endIndex": row}}}
+            for row in rows_list
+        ]
+        self.client.sheet.batch_update(self.spreadsheet_id, requests)
+        stream.jsonSheet["properties"]["gridProperties"]["rowCount"] -= len(rows_list)
+
+    def deduplicate(self, stream: Worksheet, primary_key: str) -> int:
+        """
+        Removes the rows whose primary key value was already seen in a previous row, keeping the first one.
+
+        The worksheet is read once and the surviving rows are computed locally. They are written back
+        with a single `batchUpdate`: the surviving rows overwrite the data rows from `A2` on, and the rows
+        left over at the bottom are deleted. Values are read unformatted to keep numbers and booleans typed.
+        Returns: the number of removed rows.
+        """
+        values = stream.get_all_values(
+            include_tailing_empty=False, include_tailing_empty_rows=False, value_render=ValueRenderOption.UNFORMATTED_VALUE
+        )
+        if len(values) < 2:
+            return 0
+        header, rows = values[0], values[1:]
+        pk_col_index = header.index(primary_key)
+
+        seen, surviving_rows = set(), []
+        for row in rows:
+            pk_value = row[pk_col_index] if pk_col_index < len(row) else ""
+            if pk_value not in seen:
+                seen.add(pk_value)
+                surviving_rows.append(row)
+
+        removed = len(rows) - len(surviving_rows)
+        if not removed:
+            return 0
+
+        # a surviving row may be shorter than the row it overwrites, the remaining cells are cleared
+        width = max(len(row) for row in rows)
+        requests = [
+            {
+                "updateCells": {
+                    "start": {"sheetId": stream.id, "rowIndex": 1, "columnIndex": 0},
+                    "rows": [{"values": [self._cell_data(value) for value in row] + [{}] * (width - len(row))} for row in surviving_rows],
+                    "fields": "userEnteredValue",
+                }
+            },
+            {
+                "deleteDimension": {
+                    "range": {"sheetId": stream.id, "dimension": "ROWS", "startIndex": 1 + len(surviving_rows), "endIndex": 1 + len(rows)}
+                }
+            },
+        ]
+        self.client.sheet.batch_update(self.spreadsheet_id, requests)
+        stream.jsonSheet["properties"]["gridProperties"]["rowCount"] -= removed
+        return removed
+
+    @staticmethod
+    def _cell_data(value: Any) -> Mapping[str, Any]:
+        """
+        Converts an unformatted cell value to the `CellData` of an `updateCells` request.
+        """
+        if value == "":
+            return {}
+        if isinstance(value, bool):
+            return {"userEnteredValue": {"boolValue": value}}
+        if isinstance(value, (int, float)):
+            return {"userEnteredValue": {"numberValue": value}}
+        return {"userEnteredValue": {"stringValue": str(value)}}
@@ -39,10 +39,9 @@ class GoogleSheetsWriter(WriteBufferMixin):
         2) writes it to the target worksheet
         3) cleans-up the records_buffer belonging to input stream
         """
-        # get the size of records_buffer for target stream in Kb
-        # TODO unit test flush triggers
-        records_buffer_size_in_kb = self.records_buffer[stream_name].__sizeof__() / 1024
-        if len(self.records_buffer[stream_name]) == self.flush_interval or records_buffer_size_in_kb > self.flush_interval_size_in_kb:
+        # get the estimated size of the append request for target stream in Kb
+        records_buffer_size_in_kb = self.records_buffer_size[stream_name] / 1024
+        if len(self.records_buffer[stream_name]) >= self.flush_interval or records_buffer_size_in_kb >= self.flush_interval_size_in_kb:
             self.write_from_queue(stream_name)
             self.clear_buffer(stream_name)
 
@@ -110,18 +109,16 @@ class GoogleSheetsWriter(WriteBufferMixin):
     def deduplicate_records(self, configured_stream: AirbyteStream):
         """
         Finds and removes duplicated records for target stream, using `primary_key`.
-        Processing the worksheet happens offline and sync it afterwards to reduce API calls rate
-        If rate limits are hit while deduplicating, it will be handeled automatically, the operation continues after backoff.
+        The surviving rows are computed offline and the worksheet is rewritten with a single API call,
+        so the number of requests doesn't grow with the number of duplicates.
         """
         primary_key: str = configured_stream.primary_key[0][0]
         stream_name: str = configured_stream.stream.name
 
         stream: Worksheet = self.spreadsheet.open_worksheet(stream_name)
-        rows_to_remove: list = self.spreadsheet.find_duplicates(stream, primary_key)
+        removed: int = self.spreadsheet.deduplicate(stream, primary_key)
 
-        if rows_to_remove:
-            self.logger.info(f"Duplicated records are found for stream: {stream_name}, resolving...")
-            self.spreadsheet.remove_duplicates(stream, rows_to_remove)
-            self.logger.info(f"Finished deduplicating records for stream: {stream_name}")
+        if removed:
+            self.logger.info(f"Removed {removed} duplicated records for stream: {stream_name}")
         else:
             self.logger.info(f"No duplicated records found for stream: {stream_name}")
@@ -0,0 +1,101 @@
+#
+# Copyright (c) 2025 Airbyte, Inc., all rights reserved.
+#
+
+
+from unittest.mock import MagicMock
+
+from destination_google_sheets.spreadsheet import GoogleSheets
+from pygsheets import ValueRenderOption
+
+
+def create_worksheet(values, row_count=1000):
+    worksheet = MagicMock()
+    worksheet.id = 7
+    worksheet.jsonSheet = {"properties": {"gridProperties": {"rowCount": row_count}}}
+    worksheet.get_all_values.return_value = values
+    return worksheet
+
+
+def test_deduplicate_rewrites_sheet_in_single_batch_update():
+    spreadsheet = GoogleSheets(MagicMock(), "spreadsheet_id")
+    worksheet = create_worksheet(
+        [
+            ["id", "key", "flag"],
+            [1, "a", True],
+            [1, "a", True],
+            [2, "b"],
+            [1, "a", False],
+            [3, "c", 1.5],
+        ]
+    )
+
+    removed = spreadsheet.deduplicate(worksheet, "id")
+
+    assert removed == 2
+    worksheet.get_all_values.assert_called_once_with(
+        include_tailing_empty=False, include_tailing_empty_rows=False, value_render=ValueRenderOption.UNFORMATTED_VALUE
+    )
+    spreadsheet.client.sheet.batch_update.assert_called_once_with(
+        "spreadsheet_id",
+        [
+            {
+                "updateCells": {
+                    "start": {"sheetId": 7, "rowIndex": 1, "columnIndex": 0},
+                    "rows": [
+                        {
+                            "values": [
+                                {"userEnteredValue": {"numberValue": 1}},
+                                {"userEnteredValue": {"stringValue": "a"}},
+                                {"userEnteredValue": {"boolValue": True}},
+                            ]
+                        },
+                        {"values": [{"userEnteredValue": {"numberValue": 2}}, {"userEnteredValue": {"stringValue": "b"}}, {}]},
+                        {
+                            "values": [
+                                {"userEnteredValue": {"numberValue": 3}},
+                                {"userEnteredValue": {"stringValue": "c"}},
+                                {"userEnteredValue": {"numberValue": 1.5}},
+                            ]
+                        },
+                    ],
+                    "fields": "userEnteredValue",
+                }
+            },
+            {"deleteDimension": {"range": {"sheetId": 7, "dimension": "ROWS", "startIndex": 4, "endIndex": 6}}},
+        ],
+    )
+    assert worksheet.jsonSheet["properties"]["gridProperties"]["rowCount"] == 998
+
+
+def test_deduplicate_without_duplicates():
+    spreadsheet = GoogleSheets(MagicMock(), "spreadsheet_id")
+    worksheet = create_worksheet([["id", "key"], [1, "a"], [2, "b"]])
+
+    assert spreadsheet.deduplicate(worksheet, "id") == 0
+    spreadsheet.client.sheet.batch_update.assert_not_called()
+
+
+def test_deduplicate_empty_worksheet():
+    spreadsheet = GoogleSheets(MagicMock(), "spreadsheet_id")
+    worksheet = create_worksheet([])
+
+    assert spreadsheet.deduplicate(worksheet, "id") == 0
+    spreadsheet.client.sheet.batch_update.assert_not_called()
+
+
+def test_remove_duplicates_single_batch_update():
+    spreadsheet = GoogleSheets(MagicMock(), "spreadsheet_id")
+    worksheet = create_worksheet([], row_count=10)
+
+    spreadsheet.remove_duplicates(worksheet, [6, 5, 3])
+
+    spreadsheet.client.sheet.batch_update.assert_called_once_with(
+        "spreadsheet_id",
+        [
+            {"deleteDimension": {"range": {"sheetId": 7, "dimension": "ROWS", "startIndex": 5, "endIndex": 6}}},
+            {"deleteDimension": {"range": {"sheetId": 7, "dimension": "ROWS", "startIndex": 4, "endIndex": 5}}},
+            {"deleteDimension": {"range": {"sheetId": 7, "dimension": "ROWS", "startIndex": 2, "endIndex": 3}}},
+        ],
+    )
+    assert worksheet.jsonSheet["properties"]["gridProperties"]["rowCount"] == 7
@@ -2,6 +2,7 @@
 # Copyright (c) 2025 Airbyte, Inc., all rights reserved.
 #
 
+from unittest.mock import MagicMock
 
 import pytest
 from destination_google_sheets.writer import GoogleSheetsWriter
@@ -19,3 +20,68 @@ from destination_google_sheets.writer import GoogleSheetsWriter
 def test_a1_notation(row, col, expected):
     writer = GoogleSheetsWriter(None)
     assert writer._a1_notation(row, col) == expected
+
+
+def create_writer(stream_name="stream_1", properties=("id", "value")):
+    writer = GoogleSheetsWriter(MagicMock())
+    writer.write_from_queue = MagicMock()
+    configured_stream = MagicMock()
+    configured_stream.stream.name = stream_name
+    configured_stream.stream.json_schema = {"properties": {name: {"type": "string"} for name in properties}}
+    writer.init_buffer_stream(configured_stream)
+    return writer
+
+
+def test_buffer_size_counts_row_contents():
+    writer = create_writer()
+    writer.add_to_buffer("stream_1", {"id": "1", "value": "a" * 100})
+    writer.add_to_buffer("stream_1", {"id": "2", "value": "é"})
+    # ["1","aaa..."], and ["2","é"], with the two-byte é
+    assert writer.records_buffer_size["stream_1"] == (1 + 3 + 100 + 3 + 2) + (1 + 3 + 2 + 3 + 2)
+
+    writer.clear_buffer("stream_1")
+    assert writer.records_buffer_size["stream_1"] == 0
+
+
+def test_queue_write_operation_flushes_on_size():
+    writer = create_writer()
+    writer.flush_interval_size_in_kb = 1
+    writer.add_to_buffer("stream_1", {"id": "1", "value": "a" * 600})
+    writer.queue_write_operation("stream_1")
+    writer.write_from_queue.assert_not_called()
+
+    writer.add_to_buffer("stream_1", {"id": "2", "value": "a" * 600})
+    writer.queue_write_operation("stream_1")
+    writer.write_from_queue.assert_called_once_with("stream_1")
+    assert writer.records_buffer["stream_1"] == []
+    assert writer.records_buffer_size["stream_1"] == 0
+
+
+def test_queue_write_operation_flushes_on_count():
+    writer = create_writer()
+    writer.flush_interval = 3
+    for i in range(3):
+        writer.add_to_buffer("stream_1", {"id": str(i), "value": "a"})
+        writer.queue_write_operation("stream_1")
+    writer.write_from_queue.assert_called_once_with("stream_1")
+
+
+def test_queue_write_operation_small_rows_share_request():
+    writer = create_writer()
+    for i in range(5000):
+        writer.add_to_buffer("stream_1", {"id": str(i), "value": "a"})
+        writer.queue_write_operation("stream_1")
+    # the previous measure of the list object flushed every ~250 rows, regardless of their contents
+    writer.write_from_queue.assert_not_called()
+
+
+def test_deduplicate_records():
+    writer = GoogleSheetsWriter(MagicMock())
+    writer.spreadsheet.deduplicate.return_value = 3
+    configured_stream = MagicMock(primary_key=[["id"]])
+    configured_stream.stream.name = "stream_1"
+
+    writer.deduplicate_records(configured_stream)
+
+    writer.spreadsheet.open_worksheet.assert_called_once_with("stream_1")
+    writer.spreadsheet.deduplicate.assert_called_once_with(writer.spreadsheet.open_worksheet.return_value, "id")
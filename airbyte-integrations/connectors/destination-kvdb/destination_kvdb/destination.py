@@ -35,10 +35,9 @@ class DestinationKvdb(Destination):
 
         for message in input_messages:
             if message.type == Type.STATE:
-                # Emitting a state message indicates that all records which came before it have been written to the destination. So we flush
-                # the queue to ensure writes happen, then output the state message to indicate it's safe to checkpoint state
-                writer.flush()
-                yield message
+                # Emitting a state message indicates that all records which came before it have been written to the destination. So the
+                # writer only hands back a state message once every batch queued before it was written
+                yield from writer.queue_state(message)
             elif message.type == Type.RECORD:
                 record = message.record
                 writer.queue_write_operation(
@@ -49,7 +48,10 @@ class DestinationKvdb(Destination):
                 continue
 
         # Make sure to flush any records still in the queue
-        writer.flush()
+        try:
+            yield from writer.flush()
+        finally:
+            writer.close()
 
     def check(self, logger: logging.Logger, config: Mapping[str, Any]) -> AirbyteConnectionStatus:
         """
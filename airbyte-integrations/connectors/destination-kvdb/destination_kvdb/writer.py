@@ -2,8 +2,11 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 #
 
-from collections import Mapping
+from collections.abc import Mapping
+from typing import List
 
+from airbyte_cdk.models import AirbyteMessage
+from destination_kvdb.batch_writer import AsyncBatchWriter
 from destination_kvdb.client import KvDbClient
 
 
@@ -18,11 +21,18 @@ class KvDbWriter:
     read messages with a particular prefix e.g: name__ab__123, where 123 is the timestamp they last read data from.
     """
 
-    write_buffer = []
     flush_interval = 1000
+    max_batch_bytes = 4 * 1024 * 1024
+    max_concurrent_requests = 4
 
     def __init__(self, client: KvDbClient):
         self.client = client
+        self.batch_writer = AsyncBatchWriter(
+            self.client.batch_write,
+            max_batch_size=self.flush_interval,
+            max_batch_bytes=self.max_batch_bytes,
+            max_concurrent_requests=self.max_concurrent_requests,
+        )
 
     def delete_stream_entries(self, stream_name: str):
         """Deletes all the records belonging to the input stream"""
@@ -37,10 +47,15 @@ class KvDbWriter:
 
     def queue_write_operation(self, stream_name: str, record: Mapping, written_at: int):
         kv_pair = (f"{stream_name}__ab__{written_at}", record)
-        self.write_buffer.append(kv_pair)
-        if len(self.write_buffer) == self.flush_interval:
-            self.flush()
+        self.batch_writer.add(kv_pair)
 
-    def flush(self):
-        self.client.batch_write(self.write_buffer)
-        self.write_buffer.clear()
+    def queue_state(self, state: AirbyteMessage) -> List[AirbyteMessage]:
+        """Queues a state message, returns the state messages whose records have all been written"""
+        return self.batch_writer.add_state(state)
+
+    def flush(self) -> List[AirbyteMessage]:
+        """Writes all queued records, returns the remaining state messages"""
+        return self.batch_writer.flush()
+
+    def close(self):
+        self.batch_writer.close()
@@ -2,6 +2,28 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 #
 
+from unittest.mock import MagicMock
 
-def test_example_method():
-    assert True
+from destination_kvdb.writer import KvDbWriter
+
+
+def test_writers_do_not_share_buffers():
+    first_client, second_client = MagicMock(), MagicMock()
+    first, second = KvDbWriter(first_client), KvDbWriter(second_client)
+    first.queue_write_operation("stream", {"a": 1}, 1)
+    assert first.flush() == []
+    assert second.flush() == []
+    first_client.batch_write.assert_called_once_with([("stream__ab__1", {"a": 1})])
+    second_client.batch_write.assert_not_called()
+    first.close()
+    second.close()
+
+
+def test_state_released_after_records_written():
+    client = MagicMock()
+    writer = KvDbWriter(client)
+    writer.queue_write_operation("stream", {"a": 1}, 1)
+    released = writer.queue_state("state") + writer.flush()
+    assert released == ["state"]
+    client.batch_write.assert_called_once()
+    writer.close()
@@ -55,6 +55,16 @@ class MilvusIndexingConfigModel(BaseModel):
     )
     vector_field: str = Field(title="Vector Field", description="The field in the entity that contains the vector", default="vector")
     text_field: str = Field(title="Text Field", description="The field in the entity that contains the embedded text", default="text")
+    flush_on_sync_end: bool = Field(
+        title="Flush on Sync End",
+        description="Seal the collection's growing segments when the sync ends so that newly inserted entities are indexed",
+        default=False,
+    )
+    compact_on_sync_end: bool = Field(
+        title="Compact on Sync End",
+        description="Start a compaction of the collection when the sync ends to merge small segments and purge deleted entities",
+        default=False,
+    )
 
     class Config:
         title = "Indexing"
@@ -11,7 +11,7 @@ from airbyte_cdk.destinations.vector_db_based.document_processor import Document
 from airbyte_cdk.destinations.vector_db_based.embedder import Embedder, create_from_config
 from airbyte_cdk.destinations.vector_db_based.indexer import Indexer
 from airbyte_cdk.destinations.vector_db_based.writer import Writer
-from airbyte_cdk.models import AirbyteConnectionStatus, AirbyteMessage, ConfiguredAirbyteCatalog, ConnectorSpecification, Status
+from airbyte_cdk.models import AirbyteConnectionStatus, AirbyteMessage, ConfiguredAirbyteCatalog, ConnectorSpecification, Status, Type
 from airbyte_cdk.models.airbyte_protocol import DestinationSyncMode
 from destination_milvus.config import ConfigModel
 from destination_milvus.indexer import MilvusIndexer
@@ -36,7 +36,11 @@ class DestinationMilvus(Destination):
         writer = Writer(
             config_model.processing, self.indexer, self.embedder, batch_size=BATCH_SIZE, omit_raw_text=config_model.omit_raw_text
         )
-        yield from writer.write(configured_catalog, input_messages)
+        for message in writer.write(configured_catalog, input_messages):
+            if message.type == Type.STATE:
+                # inserts run in the background while the next batch is embedded, they have to complete before the state is emitted
+                self.indexer.wait_for_inserts()
+            yield message
 
     def check(self, logger: logging.Logger, config: Mapping[str, Any]) -> AirbyteConnectionStatus:
         parsed_config = ConfigModel.parse_obj(config)
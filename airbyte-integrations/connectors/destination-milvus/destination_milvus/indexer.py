@@ -3,16 +3,18 @@
 #
 
 
+import logging
 import os
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from multiprocessing import Process
-from typing import Optional
+from typing import List, Optional
 
-from pymilvus import Collection, CollectionSchema, DataType, FieldSchema, connections, utility
+from pymilvus import Collection, CollectionSchema, DataType, FieldSchema, MilvusException, connections, utility
 
 from airbyte_cdk.destinations.vector_db_based.document_processor import METADATA_RECORD_ID_FIELD, METADATA_STREAM_FIELD
 from airbyte_cdk.destinations.vector_db_based.indexer import Indexer
 from airbyte_cdk.destinations.vector_db_based.utils import create_stream_identifier, format_exception
-from airbyte_cdk.models import ConfiguredAirbyteCatalog
+from airbyte_cdk.models import AirbyteLogMessage, AirbyteMessage, ConfiguredAirbyteCatalog, Level, Type
 from airbyte_cdk.models.airbyte_protocol import DestinationSyncMode
 from destination_milvus.config import MilvusIndexingConfigModel
 
@@ -23,9 +25,17 @@ CLOUD_DEPLOYMENT_MODE = "cloud"
 class MilvusIndexer(Indexer):
     config: MilvusIndexingConfigModel
 
+    # entities per insert request; the chunks of one index() call are inserted in parallel slices of this size
+    INSERT_BATCH_SIZE = 512
+    # primary keys fetched per page and deleted per request when a filter can't be deleted server-side
+    DELETE_BATCH_SIZE = 5000
+    CONCURRENCY = 4
+
     def __init__(self, config: MilvusIndexingConfigModel, embedder_dimensions: int):
         super().__init__(config)
         self.embedder_dimensions = embedder_dimensions
+        self._executor = ThreadPoolExecutor(max_workers=self.CONCURRENCY, thread_name_prefix="milvus")
+        self._pending_inserts: List[Future] = []
 
     def _connect(self):
         connections.connect(
@@ -104,14 +114,26 @@ class MilvusIndexer(Indexer):
                 self._delete_for_filter(f'{METADATA_STREAM_FIELD} == "{create_stream_identifier(stream.stream)}"')
 
     def _delete_for_filter(self, expr: str) -> None:
-        iterator = self._collection.query_iterator(expr=expr)
+        # Deletes run after the inserts queued before them, otherwise they could miss chunks of the same record
+        self.wait_for_inserts()
+        try:
+            # Milvus >= 2.3 evaluates arbitrary filter expressions for deletes on the server
+            self._collection.delete(expr=expr)
+            return
+        except MilvusException as e:
+            logging.info(f"Server-side delete with filter {expr} is not supported ({e}), deleting by primary key instead")
+
+        iterator = self._collection.query_iterator(batch_size=self.DELETE_BATCH_SIZE, expr=expr)
+        deletes = []
         page = iterator.next()
         while len(page) > 0:
             id_field = next(iter(page[0].keys()))
             ids = [next(iter(entity.values())) for entity in page]
             id_list_expr = ", ".join([str(id) for id in ids])
-            self._collection.delete(expr=f"{id_field} in [{id_list_expr}]")
+            deletes.append(self._executor.submit(self._collection.delete, expr=f"{id_field} in [{id_list_expr}]"))
             page = iterator.next()
+        for delete in deletes:
+            delete.result()
 
     def _normalize(self, metadata: dict) -> dict:
         result = {}
@@ -137,7 +159,37 @@ class MilvusIndexer(Indexer):
             if chunk.page_content is not None:
                 entity[self.config.text_field] = chunk.page_content
             entities.append(entity)
-        self._collection.insert(entities)
+
+        # Only one index() call is inserted at a time, so the next batch is embedded while this one is inserted
+        self.wait_for_inserts()
+        self._pending_inserts = [
+            self._executor.submit(self._collection.insert, entities[i : i + self.INSERT_BATCH_SIZE])
+            for i in range(0, len(entities), self.INSERT_BATCH_SIZE)
+        ]
+
+    def wait_for_inserts(self) -> None:
+        """Blocks until the queued inserts are done, raising the first insert error."""
+        pending, self._pending_inserts = self._pending_inserts, []
+        wait(pending)
+        for insert in pending:
+            insert.result()
+
+    def post_sync(self) -> List[AirbyteMessage]:
+        self.wait_for_inserts()
+        messages = []
+        if self.config.flush_on_sync_end:
+            # Seal the growing segments so they get indexed instead of being searched by brute force
+            self._collection.flush()
+            messages.append(self._log(f"Flushed collection {self.config.collection}"))
+        if self.config.compact_on_sync_end:
+            # Compaction runs asynchronously on the server and also purges the entities deleted during the sync
+            self._collection.compact()
+            messages.append(self._log(f"Started compaction of collection {self.config.collection}"))
+        self._executor.shutdown()
+        return messages
+
+    def _log(self, message: str) -> AirbyteMessage:
+        return AirbyteMessage(type=Type.LOG, log=AirbyteLogMessage(level=Level.INFO, message=message))
 
     def delete(self, delete_ids, namespace, stream):
         if len(delete_ids) > 0:
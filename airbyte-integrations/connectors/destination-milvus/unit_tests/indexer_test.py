@@ -8,7 +8,7 @@ from unittest.mock import Mock, call, patch
 
 from destination_milvus.config import MilvusIndexingConfigModel, NoAuth, TokenAuth
 from destination_milvus.indexer import MilvusIndexer
-from pymilvus import DataType
+from pymilvus import DataType, MilvusException
 
 from airbyte_cdk.models.airbyte_protocol import AirbyteStream, DestinationSyncMode, SyncMode
 
@@ -123,7 +123,23 @@ class TestMilvusIndexer(unittest.TestCase):
             [call(field_name="my_vector_field", index_params={"metric_type": "L2", "index_type": "IVF_FLAT", "params": {"nlist": 1024}})]
         )
 
+    def test_pre_sync_deletes_by_filter(self, mock_Collection, mock_utility, mock_connections):
+        self.milvus_indexer.pre_sync(
+            Mock(
+                streams=[
+                    Mock(
+                        destination_sync_mode=DestinationSyncMode.overwrite,
+                        stream=AirbyteStream(name="some_stream", json_schema={}, supported_sync_modes=[SyncMode.full_refresh]),
+                    )
+                ]
+            )
+        )
+
+        mock_Collection.return_value.delete.assert_called_once_with(expr='_ab_stream == "some_stream"')
+        mock_Collection.return_value.query_iterator.assert_not_called()
+
     def test_pre_sync_calls_delete(self, mock_Collection, mock_utility, mock_connections):
+        mock_Collection.return_value.delete.side_effect = [MilvusException(message="unsupported expression"), None]
         mock_iterator = Mock()
         mock_iterator.next.side_effect = [[{"id": 1}], []]
         mock_Collection.return_value.query_iterator.return_value = mock_iterator
@@ -139,7 +155,7 @@ class TestMilvusIndexer(unittest.TestCase):
             )
         )
 
-        mock_Collection.return_value.query_iterator.assert_called_with(expr='_ab_stream == "some_stream"')
+        mock_Collection.return_value.query_iterator.assert_called_with(batch_size=5000, expr='_ab_stream == "some_stream"')
         mock_Collection.return_value.delete.assert_called_with(expr="id in [1]")
 
     def test_pre_sync_does_not_call_delete(self, mock_Collection, mock_utility, mock_connections):
@@ -155,14 +171,45 @@ class TestMilvusIndexer(unittest.TestCase):
             [Mock(metadata={"key": "value", "id": 5}, page_content="some content", embedding=[1, 2, 3])], None, "some_stream"
         )
 
+        self.milvus_indexer.wait_for_inserts()
+
         self.milvus_indexer._collection.insert.assert_called_with([{"key": "value", "vector": [1, 2, 3], "text": "some content", "_id": 5}])
 
+    def test_index_inserts_slices_and_raises_on_wait(self, mock_Collection, mock_utility, mock_connections):
+        self.milvus_indexer._primary_key = "id"
+        self.milvus_indexer.INSERT_BATCH_SIZE = 2
+        self.milvus_indexer._collection.insert.side_effect = [None, Exception("insert failed")]
+        chunks = [Mock(metadata={"key": i}, page_content="some content", embedding=[i]) for i in range(3)]
+
+        self.milvus_indexer.index(chunks, None, "some_stream")
+
+        with self.assertRaises(Exception):
+            self.milvus_indexer.wait_for_inserts()
+        self.assertEqual(self.milvus_indexer._collection.insert.call_count, 2)
+        self.assertCountEqual([len(c.args[0]) for c in self.milvus_indexer._collection.insert.call_args_list], [2, 1])
+
+    def test_post_sync_flushes_and_compacts(self, mock_Collection, mock_utility, mock_connections):
+        self.milvus_indexer.config.flush_on_sync_end = True
+        self.milvus_indexer.config.compact_on_sync_end = True
+
+        messages = self.milvus_indexer.post_sync()
+
+        self.milvus_indexer._collection.flush.assert_called_once()
+        self.milvus_indexer._collection.compact.assert_called_once()
+        self.assertEqual(len(messages), 2)
+
+    def test_post_sync_without_flush_or_compaction(self, mock_Collection, mock_utility, mock_connections):
+        self.assertEqual(self.milvus_indexer.post_sync(), [])
+        self.milvus_indexer._collection.flush.assert_not_called()
+        self.milvus_indexer._collection.compact.assert_not_called()
+
     def test_index_calls_delete(self, mock_Collection, mock_utility, mock_connections):
+        self.milvus_indexer._collection.delete.side_effect = [MilvusException(message="unsupported expression"), None, None]
         mock_iterator = Mock()
         mock_iterator.next.side_effect = [[{"id": "123"}, {"id": "456"}], [{"id": "789"}], []]
         self.milvus_indexer._collection.query_iterator.return_value = mock_iterator
 
         self.milvus_indexer.delete(["some_id"], None, "some_stream")
 
-        self.milvus_indexer._collection.query_iterator.assert_called_with(expr='_ab_record_id in ["some_id"]')
-        self.milvus_indexer._collection.delete.assert_has_calls([call(expr="id in [123, 456]"), call(expr="id in [789]")], any_order=False)
+        self.milvus_indexer._collection.query_iterator.assert_called_with(batch_size=5000, expr='_ab_record_id in ["some_id"]')
+        self.milvus_indexer._collection.delete.assert_has_calls([call(expr="id in [123, 456]"), call(expr="id in [789]")], any_order=True)
@@ -0,0 +1,90 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+"""Run buffer flushes on a dedicated writer thread so that reading input never waits on DuckDB."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from typing import Callable
+
+
+logger = logging.getLogger("airbyte")
+
+MAX_PENDING_FLUSHES = 2
+"""Maximum number of flushes waiting for the writer thread before `submit()` blocks."""
+
+_STOP = object()
+
+
+class BackgroundFlusher:
+    """Execute flush jobs in submission order on a single background thread.
+
+    Jobs are numbered in the order they are submitted. Because they run one at a time, every
+    job numbered up to `completed_count` is known to be committed, which lets the caller
+    release STATE messages only once all the batches received before them are persisted.
+
+    The queue of pending jobs is bounded, so a slow destination applies back pressure to the
+    reader instead of letting buffered records grow without limit.
+    """
+
+    def __init__(self, max_pending: int = MAX_PENDING_FLUSHES) -> None:
+        self._jobs: queue.Queue[object] = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._submitted_count = 0
+        self._completed_count = 0
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, name="motherduck-flusher", daemon=True)
+        self._thread.start()
+
+    @property
+    def submitted_count(self) -> int:
+        """Number of jobs submitted so far."""
+        return self._submitted_count
+
+    @property
+    def completed_count(self) -> int:
+        """Number of jobs that finished successfully, in submission order."""
+        self.raise_if_failed()
+        with self._lock:
+            return self._completed_count
+
+    def submit(self, job: Callable[[], None]) -> int:
+        """Queue a job, blocking while the queue is full. Return the job's sequence number."""
+        self.raise_if_failed()
+        self._jobs.put(job)
+        self._submitted_count += 1
+        return self._submitted_count
+
+    def wait(self) -> None:
+        """Block until every submitted job has been executed."""
+        self._jobs.join()
+        self.raise_if_failed()
+
+    def close(self) -> None:
+        """Stop the writer thread once the already submitted jobs are done."""
+        if self._thread.is_alive():
+            self._jobs.put(_STOP)
+            self._thread.join()
+
+    def raise_if_failed(self) -> None:
+        """Re-raise the error of a failed job in the calling thread."""
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            try:
+                if job is _STOP:
+                    return
+                # After a failure, keep draining the queue so that producers never block forever.
+                if self._error is None:
+                    job()  # type: ignore[operator]
+                    with self._lock:
+                        self._completed_count += 1
+            except BaseException as ex:
+                logger.error("Background flush failed.", exc_info=True)
+                self._error = ex
+            finally:
+                self._jobs.task_done()
@@ -1,24 +1,23 @@
 # Copyright (c) 2024 Airbyte, Inc., all rights reserved.
 from __future__ import annotations
 
-import datetime
+import functools
 import io
-import json
 import logging
 import os
 import re
-import uuid
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass
 from logging import getLogger
-from typing import Any, Dict, Iterable, List, Mapping, cast
+from typing import Any, Iterable, Mapping, cast
 from urllib.parse import urlparse
 
 import orjson
+import pyarrow as pa
 from serpyco_rs import Serializer
 from typing_extensions import override
 
-from airbyte_cdk import AirbyteStream, ConfiguredAirbyteStream, SyncMode
+from airbyte_cdk import AirbyteStream, ConfiguredAirbyteStream, DestinationSyncMode, SyncMode
 from airbyte_cdk.destinations import Destination
 from airbyte_cdk.exception_handler import init_uncaught_exception_handler
 from airbyte_cdk.models import (
@@ -33,12 +32,19 @@ from airbyte_cdk.models import (
 from airbyte_cdk.models.airbyte_protocol_serializers import custom_type_resolver
 from airbyte_cdk.sql import exceptions as exc
 from airbyte_cdk.sql._util.name_normalizers import LowerCaseNormalizer
-from airbyte_cdk.sql.constants import AB_EXTRACTED_AT_COLUMN, AB_INTERNAL_COLUMNS, AB_META_COLUMN, AB_RAW_ID_COLUMN
 from airbyte_cdk.sql.secrets import SecretString
 from airbyte_cdk.sql.shared.catalog_providers import CatalogProvider
 from airbyte_cdk.sql.types import SQLTypeConverter
+from destination_motherduck.background_flusher import BackgroundFlusher
+from destination_motherduck.load_coalescer import (
+    DEFAULT_COALESCE_MAX_MEGABYTES,
+    DEFAULT_COALESCE_MAX_ROWS,
+    DEFAULT_COALESCE_MAX_SECONDS,
+    LoadCoalescer,
+)
 from destination_motherduck.processors.duckdb import DuckDBConfig, DuckDBSqlProcessor
 from destination_motherduck.processors.motherduck import MotherDuckConfig, MotherDuckSqlProcessor
+from destination_motherduck.record_buffer import StreamRecordBuffer
 
 
 logger = getLogger("airbyte")
@@ -46,6 +52,7 @@ logger = getLogger("airbyte")
 CONFIG_MOTHERDUCK_API_KEY = "motherduck_api_key"
 CONFIG_DEFAULT_SCHEMA = "main"
 MAX_STREAM_BATCH_SIZE = 50_000
+CONFIG_COALESCE_LOADS = "coalesce_loads"
 
 
 @dataclass
@@ -233,108 +240,192 @@ class DestinationMotherDuck(Destination):
         for configured_stream in configured_catalog.streams:
             processor.prepare_stream_table(stream_name=configured_stream.stream.name, sync_mode=configured_stream.destination_sync_mode)
 
-        buffer: dict[str, dict[str, list[Any]]] = defaultdict(lambda: defaultdict(list))
-        records_buffered: dict[str, int] = defaultdict(int)
-        records_processed: dict[str, int] = defaultdict(int)
+        # Column names are resolved once per stream rather than once per record.
+        buffers: dict[str, StreamRecordBuffer] = {
+            stream_name: StreamRecordBuffer(processor._get_sql_column_definitions(stream_name).keys()) for stream_name in streams
+        }
+        coalescer = self._get_load_coalescer(config)
         records_since_last_checkpoint: dict[str, int] = defaultdict(int)
         legacy_state_messages: list[AirbyteMessage] = []
-        for message in input_messages:
-            if message.type == Type.STATE and message.state is not None:
-                if message.state.stream is None:
-                    logger.warning("Cannot process legacy state message, skipping.")
-                    # Hold until the end of the stream, and then yield them all at once.
-                    legacy_state_messages.append(message)
-                    continue
-
-                stream_name = message.state.stream.stream_descriptor.name
-                _ = message.state.stream.stream_descriptor.namespace  # Unused currently
-                # flush the buffer
-                self._flush_buffer(
-                    buffer=buffer,
-                    configured_catalog=configured_catalog,
-                    db_path=path,
-                    schema_name=schema_name,
-                    motherduck_api_key=motherduck_api_key,
-                    stream_name=stream_name,
-                )
-                buffer = defaultdict(lambda: defaultdict(list))
-                records_buffered[stream_name] = 0
-
-                # Annotate the state message with the number of records processed
-                message.state.destinationStats = AirbyteStateStats(
-                    recordCount=records_since_last_checkpoint[stream_name],
-                )
-                records_since_last_checkpoint[stream_name] = 0
-
-                yield message
-            elif message.type == Type.RECORD and message.record is not None:
-                data = message.record.data
-                stream_name = message.record.stream
-                if stream_name not in streams:
-                    logger.debug(f"Stream {stream_name} was not present in configured streams, skipping")
-                    continue
-                # add to buffer
-                record_meta: dict[str, str] = {}
-                for column_name in processor._get_sql_column_definitions(stream_name):
-                    if column_name in data:
-                        buffer[stream_name][column_name].append(data[column_name])
-                    elif column_name not in AB_INTERNAL_COLUMNS:
-                        buffer[stream_name][column_name].append(None)
-
-                buffer[stream_name][AB_RAW_ID_COLUMN].append(str(uuid.uuid4()))
-                buffer[stream_name][AB_EXTRACTED_AT_COLUMN].append(datetime.datetime.now().isoformat())
-                buffer[stream_name][AB_META_COLUMN].append(json.dumps(record_meta))
-                records_buffered[stream_name] += 1
-                records_since_last_checkpoint[stream_name] += 1
-
-                if records_buffered[stream_name] >= MAX_STREAM_BATCH_SIZE:
-                    logger.info(
-                        f"Loading {records_buffered[stream_name]:,} records from '{stream_name}' stream buffer...",
-                    )
+        # State messages whose records are flushed or staged, but not yet committed to the final tables.
+        uncommitted_state_messages: list[AirbyteMessage] = []
+        # State messages waiting for the flushes submitted before them, with the number of flushes to wait for.
+        pending_state_messages: deque[tuple[int, AirbyteMessage]] = deque()
+        flusher = BackgroundFlusher()
+        try:
+            for message in input_messages:
+                if message.type == Type.STATE and message.state is not None:
+                    if message.state.stream is None:
+                        logger.warning("Cannot process legacy state message, skipping.")
+                        # Hold until the end of the stream, and then yield them all at once.
+                        legacy_state_messages.append(message)
+                        continue
+
+                    stream_name = message.state.stream.stream_descriptor.name
+                    _ = message.state.stream.stream_descriptor.namespace  # Unused currently
+                    # flush the buffer
                     self._flush_buffer(
-                        buffer=buffer,
+                        processor=processor,
+                        flusher=flusher,
+                        buffers=buffers,
                         configured_catalog=configured_catalog,
-                        db_path=path,
-                        schema_name=schema_name,
-                        motherduck_api_key=motherduck_api_key,
                         stream_name=stream_name,
-                    )
-                    buffer = defaultdict(lambda: defaultdict(list))
-                    records_processed[stream_name] += records_buffered[stream_name]
-                    records_buffered[stream_name] = 0
-                    logger.info(
-                        f"Records loaded successfully. Total '{stream_name}' records processed: {records_processed[stream_name]:,}",
+                        coalescer=coalescer,
                     )
 
-            else:
-                logger.info(f"Message type {message.type} not supported, skipping")
+                    # Annotate the state message with the number of records processed
+                    message.state.destinationStats = AirbyteStateStats(
+                        recordCount=records_since_last_checkpoint[stream_name],
+                    )
+                    records_since_last_checkpoint[stream_name] = 0
+
+                    uncommitted_state_messages.append(message)
+                elif message.type == Type.RECORD and message.record is not None:
+                    stream_name = message.record.stream
+                    if stream_name not in streams:
+                        logger.debug(f"Stream {stream_name} was not present in configured streams, skipping")
+                        continue
+                    # add to buffer
+                    stream_buffer = buffers[stream_name]
+                    stream_buffer.append(message.record.data)
+                    records_since_last_checkpoint[stream_name] += 1
+
+                    if len(stream_buffer) >= MAX_STREAM_BATCH_SIZE:
+                        self._flush_buffer(
+                            processor=processor,
+                            flusher=flusher,
+                            buffers=buffers,
+                            configured_catalog=configured_catalog,
+                            stream_name=stream_name,
+                            coalescer=coalescer,
+                        )
 
-        # flush any remaining messages
-        self._flush_buffer(buffer, configured_catalog, path, schema_name, motherduck_api_key)
+                else:
+                    logger.info(f"Message type {message.type} not supported, skipping")
+
+                if coalescer is not None and coalescer.should_commit():
+                    self._commit_staged_data(processor, flusher, coalescer)
+
+                # Once nothing is left staged, the state messages only wait for the flushes submitted so far.
+                if uncommitted_state_messages and (coalescer is None or not coalescer.has_staged_data()):
+                    pending_state_messages.extend((flusher.submitted_count, state_message) for state_message in uncommitted_state_messages)
+                    uncommitted_state_messages.clear()
+
+                # Emit the state messages whose preceding batches are all committed.
+                while pending_state_messages and pending_state_messages[0][0] <= flusher.completed_count:
+                    yield pending_state_messages.popleft()[1]
+
+            # flush any remaining messages
+            self._flush_buffer(processor, flusher, buffers, configured_catalog, coalescer=coalescer)
+            if coalescer is not None:
+                self._commit_staged_data(processor, flusher, coalescer)
+            flusher.wait()
+        finally:
+            flusher.close()
+
+        yield from (state_message for _, state_message in pending_state_messages)
+        yield from uncommitted_state_messages
         if legacy_state_messages:
             # Save to emit these now, since we've finished processing the stream.
             yield from legacy_state_messages
 
+    @staticmethod
+    def _get_load_coalescer(config: Mapping[str, Any]) -> LoadCoalescer | None:
+        """Return a load coalescer if coalescing is enabled in the config, otherwise None."""
+        if not config.get(CONFIG_COALESCE_LOADS, False):
+            return None
+
+        return LoadCoalescer(
+            max_rows=int(config.get("coalesce_max_rows", DEFAULT_COALESCE_MAX_ROWS)),
+            max_bytes=int(config.get("coalesce_max_megabytes", DEFAULT_COALESCE_MAX_MEGABYTES)) * 1024 * 1024,
+            max_seconds=float(config.get("coalesce_max_seconds", DEFAULT_COALESCE_MAX_SECONDS)),
+        )
+
     def _flush_buffer(
         self,
-        buffer: Dict[str, Dict[str, List[Any]]],
+        processor: DuckDBSqlProcessor | MotherDuckSqlProcessor,
+        flusher: BackgroundFlusher,
+        buffers: dict[str, StreamRecordBuffer],
         configured_catalog: ConfiguredAirbyteCatalog,
-        db_path: str,
-        schema_name: str,
-        motherduck_api_key: str,
         stream_name: str | None = None,
+        coalescer: LoadCoalescer | None = None,
     ) -> None:
         """
-        Flush the buffer to the destination.
+        Hand the buffer off to the background flusher and start a new, empty buffer in its place.
 
-        If no stream name is provided, then all streams will be flushed.
+        If no stream name is provided, then all streams will be flushed. If a coalescer is provided,
+        the records are only staged and are merged into the final table by `_commit_staged_data()`.
         """
         for configured_stream in configured_catalog.streams:
-            if (stream_name is None or stream_name == configured_stream.stream.name) and buffer.get(configured_stream.stream.name):
-                processor = self._get_sql_processor(
-                    configured_catalog=configured_catalog, schema_name=schema_name, db_path=db_path, motherduck_token=motherduck_api_key
-                )
-                processor.write_stream_data_from_buffer(buffer, configured_stream.stream.name, configured_stream.destination_sync_mode)
+            name = configured_stream.stream.name
+            stream_buffer = buffers.get(name)
+            if (stream_name is None or stream_name == name) and stream_buffer:
+                logger.info(f"Loading {len(stream_buffer):,} records from '{name}' stream buffer...")
+                buffers[name] = StreamRecordBuffer(stream_buffer.column_names, stream_buffer.batch_size)
+                pa_table = stream_buffer.to_arrow()
+                if pa_table is None:
+                    logger.warning(
+                        "Writing with PyArrow table failed, falling back to writing with executemany. Expect some performance degradation."
+                    )
+                    records: pa.Table | dict[str, dict[str, list[Any]]] = {name: stream_buffer.to_pydict()}
+                else:
+                    records = pa_table
+
+                if coalescer is None:
+                    flusher.submit(
+                        functools.partial(
+                            self._write_records,
+                            processor=processor,
+                            records=records,
+                            stream_name=name,
+                            sync_mode=configured_stream.destination_sync_mode,
+                        )
+                    )
+                else:
+                    flusher.submit(functools.partial(self._stage_records, processor=processor, records=records, stream_name=name))
+                    coalescer.add_staged(
+                        name,
+                        configured_stream.destination_sync_mode,
+                        num_rows=len(stream_buffer),
+                        num_bytes=pa_table.nbytes if pa_table is not None else 0,
+                    )
+
+    @staticmethod
+    def _write_records(
+        processor: DuckDBSqlProcessor | MotherDuckSqlProcessor,
+        records: pa.Table | dict[str, dict[str, list[Any]]],
+        stream_name: str,
+        sync_mode: DestinationSyncMode,
+    ) -> None:
+        """Write the records of a single stream to its final table."""
+        if isinstance(records, pa.Table):
+            processor.write_stream_data_from_arrow(records, stream_name, sync_mode)
+        else:
+            processor.write_stream_data_from_buffer(records, stream_name, sync_mode)
+        logger.info(f"Records loaded successfully into '{stream_name}'.")
+
+    @staticmethod
+    def _stage_records(
+        processor: DuckDBSqlProcessor | MotherDuckSqlProcessor,
+        records: pa.Table | dict[str, dict[str, list[Any]]],
+        stream_name: str,
+    ) -> None:
+        """Append the records of a single stream to its staging table."""
+        if isinstance(records, pa.Table):
+            processor.stage_stream_data_from_arrow(records, stream_name)
+        else:
+            processor.stage_stream_data_from_buffer(records, stream_name)
+
+    @staticmethod
+    def _commit_staged_data(
+        processor: DuckDBSqlProcessor | MotherDuckSqlProcessor,
+        flusher: BackgroundFlusher,
+        coalescer: LoadCoalescer,
+    ) -> None:
+        """Merge the data staged since the last commit into the final tables."""
+        for stream_name, sync_mode in coalescer.pop_staged_streams().items():
+            logger.info(f"Merging staged records into '{stream_name}'...")
+            flusher.submit(functools.partial(processor.merge_staged_stream_data, stream_name, sync_mode))
 
     def check(self, logger: logging.Logger, config: Mapping[str, Any]) -> AirbyteConnectionStatus:
         """
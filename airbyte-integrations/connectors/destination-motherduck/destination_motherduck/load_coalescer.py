@@ -0,0 +1,72 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+"""Decide when batches staged since the last commit should be merged into the final tables."""
+
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+from airbyte_cdk import DestinationSyncMode
+
+
+DEFAULT_COALESCE_MAX_ROWS = 1_000_000
+DEFAULT_COALESCE_MAX_MEGABYTES = 256
+DEFAULT_COALESCE_MAX_SECONDS = 300
+
+
+class LoadCoalescer:
+    """Track the data staged since the last commit and decide when to commit it.
+
+    Instead of deduplicating and merging every batch into its final table as soon as it is
+    flushed, batches are appended to a per-stream staging table. The staged data is merged
+    once any of the row, byte or time thresholds is reached, so sources that checkpoint very
+    often no longer cause a full temp table / merge cycle for every few hundred records.
+    """
+
+    def __init__(
+        self,
+        max_rows: int = DEFAULT_COALESCE_MAX_ROWS,
+        max_bytes: int = DEFAULT_COALESCE_MAX_MEGABYTES * 1024 * 1024,
+        max_seconds: float = DEFAULT_COALESCE_MAX_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self._clock = clock
+        self._staged_streams: dict[str, DestinationSyncMode] = {}
+        self._staged_rows = 0
+        self._staged_bytes = 0
+        self._first_staged_at: float | None = None
+
+    def has_staged_data(self) -> bool:
+        """Return whether any data was staged since the last commit."""
+        return bool(self._staged_streams)
+
+    def add_staged(self, stream_name: str, sync_mode: DestinationSyncMode, num_rows: int, num_bytes: int) -> None:
+        """Record that a batch was staged for the given stream."""
+        if self._first_staged_at is None:
+            self._first_staged_at = self._clock()
+        self._staged_streams[stream_name] = sync_mode
+        self._staged_rows += num_rows
+        self._staged_bytes += num_bytes
+
+    def should_commit(self) -> bool:
+        """Return whether the staged data has reached any of the commit thresholds."""
+        if not self._staged_streams:
+            return False
+
+        return (
+            self._staged_rows >= self.max_rows
+            or self._staged_bytes >= self.max_bytes
+            or self._clock() - self._first_staged_at >= self.max_seconds  # type: ignore[operator]
+        )
+
+    def pop_staged_streams(self) -> dict[str, DestinationSyncMode]:
+        """Return the streams with staged data and their sync modes, and reset all counters."""
+        staged_streams = self._staged_streams
+        self._staged_streams = {}
+        self._staged_rows = 0
+        self._staged_bytes = 0
+        self._first_staged_at = None
+        return staged_streams
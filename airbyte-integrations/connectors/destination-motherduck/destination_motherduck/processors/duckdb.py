@@ -12,7 +12,7 @@ from urllib.parse import parse_qsl, urlparse
 import pyarrow as pa
 from duckdb_engine import DuckDBEngineWarning
 from overrides import overrides
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 from sqlalchemy import Executable, TextClause, create_engine, text
 from sqlalchemy.exc import ProgrammingError, SQLAlchemyError
 
@@ -26,6 +26,8 @@ from airbyte_cdk.sql.shared.sql_processor import SqlConfig, SqlProcessorBase, SQ
 if TYPE_CHECKING:
     from sqlalchemy.engine import Connection, Engine
 
+    from airbyte_cdk.sql.shared.catalog_providers import CatalogProvider
+
 BUFFER_TABLE_NAME = "_airbyte_temp_buffer_data"
 MOTHERDUCK_SCHEME = "md"
 
@@ -46,6 +48,8 @@ class DuckDBConfig(SqlConfig):
     schema_name: str = Field(default="main")
     """The name of the schema to write to. Defaults to "main"."""
 
+    _engine: Engine | None = PrivateAttr(default=None)
+
     @overrides
     def get_sql_alchemy_url(self) -> SecretString:
         """Return the SQLAlchemy URL to use."""
@@ -94,12 +98,23 @@ class DuckDBConfig(SqlConfig):
 
     @overrides
     def get_sql_engine(self) -> Engine:
+        """Return the SQL engine, creating it on first use.
+
+        A single processor is used for the whole sync, so the engine (and its connection pool)
+        is reused rather than recreated for every statement.
+        """
+        if self._engine is None:
+            self._engine = self._create_sql_engine()
+
+        return self._engine
+
+    def _create_sql_engine(self) -> Engine:
         """
         Return a new SQL engine to use.
 
-        This method is overridden to:
-            - ensure that the database parent directory is created if it doesn't exist.
-            - pass the DuckDB query parameters (such as motherduck_token) via the config
+        This method ensures that:
+            - the database parent directory is created if it doesn't exist.
+            - the DuckDB query parameters (such as motherduck_token) are passed via the config
         """
         if self._is_file_based_db():
             Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
@@ -125,6 +140,16 @@ class DuckDBSqlProcessor(SqlProcessorBase):
     supports_merge_insert = False
     sql_config: DuckDBConfig
 
+    def __init__(
+        self,
+        *,
+        sql_config: DuckDBConfig,
+        catalog_provider: CatalogProvider,
+    ) -> None:
+        super().__init__(sql_config=sql_config, catalog_provider=catalog_provider)
+        self._staging_tables: dict[str, str] = {}
+        """Staging table name by stream name, for data that is not merged into the final table yet."""
+
     def _execute_sql(self, sql: str | TextClause | Executable) -> Sequence[Any]:
         """Execute the given SQL statement."""
         if isinstance(sql, str):
@@ -352,19 +377,62 @@ class DuckDBSqlProcessor(SqlProcessorBase):
         stream_name: str,
         sync_mode: DestinationSyncMode,
     ) -> None:
-        temp_table_name = self._create_table_for_loading(stream_name, batch_id=None)
+        self.stage_stream_data_from_buffer(buffer, stream_name)
+        self.merge_staged_stream_data(stream_name, sync_mode)
+
+    def write_stream_data_from_arrow(
+        self,
+        pa_table: pa.Table,
+        stream_name: str,
+        sync_mode: DestinationSyncMode,
+    ) -> None:
+        """Write an Arrow table of records for the given stream to its final table."""
+        self.stage_stream_data_from_arrow(pa_table, stream_name)
+        self.merge_staged_stream_data(stream_name, sync_mode)
+
+    def stage_stream_data_from_buffer(
+        self,
+        buffer: Dict[str, Dict[str, List[Any]]],
+        stream_name: str,
+    ) -> None:
+        """Append buffered records to the stream's staging table without merging them."""
+        staging_table_name = self._get_staging_table(stream_name)
         try:
             pa_table = pa.Table.from_pydict(buffer[stream_name])
         except Exception:
             logger.exception(
                 "Writing with PyArrow table failed, falling back to writing with executemany. Expect some performance degradation."
             )
-            self._write_with_executemany(buffer, stream_name, temp_table_name)
+            self._write_with_executemany(buffer, stream_name, staging_table_name)
         else:
             # DuckDB will automatically find and SELECT from the `pa_table`
             # local variable defined above.
-            self._write_from_pa_table(temp_table_name, stream_name, pa_table)
+            self._write_from_pa_table(staging_table_name, stream_name, pa_table)
+
+    def stage_stream_data_from_arrow(self, pa_table: pa.Table, stream_name: str) -> None:
+        """Append an Arrow table of records to the stream's staging table without merging them."""
+        self._write_from_pa_table(self._get_staging_table(stream_name), stream_name, pa_table)
+
+    def merge_staged_stream_data(self, stream_name: str, sync_mode: DestinationSyncMode) -> None:
+        """Merge everything staged for the given stream into its final table and drop the staging table."""
+        staging_table_name = self._staging_tables.pop(stream_name, None)
+        if staging_table_name is not None:
+            self._merge_and_drop_temp_table(stream_name, staging_table_name, sync_mode)
 
+    def _get_staging_table(self, stream_name: str) -> str:
+        """Return the stream's staging table, creating it if there is none yet."""
+        if stream_name not in self._staging_tables:
+            self._staging_tables[stream_name] = self._create_table_for_loading(stream_name, batch_id=None)
+
+        return self._staging_tables[stream_name]
+
+    def _merge_and_drop_temp_table(
+        self,
+        stream_name: str,
+        temp_table_name: str,
+        sync_mode: DestinationSyncMode,
+    ) -> None:
+        """Deduplicate a loaded temp table, merge it into the final table and drop it."""
         temp_table_name_dedup = self._drop_duplicates(temp_table_name, stream_name)
         final_table_name = self.normalizer.normalize(stream_name)
 
@@ -65,13 +65,11 @@ class MotherDuckConfig(DuckDBConfig):
         return self.database
 
     @overrides
-    def get_sql_engine(self) -> Engine:
+    def _create_sql_engine(self) -> Engine:
         """
         Return a new SQL engine to use.
 
-        This method is overridden to:
-            - ensure that the database parent directory is created if it doesn't exist.
-            - pass the DuckDB query parameters (such as motherduck_token) via the config
+        This method is overridden to pass the MotherDuck token via the config.
         """
         return create_engine(
             url=self.get_sql_alchemy_url(),
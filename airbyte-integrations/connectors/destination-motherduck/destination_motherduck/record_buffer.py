@@ -0,0 +1,120 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+"""Columnar record buffers used to stage records before loading them into DuckDB."""
+
+from __future__ import annotations
+
+import logging
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Mapping
+
+import pyarrow as pa
+
+from airbyte_cdk.sql.constants import AB_EXTRACTED_AT_COLUMN, AB_INTERNAL_COLUMNS, AB_META_COLUMN, AB_RAW_ID_COLUMN
+
+
+logger = logging.getLogger("airbyte")
+
+RECORD_BATCH_SIZE = 10_000
+"""Number of records converted to Arrow at a time."""
+
+EMPTY_AIRBYTE_META = "{}"
+
+
+class StreamRecordBuffer:
+    """Buffer the records of a single stream and convert them to Arrow in batches.
+
+    Records are held as-is until `batch_size` of them have accumulated, at which point they
+    are converted column by column into an Arrow table. The internal Airbyte columns are
+    generated once per batch rather than once per record.
+
+    If a batch cannot be represented in Arrow (for example because a column holds values of
+    mixed types), its raw column values are kept instead so that the caller can fall back to
+    a row-based insert.
+    """
+
+    def __init__(self, column_names: Iterable[str], batch_size: int = RECORD_BATCH_SIZE) -> None:
+        self.column_names = [column_name for column_name in column_names if column_name not in AB_INTERNAL_COLUMNS]
+        self.batch_size = batch_size
+        self._pending_records: list[Mapping[str, Any]] = []
+        self._pending_extracted_at: list[int] = []
+        self._tables: list[pa.Table] = []
+        self._unconverted: list[Dict[str, List[Any]]] = []
+        self._num_records = 0
+
+    def __len__(self) -> int:
+        return self._num_records
+
+    def append(self, data: Mapping[str, Any]) -> None:
+        """Add a record's data to the buffer."""
+        self._pending_records.append(data)
+        # Microseconds since epoch; converted to an Arrow timestamp column in bulk.
+        self._pending_extracted_at.append(time.time_ns() // 1_000)
+        self._num_records += 1
+        if len(self._pending_records) >= self.batch_size:
+            self._convert_pending_records()
+
+    def clear(self) -> None:
+        """Discard all buffered records."""
+        self._pending_records = []
+        self._pending_extracted_at = []
+        self._tables = []
+        self._unconverted = []
+        self._num_records = 0
+
+    def to_arrow(self) -> pa.Table | None:
+        """Return all buffered records as a single Arrow table.
+
+        Returns None if the records cannot be represented as one Arrow table, in which case
+        `to_pydict()` should be used instead.
+        """
+        self._convert_pending_records()
+        if self._unconverted:
+            return None
+        if len(self._tables) == 1:
+            return self._tables[0]
+
+        try:
+            # Batches may have inferred different types for the same column (e.g. all-null vs. string).
+            return pa.concat_tables(self._tables, promote_options="default")
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            logger.warning("Could not combine record batches into a single Arrow table.", exc_info=True)
+            return None
+
+    def to_pydict(self) -> Dict[str, List[Any]]:
+        """Return all buffered records as a mapping of column name to column values."""
+        self._convert_pending_records()
+        columns: Dict[str, List[Any]] = defaultdict(list)
+        for table in self._tables:
+            for column_name, values in table.to_pydict().items():
+                columns[column_name].extend(values)
+        for batch in self._unconverted:
+            for column_name, values in batch.items():
+                columns[column_name].extend(values)
+        return dict(columns)
+
+    def _convert_pending_records(self) -> None:
+        if not self._pending_records:
+            return
+
+        records = self._pending_records
+        num_records = len(records)
+        columns: Dict[str, Any] = {column_name: [record.get(column_name) for record in records] for column_name in self.column_names}
+        internal_columns = {
+            AB_RAW_ID_COLUMN: pa.array([str(uuid.uuid4()) for _ in range(num_records)], type=pa.string()),
+            AB_EXTRACTED_AT_COLUMN: pa.array(self._pending_extracted_at, type=pa.timestamp("us")),
+            AB_META_COLUMN: pa.repeat(pa.scalar(EMPTY_AIRBYTE_META, type=pa.string()), num_records),
+        }
+        try:
+            table = pa.table({**{name: pa.array(values) for name, values in columns.items()}, **internal_columns})
+        except Exception:
+            logger.warning("Could not convert record batch to Arrow, keeping raw values instead.", exc_info=True)
+            for column_name, values in internal_columns.items():
+                columns[column_name] = values.to_pylist()
+            self._unconverted.append(columns)
+        else:
+            self._tables.append(table)
+
+        self._pending_records = []
+        self._pending_extracted_at = []
@@ -3,24 +3,33 @@ from __future__ import annotations
 
 import tempfile
 from datetime import datetime
+from functools import partial
 from typing import Dict
 from unittest.mock import Mock, patch
 
 import pytest
+from destination_motherduck.background_flusher import BackgroundFlusher
 from destination_motherduck.destination import CONFIG_DEFAULT_SCHEMA, DestinationMotherDuck, validated_sql_name
+from destination_motherduck.load_coalescer import LoadCoalescer
+from destination_motherduck.processors.duckdb import DuckDBSqlProcessor
+from destination_motherduck.record_buffer import StreamRecordBuffer
 
 from airbyte_cdk.models import (
     AirbyteMessage,
     AirbyteRecordMessage,
     AirbyteStateMessage,
+    AirbyteStateType,
     AirbyteStream,
+    AirbyteStreamState,
     ConfiguredAirbyteCatalog,
     ConfiguredAirbyteStream,
     DestinationSyncMode,
     Status,
+    StreamDescriptor,
     SyncMode,
     Type,
 )
+from airbyte_cdk.sql.constants import AB_EXTRACTED_AT_COLUMN, AB_META_COLUMN, AB_RAW_ID_COLUMN
 
 
 def test_validated_sql_name() -> None:
@@ -177,3 +186,203 @@ def test_null_primary_key_handling(monkeypatch) -> None:
     assert None in ids, "Expected to find record with NULL id"
     assert "record_with_valid_pk" in names, "Expected to find record with valid primary key"
     assert "record_with_null_pk_2" in names, "Expected to find the latest null primary key record (record_with_null_pk_2)"
+
+
+def test_stream_record_buffer_converts_records_in_batches() -> None:
+    buffer = StreamRecordBuffer(["id", "name", AB_RAW_ID_COLUMN], batch_size=2)
+    buffer.append({"id": 1, "name": "a"})
+    buffer.append({"id": 2})
+    buffer.append({"id": 3, "name": "c", "unknown": "ignored"})
+
+    assert len(buffer) == 3
+    table = buffer.to_arrow()
+    assert table is not None
+    assert table.num_rows == 3
+    assert set(table.column_names) == {"id", "name", AB_RAW_ID_COLUMN, AB_EXTRACTED_AT_COLUMN, AB_META_COLUMN}
+    assert table.column("name").to_pylist() == ["a", None, "c"]
+    assert len(set(table.column(AB_RAW_ID_COLUMN).to_pylist())) == 3
+
+    buffer.clear()
+    assert len(buffer) == 0
+    assert not buffer
+
+
+def test_stream_record_buffer_falls_back_to_pydict_for_mixed_types() -> None:
+    buffer = StreamRecordBuffer(["value"], batch_size=2)
+    buffer.append({"value": 1})
+    buffer.append({"value": 2})
+    buffer.append({"value": "three"})
+    buffer.append({"value": {"four": 4}})
+
+    assert buffer.to_arrow() is None
+    columns = buffer.to_pydict()
+    assert columns["value"] == [1, 2, "three", {"four": 4}]
+    assert len(columns[AB_RAW_ID_COLUMN]) == 4
+
+
+def test_state_for_one_stream_keeps_other_stream_buffered(monkeypatch) -> None:
+    monkeypatch.setattr(DestinationMotherDuck, "_get_destination_path", lambda _, x: x)
+
+    temp_dir = tempfile.mkdtemp()
+    config = {"destination_path": f"{temp_dir}/test_multi_stream.duckdb", "schema": "test_schema"}
+    json_schema = {"type": "object", "properties": {"id": {"type": ["null", "integer"]}}}
+    configured_catalog = ConfiguredAirbyteCatalog(
+        streams=[
+            ConfiguredAirbyteStream(
+                stream=AirbyteStream(name=name, json_schema=json_schema, supported_sync_modes=[SyncMode.full_refresh]),
+                sync_mode=SyncMode.full_refresh,
+                destination_sync_mode=DestinationSyncMode.append,
+            )
+            for name in ("stream_a", "stream_b")
+        ]
+    )
+
+    def record(stream: str, id_: int) -> AirbyteMessage:
+        return AirbyteMessage(
+            type=Type.RECORD,
+            record=AirbyteRecordMessage(stream=stream, data={"id": id_}, emitted_at=int(datetime.now().timestamp()) * 1000),
+        )
+
+    def state(stream: str) -> AirbyteMessage:
+        return AirbyteMessage(
+            type=Type.STATE,
+            state=AirbyteStateMessage(
+                type=AirbyteStateType.STREAM,
+                stream=AirbyteStreamState(stream_descriptor=StreamDescriptor(name=stream)),
+            ),
+        )
+
+    messages = [record("stream_a", 1), record("stream_b", 2), state("stream_a"), record("stream_b", 3)]
+
+    destination = DestinationMotherDuck()
+    result = list(destination.write(config, configured_catalog, messages))
+
+    assert len(result) == 1
+    assert result[0].state.destinationStats.recordCount == 1
+
+    processor = destination._get_sql_processor(
+        configured_catalog=configured_catalog, schema_name="test_schema", db_path=config["destination_path"]
+    )
+    assert processor._execute_sql("SELECT id FROM test_schema.stream_a") == [(1,)]
+    assert sorted(processor._execute_sql("SELECT id FROM test_schema.stream_b")) == [(2,), (3,)]
+
+
+def test_background_flusher_runs_jobs_in_order() -> None:
+    executed: list[int] = []
+    flusher = BackgroundFlusher(max_pending=1)
+    try:
+        for i in range(5):
+            assert flusher.submit(partial(executed.append, i)) == i + 1
+        flusher.wait()
+    finally:
+        flusher.close()
+
+    assert executed == [0, 1, 2, 3, 4]
+    assert flusher.completed_count == 5
+
+
+def test_background_flusher_reraises_job_errors() -> None:
+    def failing_job() -> None:
+        raise RuntimeError("flush failed")
+
+    executed: list[int] = []
+    flusher = BackgroundFlusher(max_pending=1)
+    try:
+        flusher.submit(failing_job)
+        flusher.submit(partial(executed.append, 1))
+        with pytest.raises(RuntimeError, match="flush failed"):
+            flusher.wait()
+        with pytest.raises(RuntimeError, match="flush failed"):
+            flusher.submit(partial(executed.append, 2))
+    finally:
+        flusher.close()
+
+    # Jobs queued after a failure are discarded.
+    assert executed == []
+
+
+def test_load_coalescer_thresholds() -> None:
+    now = [0.0]
+    coalescer = LoadCoalescer(max_rows=10, max_bytes=100, max_seconds=60, clock=lambda: now[0])
+    assert not coalescer.has_staged_data()
+    assert not coalescer.should_commit()
+
+    coalescer.add_staged("a", DestinationSyncMode.append, num_rows=5, num_bytes=10)
+    assert coalescer.has_staged_data()
+    assert not coalescer.should_commit()
+
+    coalescer.add_staged("b", DestinationSyncMode.append_dedup, num_rows=5, num_bytes=10)
+    assert coalescer.should_commit()
+    assert coalescer.pop_staged_streams() == {"a": DestinationSyncMode.append, "b": DestinationSyncMode.append_dedup}
+    assert not coalescer.has_staged_data()
+
+    coalescer.add_staged("a", DestinationSyncMode.append, num_rows=1, num_bytes=100)
+    assert coalescer.should_commit()
+    coalescer.pop_staged_streams()
+
+    coalescer.add_staged("a", DestinationSyncMode.append, num_rows=1, num_bytes=1)
+    now[0] = 59.0
+    assert not coalescer.should_commit()
+    now[0] = 60.0
+    assert coalescer.should_commit()
+
+
+def test_write_with_coalesced_loads(monkeypatch) -> None:
+    monkeypatch.setattr(DestinationMotherDuck, "_get_destination_path", lambda _, x: x)
+    merged_streams: list[str] = []
+    original_merge = DuckDBSqlProcessor.merge_staged_stream_data
+
+    def tracking_merge(self, stream_name, sync_mode):
+        merged_streams.append(stream_name)
+        original_merge(self, stream_name, sync_mode)
+
+    monkeypatch.setattr(DuckDBSqlProcessor, "merge_staged_stream_data", tracking_merge)
+
+    temp_dir = tempfile.mkdtemp()
+    config = {
+        "destination_path": f"{temp_dir}/test_coalesce.duckdb",
+        "schema": "test_schema",
+        "coalesce_loads": True,
+        "coalesce_max_rows": 4,
+    }
+    json_schema = {"type": "object", "properties": {"id": {"type": ["null", "integer"]}}}
+    configured_catalog = ConfiguredAirbyteCatalog(
+        streams=[
+            ConfiguredAirbyteStream(
+                stream=AirbyteStream(name="stream_a", json_schema=json_schema, supported_sync_modes=[SyncMode.incremental]),
+                sync_mode=SyncMode.incremental,
+                destination_sync_mode=DestinationSyncMode.append_dedup,
+                primary_key=[["id"]],
+            )
+        ]
+    )
+
+    messages = []
+    for i in range(10):
+        messages.append(
+            AirbyteMessage(
+                type=Type.RECORD,
+                record=AirbyteRecordMessage(stream="stream_a", data={"id": i % 5}, emitted_at=int(datetime.now().timestamp()) * 1000),
+            )
+        )
+        messages.append(
+            AirbyteMessage(
+                type=Type.STATE,
+                state=AirbyteStateMessage(
+                    type=AirbyteStateType.STREAM,
+                    stream=AirbyteStreamState(stream_descriptor=StreamDescriptor(name="stream_a"), stream_state={"cursor": i}),
+                ),
+            )
+        )
+
+    destination = DestinationMotherDuck()
+    result = list(destination.write(config, configured_catalog, messages))
+
+    assert [message.state.stream.stream_state["cursor"] for message in result] == list(range(10))
+    # 10 single-record batches, merged every 4 staged rows plus once at the end of the sync.
+    assert merged_streams == ["stream_a"] * 3
+
+    processor = destination._get_sql_processor(
+        configured_catalog=configured_catalog, schema_name="test_schema", db_path=config["destination_path"]
+    )
+    assert sorted(processor._execute_sql("SELECT id FROM test_schema.stream_a")) == [(0,), (1,), (2,), (3,), (4,)]
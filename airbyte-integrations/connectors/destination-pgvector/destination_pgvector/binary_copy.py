@@ -0,0 +1,77 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+"""Helpers to stream rows into Postgres with `COPY ... FROM STDIN (FORMAT binary)`.
+
+See https://www.postgresql.org/docs/current/sql-copy.html#id-1.9.3.55.9.4 for the format.
+"""
+
+from __future__ import annotations
+
+import io
+import struct
+from collections.abc import Iterable, Iterator, Sequence
+
+COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+"""The binary COPY signature, followed by the flags field and the header extension length."""
+
+COPY_TRAILER = struct.pack(">h", -1)
+
+_NULL_FIELD = struct.pack(">i", -1)
+
+
+def encode_row(fields: Sequence[bytes | None]) -> bytes:
+    """Encode one tuple whose fields are already in their binary representation (or None for NULL)."""
+    parts = [struct.pack(">h", len(fields))]
+    for field in fields:
+        if field is None:
+            parts.append(_NULL_FIELD)
+        else:
+            parts.extend((struct.pack(">i", len(field)), field))
+    return b"".join(parts)
+
+
+def encode_text(value: str) -> bytes:
+    """Return the binary representation of a `text`, `varchar` or `json` value."""
+    return value.encode("utf-8")
+
+
+def encode_vector(values: Sequence[float]) -> bytes:
+    """Return the binary representation of a pgvector `vector` value.
+
+    The format is the number of dimensions and an unused flag as int16, followed by each
+    dimension as a float4, all in network byte order.
+    """
+    return struct.pack(f">hh{len(values)}f", len(values), 0, *values)
+
+
+class BinaryCopyStream(io.RawIOBase):
+    """A read-only file object producing a binary COPY stream from encoded rows.
+
+    Rows are pulled from the iterator only as the database driver reads, so the amount of
+    data held in memory does not depend on the number of rows.
+    """
+
+    def __init__(self, rows: Iterable[bytes]) -> None:
+        super().__init__()
+        self._chunks: Iterator[bytes] = self._with_header_and_trailer(rows)
+        self._current = memoryview(b"")
+
+    @staticmethod
+    def _with_header_and_trailer(rows: Iterable[bytes]) -> Iterator[bytes]:
+        yield COPY_HEADER
+        yield from rows
+        yield COPY_TRAILER
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:  # type: ignore[override]
+        while not self._current:
+            try:
+                self._current = memoryview(next(self._chunks))
+            except StopIteration:
+                return 0
+
+        size = min(len(buffer), len(self._current))
+        buffer[:size] = self._current[:size]
+        self._current = self._current[size:]
+        return size
@@ -61,6 +61,23 @@ class PGVectorIndexingModel(BaseModel):
     # E.g. "credentials": {"password": "AIRBYTE_PASSWORD"}
     credentials: PasswordBasedAuthorizationModel
 
+    embedding_batch_size: int = Field(
+        default=256,
+        title="Embedding Batch Size",
+        order=8,
+        ge=1,
+        description="Number of document chunks, collected across records, to send to the embedding provider in a single request",
+        examples=[256],
+    )
+    embedding_concurrency: int = Field(
+        default=1,
+        title="Embedding Concurrency",
+        order=9,
+        ge=1,
+        description="Number of embedding batches to request concurrently. Increase this if your embedding provider's rate limits allow it.",
+        examples=[1, 4],
+    )
+
     class Config:
         title = "Postgres Connection"
         schema_extra = {
@@ -47,6 +47,8 @@ class DestinationPGVector(Destination):
             catalog_provider=CatalogProvider(configured_catalog),
             temp_dir=Path(tempfile.mkdtemp()),
             temp_file_cleanup=True,
+            embedding_batch_size=config.indexing.embedding_batch_size,
+            embedding_concurrency=config.indexing.embedding_concurrency,
         )
 
     def write(
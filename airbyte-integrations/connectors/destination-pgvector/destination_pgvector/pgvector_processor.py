@@ -3,16 +3,28 @@
 
 from __future__ import annotations
 
+import gzip
+import io
 import uuid
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 from textwrap import dedent
 from typing import Any
 
 import dpath
+import orjson
 import sqlalchemy
 from airbyte._processors.file.jsonl import JsonlWriter
 from airbyte.secrets import SecretString
+from airbyte.strategies import WriteStrategy
 from airbyte_cdk.destinations.vector_db_based import embedder
+from airbyte_cdk.destinations.vector_db_based.document_processor import (
+    Chunk,
+)
 from airbyte_cdk.destinations.vector_db_based.document_processor import (
     DocumentProcessor as DocumentSplitter,
 )
@@ -24,6 +36,12 @@ from overrides import overrides
 from pgvector.sqlalchemy import Vector
 from typing_extensions import Protocol
 
+from destination_pgvector.binary_copy import (
+    BinaryCopyStream,
+    encode_row,
+    encode_text,
+    encode_vector,
+)
 from destination_pgvector.common.catalog.catalog_providers import CatalogProvider
 from destination_pgvector.common.sql.sql_processor import SqlConfig, SqlProcessorBase
 from destination_pgvector.globals import (
@@ -34,6 +52,45 @@ from destination_pgvector.globals import (
     METADATA_COLUMN,
 )
 
+COPY_READ_BUFFER_SIZE = 1024 * 1024
+"""Size of the reads used to feed the COPY stream to the database."""
+
+COPY_COLUMN_ENCODERS: dict[str, Callable[[Any], bytes]] = {
+    DOCUMENT_ID_COLUMN: lambda value: encode_text(str(value)),
+    CHUNK_ID_COLUMN: lambda value: encode_text(str(value)),
+    METADATA_COLUMN: orjson.dumps,
+    DOCUMENT_CONTENT_COLUMN: encode_text,
+    EMBEDDING_COLUMN: encode_vector,
+}
+"""Binary COPY encoders for the values of each column."""
+
+DEFAULT_EMBEDDING_BATCH_SIZE = 256
+"""The default number of chunks to embed per request to the embedding provider."""
+
+CHUNK_RECORD_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        DOCUMENT_ID_COLUMN: {"type": "string"},
+        CHUNK_ID_COLUMN: {"type": "string"},
+        METADATA_COLUMN: {"type": "object"},
+        DOCUMENT_CONTENT_COLUMN: {"type": "string"},
+        EMBEDDING_COLUMN: {
+            "type": "array",
+            "items": {"type": "float"},
+        },
+    },
+}
+"""The JSON schema of the records written for each document chunk."""
+
+
+@dataclass
+class _PendingChunk:
+    """A document chunk waiting to be embedded."""
+
+    record_msg: AirbyteRecordMessage
+    document_id: str
+    chunk: Chunk
+
 
 class PostgresConfig(SqlConfig):
     """Configuration for the Postgres cache.
@@ -94,10 +151,22 @@ class PGVectorProcessor(SqlProcessorBase):
         catalog_provider: CatalogProvider,
         temp_dir: Path,
         temp_file_cleanup: bool = True,
+        embedding_batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE,
+        embedding_concurrency: int = 1,
     ) -> None:
         """Initialize the PGVector processor."""
         self.splitter_config = splitter_config
         self.embedder_config = embedder_config
+        self.embedding_batch_size = embedding_batch_size
+        self.embedding_concurrency = embedding_concurrency
+        self._pending_chunks: list[_PendingChunk] = []
+        self._embedding_executor = ThreadPoolExecutor(
+            max_workers=embedding_concurrency,
+            thread_name_prefix="embedding",
+        )
+        self._embedding_batches: deque[
+            tuple[list[_PendingChunk], Future[list[list[float] | None]]]
+        ] = deque()
         super().__init__(
             sql_config=sql_config,
             catalog_provider=catalog_provider,
@@ -164,6 +233,55 @@ class PGVectorProcessor(SqlProcessorBase):
             conn.execute(delete_statement)
             conn.execute(append_statement)
 
+    @overrides
+    def _write_files_to_new_table(
+        self,
+        files: list[Path],
+        stream_name: str,
+        batch_id: str,
+    ) -> str:
+        """Write the staged files to a new table using `COPY ... FROM STDIN (FORMAT binary)`.
+
+        Records are streamed from the files straight into the COPY stream, so memory use does
+        not depend on the batch size.
+        """
+        temp_table_name = self._create_table_for_loading(stream_name, batch_id)
+        columns_list = list(self._get_sql_column_definitions(stream_name=stream_name).keys())
+        copy_statement = (
+            f"COPY {self._fully_qualified(temp_table_name)} "
+            f"({', '.join(self._quote_identifier(column) for column in columns_list)}) "
+            "FROM STDIN WITH (FORMAT binary)"
+        )
+        with self.get_sql_connection() as conn:
+            cursor = conn.connection.cursor()
+            try:
+                for file_path in files:
+                    cursor.copy_expert(
+                        copy_statement,
+                        io.BufferedReader(
+                            BinaryCopyStream(self._iter_copy_rows(file_path, columns_list)),
+                            buffer_size=COPY_READ_BUFFER_SIZE,
+                        ),
+                        size=COPY_READ_BUFFER_SIZE,
+                    )
+            finally:
+                cursor.close()
+
+        return temp_table_name
+
+    @staticmethod
+    def _iter_copy_rows(file_path: Path, columns_list: list[str]) -> Iterator[bytes]:
+        """Yield each record of a staged JSONL file as an encoded binary COPY row."""
+        with gzip.open(file_path, "rb") as file:
+            for line in file:
+                record = orjson.loads(line)
+                yield encode_row([
+                    None
+                    if record.get(column) is None
+                    else COPY_COLUMN_ENCODERS[column](record[column])
+                    for column in columns_list
+                ])
+
     def process_record_message(
         self,
         record_msg: AirbyteRecordMessage,
@@ -173,45 +291,73 @@ class PGVectorProcessor(SqlProcessorBase):
 
         We override the SQLProcessor implementation in order to handle chunking, embedding, etc.
 
-        This method is called for each record message, before the record is written to local file.
+        This method is called for each record message. Chunks are collected across records and
+        embedded in batches of `embedding_batch_size`, with up to `embedding_concurrency` batches
+        in flight. Chunks are written to the local file once their batch is embedded.
         """
         document_chunks, id_to_delete = self.splitter.process(record_msg)
 
         _ = id_to_delete  # unused
 
-        embeddings = self.embedder.embed_documents(
-            documents=document_chunks,
+        document_id = self._create_document_id(record_msg)
+        self._pending_chunks.extend(
+            _PendingChunk(record_msg=record_msg, document_id=document_id, chunk=chunk)
+            for chunk in document_chunks
+        )
+        if len(self._pending_chunks) >= self.embedding_batch_size:
+            self._submit_embedding_batch()
+
+    @overrides
+    def write_all_stream_data(self, write_strategy: WriteStrategy) -> None:
+        """Embed and write any remaining chunks before finalizing the streams."""
+        self._submit_embedding_batch()
+        self._write_embedded_batches(max_in_flight=0)
+        self._embedding_executor.shutdown()
+        super().write_all_stream_data(write_strategy=write_strategy)
+
+    def _submit_embedding_batch(self) -> None:
+        """Send the pending chunks to the embedder as one batch."""
+        if not self._pending_chunks:
+            return
+
+        # Wait for a free slot so that at most `embedding_concurrency` batches are in flight.
+        self._write_embedded_batches(max_in_flight=self.embedding_concurrency - 1)
+
+        batch = self._pending_chunks
+        self._pending_chunks = []
+        future = self._embedding_executor.submit(
+            self.embedder.embed_documents,
+            documents=[pending_chunk.chunk for pending_chunk in batch],
+        )
+        self._embedding_batches.append((batch, future))
+
+    def _write_embedded_batches(self, max_in_flight: int) -> None:
+        """Write embedded batches in submission order, until at most `max_in_flight` remain."""
+        while len(self._embedding_batches) > max_in_flight:
+            batch, future = self._embedding_batches.popleft()
+            embeddings = future.result()
+            for pending_chunk, embedding in zip(batch, embeddings):
+                self._write_chunk(pending_chunk, embedding)
+
+    def _write_chunk(self, pending_chunk: _PendingChunk, embedding: list[float] | None) -> None:
+        record_msg = pending_chunk.record_msg
+        new_data: dict[str, Any] = {
+            DOCUMENT_ID_COLUMN: pending_chunk.document_id,
+            CHUNK_ID_COLUMN: str(uuid.uuid4().int),
+            METADATA_COLUMN: pending_chunk.chunk.metadata,
+            DOCUMENT_CONTENT_COLUMN: pending_chunk.chunk.page_content,
+            EMBEDDING_COLUMN: embedding,
+        }
+
+        self.file_writer.process_record_message(
+            record_msg=AirbyteRecordMessage(
+                namespace=record_msg.namespace,
+                stream=record_msg.stream,
+                data=new_data,
+                emitted_at=record_msg.emitted_at,
+            ),
+            stream_schema=CHUNK_RECORD_SCHEMA,
         )
-        for i, chunk in enumerate(document_chunks, start=0):
-            new_data: dict[str, Any] = {
-                DOCUMENT_ID_COLUMN: self._create_document_id(record_msg),
-                CHUNK_ID_COLUMN: str(uuid.uuid4().int),
-                METADATA_COLUMN: chunk.metadata,
-                DOCUMENT_CONTENT_COLUMN: chunk.page_content,
-                EMBEDDING_COLUMN: embeddings[i],
-            }
-
-            self.file_writer.process_record_message(
-                record_msg=AirbyteRecordMessage(
-                    namespace=record_msg.namespace,
-                    stream=record_msg.stream,
-                    data=new_data,
-                    emitted_at=record_msg.emitted_at,
-                ),
-                stream_schema={
-                    "type": "object",
-                    "properties": {
-                        DOCUMENT_ID_COLUMN: {"type": "string"},
-                        CHUNK_ID_COLUMN: {"type": "string"},
-                        METADATA_COLUMN: {"type": "object"},
-                        DOCUMENT_CONTENT_COLUMN: {"type": "string"},
-                        EMBEDDING_COLUMN: {
-                            "type": "array",
-                            "items": {"type": "float"},
-                        },
-                    },
-                },
-            )
 
     def _add_missing_columns_to_table(
         self,
@@ -224,7 +370,7 @@ class PGVectorProcessor(SqlProcessorBase):
         """
         pass
 
-    @property
+    @cached_property
     def embedder(self) -> embedder.Embedder:
         return embedder.create_from_config(
             embedding_config=self.embedder_config,  # type: ignore [arg-type]  # No common base class
@@ -236,7 +382,7 @@ class PGVectorProcessor(SqlProcessorBase):
         """Return the number of dimensions for the embeddings."""
         return self.embedder.embedding_dimensions
 
-    @property
+    @cached_property
     def splitter(self) -> DocumentSplitter:
         return DocumentSplitter(
             config=self.splitter_config,
@@ -0,0 +1,182 @@
+#
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+#
+
+import gzip
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, Mock, patch
+
+import orjson
+from airbyte.strategies import WriteStrategy
+from airbyte_cdk.destinations.vector_db_based.document_processor import Chunk
+from airbyte_cdk.models import AirbyteRecordMessage
+
+from destination_pgvector.binary_copy import COPY_HEADER, COPY_TRAILER
+from destination_pgvector.globals import (
+    CHUNK_ID_COLUMN,
+    DOCUMENT_CONTENT_COLUMN,
+    DOCUMENT_ID_COLUMN,
+    EMBEDDING_COLUMN,
+    METADATA_COLUMN,
+)
+from destination_pgvector.pgvector_processor import PGVectorProcessor, PostgresConfig
+
+
+class TestPGVectorProcessor(unittest.TestCase):
+    def _create_processor(
+        self, embedding_batch_size: int, embedding_concurrency: int = 1
+    ) -> PGVectorProcessor:
+        with patch.object(PGVectorProcessor, "_ensure_schema_exists"):
+            processor = PGVectorProcessor(
+                sql_config=PostgresConfig(
+                    host="localhost",
+                    port=5432,
+                    database="db",
+                    schema_name="public",
+                    username="user",
+                    password="password",
+                ),
+                splitter_config=Mock(),
+                embedder_config=Mock(),
+                catalog_provider=MagicMock(),
+                temp_dir=Path(tempfile.mkdtemp()),
+                embedding_batch_size=embedding_batch_size,
+                embedding_concurrency=embedding_concurrency,
+            )
+        processor.file_writer = Mock()
+
+        # Each record is split into two chunks.
+        splitter = Mock()
+        splitter.process.side_effect = lambda record: (
+            [
+                Chunk(page_content=f"{record.data['id']}-{i}", metadata={}, record=record)
+                for i in range(2)
+            ],
+            None,
+        )
+        embedder = Mock()
+        embedder.embed_documents.side_effect = lambda documents: [
+            [float(len(documents))] for _ in documents
+        ]
+        # Pre-populate the cached properties with the mocks.
+        processor.__dict__["splitter"] = splitter
+        processor.__dict__["embedder"] = embedder
+        return processor
+
+    @patch(
+        "destination_pgvector.common.destinations.record_processor.RecordProcessorBase.write_all_stream_data"
+    )
+    def test_chunks_are_embedded_in_batches_across_records(self, mock_write_all_stream_data):
+        processor = self._create_processor(embedding_batch_size=4, embedding_concurrency=2)
+
+        for i in range(5):
+            processor.process_record_message(
+                AirbyteRecordMessage(stream="mystream", data={"id": i}, emitted_at=0),
+                stream_schema={},
+            )
+        processor.write_all_stream_data(write_strategy=WriteStrategy.AUTO)
+
+        batch_sizes = [
+            len(call.kwargs["documents"])
+            for call in processor.embedder.embed_documents.call_args_list
+        ]
+        self.assertEqual(batch_sizes, [4, 4, 2])
+
+        written = [
+            call.kwargs["record_msg"].data
+            for call in processor.file_writer.process_record_message.call_args_list
+        ]
+        self.assertEqual(len(written), 10)
+        self.assertEqual([data[EMBEDDING_COLUMN] for data in written], [[4.0]] * 8 + [[2.0]] * 2)
+        # Both chunks of a record share the same document ID.
+        self.assertEqual(written[0][DOCUMENT_ID_COLUMN], written[1][DOCUMENT_ID_COLUMN])
+        mock_write_all_stream_data.assert_called_once_with(write_strategy=WriteStrategy.AUTO)
+
+    @patch("destination_pgvector.pgvector_processor.DocumentSplitter")
+    @patch("destination_pgvector.pgvector_processor.embedder.create_from_config")
+    def test_embedder_and_splitter_are_reused(self, mock_create_embedder, mock_splitter_class):
+        processor = self._create_processor(embedding_batch_size=1)
+        del processor.__dict__["splitter"]
+        del processor.__dict__["embedder"]
+
+        self.assertIs(processor.embedder, processor.embedder)
+        self.assertIs(processor.splitter, processor.splitter)
+        mock_create_embedder.assert_called_once()
+        mock_splitter_class.assert_called_once()
+
+    def test_files_are_loaded_with_binary_copy(self):
+        processor = self._create_processor(embedding_batch_size=1)
+        processor.embedder.embedding_dimensions = 2
+        file_path = Path(tempfile.mkdtemp()) / "batch.jsonl.gz"
+        with gzip.open(file_path, "w") as file:
+            file.write(
+                orjson.dumps({
+                    DOCUMENT_ID_COLUMN: "doc",
+                    CHUNK_ID_COLUMN: "123",
+                    METADATA_COLUMN: {"key": "välue"},
+                    DOCUMENT_CONTENT_COLUMN: "content",
+                    EMBEDDING_COLUMN: [0.5, -1.0],
+                    "_airbyte_extracted_at": "2024-01-01T00:00:00",
+                })
+                + b"\n"
+            )
+            file.write(
+                orjson.dumps({
+                    DOCUMENT_ID_COLUMN: "doc2",
+                    CHUNK_ID_COLUMN: "456",
+                    METADATA_COLUMN: None,
+                    DOCUMENT_CONTENT_COLUMN: "x",
+                })
+                + b"\n"
+            )
+
+        copied: list[tuple[str, bytes]] = []
+        cursor = Mock()
+        cursor.copy_expert.side_effect = lambda sql, stream, size: copied.append((
+            sql,
+            stream.read(),
+        ))
+        connection = MagicMock()
+        connection.connection.cursor.return_value = cursor
+        with (
+            patch.object(processor, "_create_table_for_loading", return_value="temp_table"),
+            patch.object(processor, "get_sql_connection") as mock_get_sql_connection,
+        ):
+            mock_get_sql_connection.return_value.__enter__.return_value = connection
+            table_name = processor._write_files_to_new_table(
+                files=[file_path], stream_name="mystream", batch_id="1"
+            )
+
+        self.assertEqual(table_name, "temp_table")
+        self.assertEqual(len(copied), 1)
+        sql, data = copied[0]
+        self.assertIn("COPY", sql)
+        self.assertIn("FROM STDIN WITH (FORMAT binary)", sql)
+        self.assertTrue(data.startswith(COPY_HEADER))
+        self.assertTrue(data.endswith(COPY_TRAILER))
+
+        def parse_rows(payload: bytes) -> list[list[bytes | None]]:
+            rows, offset = [], len(COPY_HEADER)
+            while True:
+                (field_count,) = struct.unpack_from(">h", payload, offset)
+                offset += 2
+                if field_count == -1:
+                    return rows
+                row = []
+                for _ in range(field_count):
+                    (length,) = struct.unpack_from(">i", payload, offset)
+                    offset += 4
+                    if length == -1:
+                        row.append(None)
+                    else:
+                        row.append(payload[offset : offset + length])
+                        offset += length
+                rows.append(row)
+
+        first, second = parse_rows(data)
+        self.assertEqual(first[:4], [b"doc", b"123", orjson.dumps({"key": "välue"}), b"content"])
+        self.assertEqual(struct.unpack(">hh2f", first[4]), (2, 0, 0.5, -1.0))
+        self.assertEqual(second, [b"doc2", b"456", None, b"x", None])
@@ -11,7 +11,7 @@ from airbyte_cdk.destinations.vector_db_based.document_processor import Document
 from airbyte_cdk.destinations.vector_db_based.embedder import Embedder, create_from_config
 from airbyte_cdk.destinations.vector_db_based.indexer import Indexer
 from airbyte_cdk.destinations.vector_db_based.writer import Writer
-from airbyte_cdk.models import AirbyteConnectionStatus, AirbyteMessage, ConfiguredAirbyteCatalog, ConnectorSpecification, Status
+from airbyte_cdk.models import AirbyteConnectionStatus, AirbyteMessage, ConfiguredAirbyteCatalog, ConnectorSpecification, Status, Type
 from airbyte_cdk.models.airbyte_protocol import DestinationSyncMode
 from airbyte_protocol.models.airbyte_protocol import AirbyteLogMessage, Level
 from destination_pinecone.config import ConfigModel
@@ -41,7 +41,11 @@ class DestinationPinecone(Destination):
             writer = Writer(
                 config_model.processing, self.indexer, self.embedder, batch_size=BATCH_SIZE, omit_raw_text=config_model.omit_raw_text
             )
-            yield from writer.write(configured_catalog, input_messages)
+            for message in writer.write(configured_catalog, input_messages):
+                if message.type == Type.STATE:
+                    # upserts are still in flight while the writer moves on, they have to complete before the state is emitted
+                    self.indexer.flush()
+                yield message
         except Exception as e:
             log_message = AirbyteLogMessage(level=Level.ERROR, message=str(e))
             yield AirbyteMessage(type="LOG", message=log_message)
@@ -3,8 +3,11 @@
 #
 
 import os
+import threading
+import time
 import uuid
-from typing import Optional
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Optional
 
 import urllib3
 from pinecone import PineconeException
@@ -13,7 +16,7 @@ from pinecone.grpc import PineconeGRPC
 from airbyte_cdk.destinations.vector_db_based.document_processor import METADATA_RECORD_ID_FIELD, METADATA_STREAM_FIELD
 from airbyte_cdk.destinations.vector_db_based.indexer import Indexer
 from airbyte_cdk.destinations.vector_db_based.utils import create_chunks, create_stream_identifier, format_exception
-from airbyte_cdk.models import AirbyteConnectionStatus, Status
+from airbyte_cdk.models import AirbyteConnectionStatus, AirbyteLogMessage, AirbyteMessage, Level, Status, Type
 from airbyte_cdk.models.airbyte_protocol import ConfiguredAirbyteCatalog, DestinationSyncMode
 from destination_pinecone.config import PineconeIndexingModel
 
@@ -21,7 +24,7 @@ from destination_pinecone.config import PineconeIndexingModel
 # large enough to speed up processing, small enough to not hit pinecone request limits
 PINECONE_BATCH_SIZE = 40
 
-# do not flood the server with too many connections in parallel
+# do not flood the server with too many connections in parallel, this many upsert requests are kept in flight
 PARALLELISM_LIMIT = 4
 
 MAX_METADATA_SIZE = 40_960 - 10_000
@@ -32,6 +35,49 @@ AIRBYTE_TAG = "airbyte"
 AIRBYTE_TEST_TAG = "airbyte_test"
 
 
+class NamespaceStats:
+    """
+    Throughput and latency counters of the requests sent to one namespace.
+    Upserts are recorded from the gRPC callback threads, hence the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at: Optional[float] = None
+        self.upsert_requests = 0
+        self.upserted_vectors = 0
+        self.upsert_latency_seconds = 0.0
+        self.delete_requests = 0
+        self.deleted_records = 0
+
+    def start(self):
+        with self._lock:
+            if self.started_at is None:
+                self.started_at = time.monotonic()
+
+    def record_upsert(self, vector_count: int, latency_seconds: float):
+        with self._lock:
+            self.upsert_requests += 1
+            self.upserted_vectors += vector_count
+            self.upsert_latency_seconds += latency_seconds
+
+    def record_delete(self, record_count: int, request_count: int):
+        with self._lock:
+            self.delete_requests += request_count
+            self.deleted_records += record_count
+
+    def summary(self, namespace: Optional[str]) -> str:
+        elapsed = time.monotonic() - self.started_at if self.started_at is not None else 0.0
+        throughput = self.upserted_vectors / elapsed if elapsed > 0 else 0.0
+        average_latency_ms = 1000 * self.upsert_latency_seconds / self.upsert_requests if self.upsert_requests else 0.0
+        label = f"namespace {namespace}" if namespace else "default namespace"
+        return (
+            f"Pinecone {label}: upserted {self.upserted_vectors} vectors in {self.upsert_requests} requests "
+            f"({throughput:.1f} vectors/s, average upsert latency {average_latency_ms:.0f} ms), "
+            f"deleted {self.deleted_records} records in {self.delete_requests} requests"
+        )
+
+
 class PineconeIndexer(Indexer):
     config: PineconeIndexingModel
 
@@ -44,6 +90,11 @@ class PineconeIndexer(Indexer):
 
         self.pinecone_index = self.pc.Index(config.index)
         self.embedding_dimensions = embedding_dimensions
+        # upserts are not awaited by index(), so they overlap with embedding the next batch
+        self._in_flight_upserts: Deque = deque()
+        # record ids to delete, collected over all streams of a batch and sent as one delete per namespace
+        self._pending_deletes: Dict[Optional[str], List[str]] = defaultdict(list)
+        self.stats: Dict[Optional[str], NamespaceStats] = defaultdict(NamespaceStats)
 
     def determine_spec_type(self, index_name):
         description = self.pc.describe_index(index_name)
@@ -66,7 +117,23 @@ class PineconeIndexer(Indexer):
                 )
 
     def post_sync(self):
-        return []
+        self.flush()
+        return [
+            AirbyteMessage(type=Type.LOG, log=AirbyteLogMessage(level=Level.INFO, message=stats.summary(namespace)))
+            for namespace, stats in self.stats.items()
+        ]
+
+    def flush(self):
+        """
+        Sends the pending deletes and waits for every upsert in flight (raises in case of error).
+        Has to be called before a state message is emitted.
+        """
+        self._flush_deletes()
+        self._wait_for_upserts()
+
+    def _wait_for_upserts(self, max_in_flight: int = 0):
+        while len(self._in_flight_upserts) > max_in_flight:
+            self._in_flight_upserts.popleft().result()
 
     def get_source_tag(self):
         is_test = "PYTEST_CURRENT_TEST" in os.environ or "RUN_IN_AIRBYTE_CI" in os.environ
@@ -127,6 +194,8 @@ class PineconeIndexer(Indexer):
         return result
 
     def index(self, document_chunks, namespace, streamName):
+        # the deletes of this batch have to happen before its new chunks are upserted
+        self._flush_deletes()
         pinecone_docs = []
         for i in range(len(document_chunks)):
             chunk = document_chunks[i]
@@ -135,29 +204,46 @@ class PineconeIndexer(Indexer):
                 metadata["text"] = chunk.page_content
             prefix = streamName
             pinecone_docs.append((prefix + "#" + str(uuid.uuid4()), chunk.embedding, metadata))
-        serial_batches = create_chunks(pinecone_docs, batch_size=PINECONE_BATCH_SIZE * PARALLELISM_LIMIT)
-        for batch in serial_batches:
-            async_results = []
-            for ids_vectors_chunk in create_chunks(batch, batch_size=PINECONE_BATCH_SIZE):
-                async_result = self.pinecone_index.upsert(
-                    vectors=ids_vectors_chunk, async_req=True, show_progress=False, namespace=namespace
-                )
-                async_results.append(async_result)
-            # Wait for and retrieve responses (this raises in case of error)
-            [async_result.result() for async_result in async_results]
+        for ids_vectors_chunk in create_chunks(pinecone_docs, batch_size=PINECONE_BATCH_SIZE):
+            self._upsert(ids_vectors_chunk, namespace)
+
+    def _upsert(self, vectors, namespace):
+        # sliding window: a new request is sent as soon as the oldest one finished instead of waiting for a whole group
+        self._wait_for_upserts(max_in_flight=PARALLELISM_LIMIT - 1)
+        stats = self.stats[namespace]
+        stats.start()
+        started_at = time.monotonic()
+        async_result = self.pinecone_index.upsert(vectors=vectors, async_req=True, show_progress=False, namespace=namespace)
+        async_result.add_done_callback(lambda _: stats.record_upsert(len(vectors), time.monotonic() - started_at))
+        self._in_flight_upserts.append(async_result)
 
     def delete(self, delete_ids, namespace, stream):
-        filter = {METADATA_RECORD_ID_FIELD: {"$in": delete_ids}}
         if len(delete_ids) > 0:
+            self._pending_deletes[namespace].extend(delete_ids)
+
+    def _flush_deletes(self):
+        if not self._pending_deletes:
+            return
+        # chunks of a previous version of a record may still be in flight, they have to land before they can be deleted
+        self._wait_for_upserts()
+        pending_deletes, self._pending_deletes = self._pending_deletes, defaultdict(list)
+        for namespace, delete_ids in pending_deletes.items():
+            filter = {METADATA_RECORD_ID_FIELD: {"$in": delete_ids}}
             if self._pod_type == "starter":
                 # Starter pod types have a maximum of 100000 rows
                 top_k = 10000
                 self.delete_by_metadata(filter=filter, top_k=top_k, namespace=namespace)
+                request_count = 1
             elif self._pod_type == "serverless":
-                self.pinecone_index.delete(ids=delete_ids, namespace=namespace)
+                batches = list(create_chunks(delete_ids, batch_size=MAX_IDS_PER_DELETE))
+                for batch in batches:
+                    self.pinecone_index.delete(ids=list(batch), namespace=namespace)
+                request_count = len(batches)
             else:
                 # Pod spec
                 self.pinecone_index.delete(filter=filter, namespace=namespace)
+                request_count = 1
+            self.stats[namespace].record_delete(len(delete_ids), request_count)
 
     def check(self) -> Optional[str]:
         try:
@@ -9,7 +9,7 @@ from unittest.mock import MagicMock, Mock, patch
 from destination_pinecone.config import ConfigModel
 from destination_pinecone.destination import DestinationPinecone
 
-from airbyte_cdk.models import ConnectorSpecification, Status
+from airbyte_cdk.models import ConnectorSpecification, Status, Type
 
 
 class TestDestinationPinecone(unittest.TestCase):
@@ -110,6 +110,31 @@ class TestDestinationPinecone(unittest.TestCase):
         MockedWriter.assert_called_once_with(self.config_model.processing, mock_indexer, mock_embedder, batch_size=32, omit_raw_text=False)
         mock_writer.write.assert_called_once_with(configured_catalog, input_messages)
 
+    @patch("destination_pinecone.destination.Writer")
+    @patch("destination_pinecone.destination.PineconeIndexer")
+    @patch("destination_pinecone.destination.create_from_config")
+    def test_write_flushes_indexer_before_state(self, MockedEmbedder, MockedPineconeIndexer, MockedWriter):
+        mock_indexer = Mock()
+        MockedPineconeIndexer.return_value = mock_indexer
+        state_message = Mock(type=Type.STATE)
+        log_message = Mock(type=Type.LOG)
+
+        def write(configured_catalog, input_messages):
+            yield log_message
+            mock_indexer.flush.assert_not_called()
+            yield state_message
+
+        MockedWriter.return_value.write.side_effect = write
+
+        destination = DestinationPinecone()
+        output = []
+        for message in destination.write(self.config, MagicMock(), []):
+            if message is state_message:
+                mock_indexer.flush.assert_called_once()
+            output.append(message)
+
+        self.assertEqual(output, [log_message, state_message])
+
     def test_spec(self):
         destination = DestinationPinecone()
         result = destination.spec()
@@ -103,6 +103,7 @@ def test_pinecone_index_upsert_and_delete(mock_describe_index):
         "some_stream",
     )
     indexer.delete(["delete_id1", "delete_id2"], "ns1", "some_stram")
+    indexer.flush()
     indexer.pinecone_index.delete.assert_called_with(filter={"_ab_record_id": {"$in": ["delete_id1", "delete_id2"]}}, namespace="ns1")
     indexer.pinecone_index.upsert.assert_called_with(
         vectors=(
@@ -132,6 +133,7 @@ def test_pinecone_index_upsert_and_delete_starter(mock_describe_index, mock_dete
         "some_stream",
     )
     indexer.delete(["delete_id1", "delete_id2"], "ns1", "some_stram")
+    indexer.flush()
     indexer.pinecone_index.query.assert_called_with(
         vector=[0, 0, 0], filter={"_ab_record_id": {"$in": ["delete_id1", "delete_id2"]}}, top_k=10_000, namespace="ns1"
     )
@@ -166,6 +168,7 @@ def test_pinecone_index_upsert_and_delete_pod(mock_describe_index, mock_determin
         "some_stream",
     )
     indexer.delete(["delete_id1", "delete_id2"], "ns1", "some_stram")
+    indexer.flush()
     indexer.pinecone_index.delete.assert_has_calls([call(filter={"_ab_record_id": {"$in": ["delete_id1", "delete_id2"]}}, namespace="ns1")])
     indexer.pinecone_index.upsert.assert_called_with(
         vectors=(
@@ -195,6 +198,7 @@ def test_pinecone_index_upsert_and_delete_serverless(mock_describe_index, mock_d
         "some_stream",
     )
     indexer.delete(["delete_id1", "delete_id2"], "ns1", "some_stram")
+    indexer.flush()
     indexer.pinecone_index.delete.assert_has_calls([call(ids=["delete_id1", "delete_id2"], namespace="ns1")])
     indexer.pinecone_index.upsert.assert_called_with(
         vectors=(
@@ -215,6 +219,7 @@ def test_pinecone_index_delete_1k_limit(mock_describe_index):
         MagicMock(matches=[]),
     ]
     indexer.delete(["delete_id1"], "ns1", "some_stream")
+    indexer.flush()
     indexer.pinecone_index.delete.assert_has_calls(
         [
             call(ids=[f"doc_id_{str(i)}" for i in range(1000)], namespace="ns1"),
@@ -252,6 +257,108 @@ def test_pinecone_index_upsert_batching():
         )
 
 
+def test_pinecone_index_upsert_sliding_window():
+    indexer = create_pinecone_indexer()
+    events = []
+    futures = []
+
+    def upsert(vectors, async_req, show_progress, namespace):
+        future = MagicMock()
+        index = len(futures)
+        future.result.side_effect = lambda: events.append(f"result {index}")
+        futures.append(future)
+        events.append(f"upsert {index}")
+        return future
+
+    indexer.pinecone_index.upsert.side_effect = upsert
+    indexer.index(
+        [Mock(page_content=f"test {i}", metadata={"_ab_stream": "abc"}, embedding=[i, i, i]) for i in range(240)],
+        "ns1",
+        "some_stream",
+    )
+    # 4 requests are kept in flight, each new request only waits for the oldest one
+    assert events == [
+        "upsert 0",
+        "upsert 1",
+        "upsert 2",
+        "upsert 3",
+        "result 0",
+        "upsert 4",
+        "result 1",
+        "upsert 5",
+    ]
+    # index() returns without waiting for the requests in flight
+    indexer.flush()
+    assert events[-4:] == ["result 2", "result 3", "result 4", "result 5"]
+
+
+def test_pinecone_delete_coalesced_per_namespace():
+    indexer = create_pinecone_indexer()
+    indexer._pod_type = "pod"
+    indexer.delete(["id1", "id2"], "ns1", "stream1")
+    indexer.delete(["id3"], "ns1", "stream2")
+    indexer.delete(["id4"], "ns2", "stream3")
+    indexer.delete([], "ns3", "stream4")
+    indexer.pinecone_index.delete.assert_not_called()
+
+    indexer.index([Mock(page_content="test", metadata={"_ab_stream": "abc"}, embedding=[1, 2, 3])], "ns1", "stream1")
+
+    assert indexer.pinecone_index.delete.call_args_list == [
+        call(filter={"_ab_record_id": {"$in": ["id1", "id2", "id3"]}}, namespace="ns1"),
+        call(filter={"_ab_record_id": {"$in": ["id4"]}}, namespace="ns2"),
+    ]
+    assert indexer.pinecone_index.method_calls[-2][0] == "delete"
+    assert indexer.pinecone_index.method_calls[-1][0] == "upsert"
+
+
+def test_pinecone_delete_waits_for_upserts_in_flight():
+    indexer = create_pinecone_indexer()
+    indexer._pod_type = "pod"
+    indexer.index([Mock(page_content="test", metadata={"_ab_stream": "abc"}, embedding=[1, 2, 3])], "ns1", "stream1")
+    upsert_result = indexer.pinecone_index.upsert.return_value
+    upsert_result.result.assert_not_called()
+
+    indexer.delete(["id1"], "ns1", "stream1")
+    indexer.flush()
+
+    upsert_result.result.assert_called_once()
+    indexer.pinecone_index.delete.assert_called_once_with(filter={"_ab_record_id": {"$in": ["id1"]}}, namespace="ns1")
+
+
+def test_pinecone_serverless_delete_1k_limit():
+    indexer = create_pinecone_indexer()
+    indexer._pod_type = "serverless"
+    indexer.delete([f"id{i}" for i in range(600)], "ns1", "stream1")
+    indexer.delete([f"id{i}" for i in range(600, 1200)], "ns1", "stream2")
+    indexer.flush()
+    assert indexer.pinecone_index.delete.call_args_list == [
+        call(ids=[f"id{i}" for i in range(1000)], namespace="ns1"),
+        call(ids=[f"id{i}" for i in range(1000, 1200)], namespace="ns1"),
+    ]
+
+
+def test_pinecone_post_sync_logs_namespace_stats():
+    indexer = create_pinecone_indexer()
+    indexer._pod_type = "pod"
+    indexer.pinecone_index.upsert.return_value.add_done_callback.side_effect = lambda callback: callback(None)
+    indexer.delete(["id1", "id2"], "ns1", "stream1")
+    indexer.index(
+        [Mock(page_content=f"test {i}", metadata={"_ab_stream": "abc"}, embedding=[i, i, i]) for i in range(50)],
+        "ns1",
+        "stream1",
+    )
+    indexer.index([Mock(page_content="test", metadata={"_ab_stream": "abc"}, embedding=[1, 2, 3])], None, "stream2")
+
+    messages = indexer.post_sync()
+
+    assert [message.log.message.split(" (")[0] for message in messages] == [
+        "Pinecone namespace ns1: upserted 50 vectors in 2 requests",
+        "Pinecone default namespace: upserted 1 vectors in 1 requests",
+    ]
+    assert messages[0].log.message.endswith("deleted 2 records in 1 requests")
+    assert indexer.pinecone_index.upsert.return_value.result.call_count == 3
+
+
 def generate_catalog():
     return ConfiguredAirbyteCatalog.parse_obj(
         {
@@ -4,12 +4,15 @@ import datetime
 import json
 import logging
 import os
+import threading
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Dict, List, Mapping, Optional, Set, Union
 
 import backoff
 import requests
+from requests.adapters import HTTPAdapter
 
 from airbyte_cdk.utils.traced_exception import AirbyteTracedException, FailureType
 
@@ -76,6 +79,30 @@ def transient_error(e: Exception) -> bool:
 # --- End Error Handling ---
 
 
+class RateLimiter:
+    """
+    Pause shared by every thread using a RagieClient.
+
+    When one request is rate limited (429), all workers hold off until the pause
+    expires instead of each of them hitting the limit on its own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    def wait(self) -> None:
+        with self._lock:
+            delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            logger.debug(f"Rate limited by Ragie API. Waiting {delay:.1f}s before the next request.")
+            time.sleep(delay)
+
+
 class RagieClient:
     # --- Constants ---
     DEFAULT_API_URL = "https://api.ragie.ai"
@@ -86,10 +113,15 @@ class RagieClient:
 
     METADATA_AIRBYTE_STREAM_FIELD = "airbyte_stream"  # Use this key in RagieWriter as well
 
+    # Pause applied to all workers on a 429 response without a usable Retry-After header
+    DEFAULT_RATE_LIMIT_PAUSE_SECONDS = 5.0
+
     def __init__(self, config: RagieConfig):
         self.config = config
         self.base_url = config.api_url.rstrip("/") if config.api_url else self.DEFAULT_API_URL
         self.api_key = config.api_key
+        self.max_workers = max(1, config.max_concurrent_requests)
+        self.rate_limiter = RateLimiter()
         self.session = self._create_session()
         # Store partition header for reuse on *non-file-upload* requests
         self.partition_header = {"partition": config.partition} if config.partition else {}
@@ -100,8 +132,20 @@ class RagieClient:
         session.headers.update(
             {"Authorization": f"Bearer {self.api_key}", "Accept": "application/json", "X-source": "airbyte-destination-ragie"}
         )
+        # Size the connection pool so that concurrent indexing workers don't discard connections
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
         return session
 
+    def _rate_limit_pause(self, response: requests.Response) -> float:
+        """Returns the pause requested by a 429 response, in seconds."""
+        retry_after = response.headers.get("Retry-After")
+        try:
+            return max(float(retry_after), 0.0)
+        except (TypeError, ValueError):
+            return self.DEFAULT_RATE_LIMIT_PAUSE_SECONDS
+
     @backoff.on_exception(
         backoff.expo,
         (requests.exceptions.RequestException, RagieApiError),
@@ -149,6 +193,7 @@ class RagieClient:
         # Log effective headers *before* the request
         logger.debug(f"Making {method} request to {full_url}{log_params}{log_json}{log_data}{log_files} with headers: {request_headers}")
 
+        self.rate_limiter.wait()
         try:
             response = self.session.request(
                 method=method, url=full_url, params=params, json=json_data, data=data, files=files, headers=request_headers
@@ -157,6 +202,8 @@ class RagieClient:
             response.raise_for_status()  # Raises HTTPError for 4xx/5xx
             return response
         except requests.exceptions.HTTPError as e:
+            if e.response.status_code == 429:
+                self.rate_limiter.pause(self._rate_limit_pause(e.response))
             error_message = f"HTTP error {e.response.status_code} for {method} {full_url}."
             try:
                 error_details = e.response.json()
@@ -200,61 +247,69 @@ class RagieClient:
 
     def index_documents(self, documents: List[Dict[str, Any]]):
         """
-        Indexes documents one by one.
+        Indexes documents, up to `max_concurrent_requests` at a time.
         Uses POST /documents/raw for JSON data uploads (application/json).
+        Raises on the first document that fails after retries; documents not yet sent are skipped.
         """
         if not documents:
             return
-        logger.info(f"Indexing {len(documents)} JSON documents one by one...")
-        successful_count = 0
+        workers = min(self.max_workers, len(documents))
+        logger.info(f"Indexing {len(documents)} JSON documents with {workers} worker(s)...")
 
-        for item_payload in documents:
-            doc_id_log = item_payload.get("external_id") or item_payload.get("name", "N/A")
+        if workers == 1:
+            for item_payload in documents:
+                self._index_document(item_payload)
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ragie-index") as executor:
+                futures = [executor.submit(self._index_document, item_payload) for item_payload in documents]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                except Exception:
+                    for future in futures:
+                        future.cancel()
+                    raise
+        logger.info(f"Successfully processed {len(documents)} indexing requests.")
+
+    def _index_document(self, item_payload: Dict[str, Any]):
+        """Indexes a single JSON document via POST /documents/raw."""
+        doc_id_log = item_payload.get("external_id") or item_payload.get("name", "N/A")
 
-            try:
-                # --- Handle JSON Data Upload via POST /documents/raw ---
-                endpoint = self.DOCUMENTS_RAW_ENDPOINT
-                method = "POST"
-                # For JSON uploads, we do want the partition header if set
-                headers = self.partition_header
-
-                logger.debug(
-                    f"Indexing JSON document via {endpoint}: Name='{item_payload.get('name', 'N/A')}', ExternalID='{item_payload.get('external_id')}'"
-                )
-                # Make the request with json_data and potential partition header
-                self._request(
-                    method=method,
-                    endpoint=endpoint,
-                    json_data=item_payload,  # Send the whole payload as JSON body
-                    extra_headers=headers,  # Pass partition header
-                )
-                logger.debug(
-                    f"Successfully requested indexing for JSON document: Name='{item_payload.get('name', 'N/A')}', ExternalID='{item_payload.get('external_id')}'"
-                )
-
-                successful_count += 1
+        try:
+            # For JSON uploads, we do want the partition header if set
+            logger.debug(
+                f"Indexing JSON document via {self.DOCUMENTS_RAW_ENDPOINT}: Name='{item_payload.get('name', 'N/A')}', ExternalID='{item_payload.get('external_id')}'"
+            )
+            self._request(
+                method="POST",
+                endpoint=self.DOCUMENTS_RAW_ENDPOINT,
+                json_data=item_payload,  # Send the whole payload as JSON body
+                extra_headers=self.partition_header,  # Pass partition header
+            )
+            logger.debug(
+                f"Successfully requested indexing for JSON document: Name='{item_payload.get('name', 'N/A')}', ExternalID='{item_payload.get('external_id')}'"
+            )
 
-            except Exception as e:
-                logger.error(f"Failed to index document '{doc_id_log}': {e}", exc_info=True)
+        except Exception as e:
+            logger.error(f"Failed to index document '{doc_id_log}': {e}", exc_info=True)
 
-                internal_msg = f"PayloadKeys: {list(item_payload.keys())}"
-                error_details = str(e) if isinstance(e, RagieApiError) else repr(e)
-                internal_msg += f", Error: {error_details}"
+            internal_msg = f"PayloadKeys: {list(item_payload.keys())}"
+            error_details = str(e) if isinstance(e, RagieApiError) else repr(e)
+            internal_msg += f", Error: {error_details}"
 
-                # Determine failure type
-                failure_type = FailureType.system_error  # Default
-                if isinstance(e, RagieApiError) and e.__cause__:
-                    if isinstance(e.__cause__, requests.exceptions.HTTPError):
-                        status = e.__cause__.response.status_code
-                        if 400 <= status < 500 and status not in [404, 429]:
-                            failure_type = FailureType.config_error  # User config likely caused 4xx
+            # Determine failure type
+            failure_type = FailureType.system_error  # Default
+            if isinstance(e, RagieApiError) and e.__cause__:
+                if isinstance(e.__cause__, requests.exceptions.HTTPError):
+                    status = e.__cause__.response.status_code
+                    if 400 <= status < 500 and status not in [404, 429]:
+                        failure_type = FailureType.config_error  # User config likely caused 4xx
 
-                raise AirbyteTracedException(
-                    message=f"Failed to index document '{doc_id_log}' into Ragie.",
-                    internal_message=internal_msg[:1000],  # Limit length
-                    failure_type=failure_type,
-                ) from e
-        logger.info(f"Successfully processed {successful_count} indexing requests.")
+            raise AirbyteTracedException(
+                message=f"Failed to index document '{doc_id_log}' into Ragie.",
+                internal_message=internal_msg[:1000],  # Limit length
+                failure_type=failure_type,
+            ) from e
 
     # --- Metadata Filtering/Querying (_build_filter_json, find_ids_by_metadata, find_docs_by_metadata) ---
     def _build_filter_json(self, filter_conditions: Dict[str, Any]) -> Dict[str, Any]:
@@ -87,6 +87,26 @@ class RagieConfig(BaseModel):
         examples=["https://api.ragie.ai"],
     )
 
+    max_concurrent_requests: int = Field(
+        title="Max Concurrent Requests",
+        description="Number of documents indexed in parallel. Requests are paused for all workers when Ragie answers with a rate limit (429).",
+        default=4,
+        ge=1,
+        le=32,
+        order=9,
+        examples=[4],
+    )
+
+    batch_size: int = Field(
+        title="Batch Size",
+        description="Number of documents buffered before they are sent for indexing. Buffered documents are also sent at every state message.",
+        default=64,
+        ge=1,
+        le=1000,
+        order=10,
+        examples=[64],
+    )
+
     @field_validator("metadata_static")
     def validate_metadata_static(cls, v):
         if not v:
@@ -64,7 +64,8 @@ class DestinationRagie(Destination):
             for message in input_messages:
                 if message.type == Type.STATE:
                     # On STATE message: Flush buffer, then yield state
-                    logger.info(f"Received STATE message: {message.state.data}. Yielding state.")
+                    logger.info(f"Received STATE message: {message.state.data}. Flushing buffer, then yielding state.")
+                    writer.flush()
                     try:
                         yield message
                     except Exception as e:
@@ -88,6 +89,7 @@ class DestinationRagie(Destination):
                     # Ignore other message types (LOG, TRACE, etc.)
                     logger.debug(f"Ignoring message of type: {message.type}")
 
+            writer.flush()
             logger.info(f"Write operation completed. Total records processed: {processed_records}")
 
         except Exception as e:
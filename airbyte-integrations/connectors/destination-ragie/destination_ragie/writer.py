@@ -52,6 +52,7 @@ class RagieWriter:
         self.static_metadata = self.config.metadata_static_dict or {}
         self.seen_hashes: Dict[str, Set[str]] = {}
         self.hashes_preloaded: Set[str] = set()
+        self.write_buffer: List[Dict[str, Any]] = []
         logger.info("RagieWriter initialized.")
         # Log relevant config settings (excluding secrets)
         logger.debug(f"Configured Partition: {self.config.partition}")
@@ -339,10 +340,19 @@ class RagieWriter:
         payload["mode"] = self.config.processing_mode
         payload["partition"] = self.config.partition
 
-        # --- 8. Send to Client ---
+        # --- 8. Buffer for Client ---
+        logger.debug(f"Queueing JSON payload for '{doc_name}' (Stream: {stream_id}, Hash: {content_hash})")
+        self.write_buffer.append(payload)
+        if len(self.write_buffer) >= self.config.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Sends all buffered documents to Ragie, indexing them concurrently."""
+        if not self.write_buffer:
+            return
+        documents, self.write_buffer = self.write_buffer, []
         try:
-            logger.debug(f"Queueing JSON payload for '{doc_name}' (Stream: {stream_id}, Hash: {content_hash})")
-            self.client.index_documents([payload])
+            self.client.index_documents(documents)
         except Exception as e:
             logger.error(f"Error during client indexing call: {e}", exc_info=True)
             raise e  # Re-raise for destination write loop
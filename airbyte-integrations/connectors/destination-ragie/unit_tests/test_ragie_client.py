@@ -1,9 +1,27 @@
 # Copyright (c) 2025 Airbyte, Inc., all rights reserved.
 
+import threading
+import time
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
-from destination_ragie.client import RagieClient
+import requests
+from destination_ragie.client import RagieApiError, RagieClient, RateLimiter
+from destination_ragie.config import RagieConfig
+
+from airbyte_cdk.utils.traced_exception import AirbyteTracedException, FailureType
+
+
+def _http_error(status_code: int, headers=None) -> RagieApiError:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    try:
+        raise requests.exceptions.HTTPError(response=response)
+    except requests.exceptions.HTTPError as e:
+        error = RagieApiError(f"HTTP error {status_code}")
+        error.__cause__ = e
+        return error
 
 
 class TestRagieClient(unittest.TestCase):
@@ -29,5 +47,57 @@ class TestRagieClient(unittest.TestCase):
         self.assertEqual(result, [{"id": 1}, {"id": 2}])
 
 
+class TestRagieClientIndexing(unittest.TestCase):
+    def setUp(self):
+        self.client = RagieClient(RagieConfig(api_key="dummy_key", max_concurrent_requests=4))
+        self.documents = [{"name": f"doc_{i}", "external_id": str(i)} for i in range(10)]
+
+    def test_index_documents_runs_concurrently(self):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def fake_request(**kwargs):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+
+        with patch.object(self.client, "_request", side_effect=fake_request) as mock_request:
+            self.client.index_documents(self.documents)
+
+        self.assertEqual(mock_request.call_count, 10)
+        sent_ids = sorted(c.kwargs["json_data"]["external_id"] for c in mock_request.call_args_list)
+        self.assertEqual(sent_ids, sorted(d["external_id"] for d in self.documents))
+        self.assertGreater(peak, 1)
+        self.assertLessEqual(peak, 4)
+
+    def test_index_documents_raises_traced_exception_on_user_error(self):
+        with patch.object(self.client, "_request", side_effect=_http_error(400)):
+            with self.assertRaises(AirbyteTracedException) as ctx:
+                self.client.index_documents(self.documents)
+        self.assertEqual(ctx.exception.failure_type, FailureType.config_error)
+
+    def test_session_pool_matches_worker_count(self):
+        self.assertEqual(self.client.session.get_adapter("https://api.ragie.ai")._pool_maxsize, 4)
+
+    def test_rate_limit_pause_uses_retry_after(self):
+        response = requests.Response()
+        response.headers["Retry-After"] = "2"
+        self.assertEqual(self.client._rate_limit_pause(response), 2.0)
+        response.headers["Retry-After"] = "soon"
+        self.assertEqual(self.client._rate_limit_pause(response), RagieClient.DEFAULT_RATE_LIMIT_PAUSE_SECONDS)
+
+    def test_rate_limiter_delays_all_callers(self):
+        limiter = RateLimiter()
+        limiter.pause(0.1)
+        start = time.monotonic()
+        limiter.wait()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+
 if __name__ == "__main__":
     unittest.main()
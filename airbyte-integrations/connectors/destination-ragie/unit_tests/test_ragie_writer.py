@@ -32,6 +32,7 @@ class TestRagieWriter(unittest.TestCase):
         self.mock_config.external_id_field = "external_id"
         self.mock_config.processing_mode = "fast"
         self.mock_config.partition = "test-partition"
+        self.mock_config.batch_size = 2
 
         # Create a stream with proper AirbyteStream object
         stream = ConfiguredAirbyteStream(
@@ -75,22 +76,34 @@ class TestRagieWriter(unittest.TestCase):
         result = self.writer._stream_tuple_to_id("namespace", "name")
         self.assertEqual(result, "namespace_name")
 
-    def test_queue_write_operation_skips_duplicates(self):
+    @patch.object(RagieWriter, "_calculate_content_hash", return_value="known-hash")
+    def test_queue_write_operation_skips_duplicates(self, _mock_hash):
         record = self._make_record()
-        hash_val = self.writer._calculate_content_hash(
-            {"message": "hello"},
-            {
-                "source": "airbyte",
-                "meta_author": "john",
-                "meta_tags": ["tag1", "tag2"],
-                "airbyte_stream": "default_my_stream",
-                "airbyte_content_hash": "dummy",
-            },
-        )
-        self.writer.seen_hashes["default_my_stream"] = {hash_val}
-        self.mock_client.find_docs_by_metadata.return_value = [{"metadata": {"airbyte_content_hash": hash_val}}]
+        self.writer.seen_hashes["default_my_stream"] = {"known-hash"}
+        self.writer.hashes_preloaded.add("default_my_stream")
         self.writer.queue_write_operation(record)
         self.assertEqual(len(self.writer.write_buffer), 0)
+        self.writer.flush()
+        self.mock_client.index_documents.assert_not_called()
+
+    def test_queue_write_operation_flushes_full_batch(self):
+        self.mock_client.find_docs_by_metadata.return_value = []
+        self.writer.queue_write_operation(self._make_record(message="first"))
+        self.mock_client.index_documents.assert_not_called()
+        self.assertEqual(len(self.writer.write_buffer), 1)
+
+        self.writer.queue_write_operation(self._make_record(message="second"))
+        self.mock_client.index_documents.assert_called_once()
+        self.assertEqual(len(self.mock_client.index_documents.call_args[0][0]), 2)
+        self.assertEqual(self.writer.write_buffer, [])
+
+    def test_flush_sends_partial_batch(self):
+        self.mock_client.find_docs_by_metadata.return_value = []
+        self.writer.queue_write_operation(self._make_record())
+        self.writer.flush()
+        self.assertEqual(len(self.mock_client.index_documents.call_args[0][0]), 1)
+        self.writer.flush()
+        self.mock_client.index_documents.assert_called_once()
 
     def test_preload_hashes_if_needed_loads_hashes(self):
         self.mock_client.find_docs_by_metadata.return_value = [
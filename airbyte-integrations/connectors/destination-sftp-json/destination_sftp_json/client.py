@@ -4,11 +4,12 @@
 
 import contextlib
 import errno
+import gzip
 import json
-from typing import Dict, List, TextIO
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import paramiko
-import smart_open
 
 
 @contextlib.contextmanager
@@ -33,6 +34,17 @@ def sftp_client(
 
 
 class SftpClient:
+    """
+    Writes the records of each stream as JSON lines to `airbyte_json_<stream>.jsonl` in the destination path.
+
+    Serialized records are buffered per stream and written in blocks of `BLOCK_SIZE` bytes with pipelined
+    SFTP writes over one session that is reused for the whole sync. With `gzip_compression`, every block is
+    written as a gzip member, so a file is a valid gzip file after every block. With `file_rotation_size_mb`,
+    a stream continues in `airbyte_json_<stream>.<n>.jsonl` once its current file reached that size.
+    """
+
+    BLOCK_SIZE = 8 * 1024 * 1024
+
     def __init__(
         self,
         host: str,
@@ -40,13 +52,23 @@ class SftpClient:
         password: str,
         destination_path: str,
         port: int = 22,
+        gzip_compression: bool = False,
+        file_rotation_size_mb: int = 0,
     ):
         self.host = host
         self.port = port
         self.username = username
         self.password = password
         self.destination_path = destination_path
-        self._files: Dict[str, TextIO] = {}
+        self.gzip_compression = gzip_compression
+        self.file_rotation_size = file_rotation_size_mb * 1024 * 1024
+        self._buffers: Dict[str, List[bytes]] = {}
+        self._buffer_sizes: Dict[str, int] = {}
+        self._files: Dict[str, paramiko.SFTPFile] = {}
+        # index of the file each stream currently writes to
+        self._parts: Dict[str, int] = {}
+        self._session = contextlib.ExitStack()
+        self._sftp: Optional[paramiko.SFTPClient] = None
 
     def __enter__(self):
         return self
@@ -54,41 +76,110 @@ class SftpClient:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
 
-    def _get_path(self, stream: str) -> str:
-        return f"{self.destination_path}/airbyte_json_{stream}.jsonl"
+    @property
+    def sftp(self) -> paramiko.SFTPClient:
+        if self._sftp is None:
+            self._sftp = self._session.enter_context(sftp_client(self.host, self.port, self.username, self.password))
+        return self._sftp
+
+    @property
+    def _extension(self) -> str:
+        return ".jsonl.gz" if self.gzip_compression else ".jsonl"
 
-    def _get_uri(self, stream: str) -> str:
-        path = self._get_path(stream)
-        return f"sftp://{self.username}:{self.password}@{self.host}:{self.port}/{path}"
+    def _get_path(self, stream: str, part: int = 0) -> str:
+        suffix = f".{part}" if part else ""
+        return f"{self.destination_path}/airbyte_json_{stream}{suffix}{self._extension}"
 
-    def _open(self, stream: str) -> TextIO:
-        uri = self._get_uri(stream)
-        return smart_open.open(uri, mode="a+")
+    def _list_files(self, stream: str, extension: Optional[str] = None) -> List[Tuple[int, str]]:
+        """Returns the (part, path) of every file of the stream, ordered by part."""
+        extensions = re.escape(extension) if extension else r"\.jsonl(?:\.gz)?"
+        pattern = re.compile(rf"^airbyte_json_{re.escape(stream)}(?:\.(\d+))?{extensions}$")
+        try:
+            filenames = self.sftp.listdir(self.destination_path)
+        except IOError as err:
+            if err.errno != errno.ENOENT:
+                raise
+            return []
+        files = []
+        for filename in filenames:
+            match = pattern.match(filename)
+            if match:
+                files.append((int(match.group(1) or 0), f"{self.destination_path}/{filename}"))
+        return sorted(files)
+
+    def _open(self, stream: str) -> paramiko.SFTPFile:
+        if stream not in self._parts:
+            # append to the last file written by a previous sync
+            files = self._list_files(stream, self._extension)
+            self._parts[stream] = files[-1][0] if files else 0
+        file = self.sftp.open(self._get_path(stream, self._parts[stream]), mode="ab")
+        # do not wait for the server to acknowledge every 32KB write request, the acks are collected on close
+        file.set_pipelined(True)
+        return file
 
     def close(self):
-        for file in self._files.values():
-            file.close()
+        try:
+            self.flush()
+        finally:
+            self._session.close()
+            self._sftp = None
 
     def write(self, stream: str, record: Dict) -> None:
-        if stream not in self._files:
-            self._files[stream] = self._open(stream)
-        text = json.dumps(record)
-        self._files[stream].write(f"{text}\n")
-
-    def read_data(self, stream: str) -> List[Dict]:
-        with self._open(stream) as file:
-            pos = file.tell()
-            file.seek(0)
-            lines = file.readlines()
-            file.seek(pos)
-            data = [json.loads(line.strip()) for line in lines]
-        return data
+        line = f"{json.dumps(record)}\n".encode()
+        self._buffers.setdefault(stream, []).append(line)
+        self._buffer_sizes[stream] = self._buffer_sizes.get(stream, 0) + len(line)
+        if self._buffer_sizes[stream] >= self.BLOCK_SIZE:
+            self._write_block(stream)
+
+    def flush(self) -> None:
+        """
+        Writes the buffered records of every stream and closes the remote files, which waits until the
+        server acknowledged all writes. Records written before a flush are persisted.
+        """
+        for stream in self._buffers:
+            self._write_block(stream)
+        files, self._files = self._files, {}
+        for file in files.values():
+            file.close()
+
+    def _write_block(self, stream: str) -> None:
+        lines = self._buffers.get(stream)
+        if not lines:
+            return
+        block = b"".join(lines)
+        self._buffers[stream], self._buffer_sizes[stream] = [], 0
+        if self.gzip_compression:
+            block = gzip.compress(block)
+
+        file = self._files.get(stream)
+        if file is None:
+            file = self._files[stream] = self._open(stream)
+        if self.file_rotation_size and file.tell() > 0 and file.tell() + len(block) > self.file_rotation_size:
+            file.close()
+            self._parts[stream] += 1
+            file = self._files[stream] = self._open(stream)
+        file.write(block)
+
+    def read_data(self, stream: str) -> Iterator[Dict]:
+        """Yields the records of all files of the stream, reading them in chunks instead of all at once."""
+        for _, path in self._list_files(stream):
+            with self.sftp.open(path, mode="rb") as remote_file:
+                remote_file.prefetch()
+                file = gzip.GzipFile(fileobj=remote_file) if path.endswith(".gz") else remote_file
+                for line in file:
+                    if line.strip():
+                        yield json.loads(line)
 
     def delete(self, stream: str) -> None:
-        with sftp_client(self.host, self.port, self.username, self.password) as sftp:
+        self._buffers.pop(stream, None)
+        self._buffer_sizes.pop(stream, None)
+        self._parts.pop(stream, None)
+        file = self._files.pop(stream, None)
+        if file is not None:
+            file.close()
+        for _, path in self._list_files(stream):
             try:
-                path = self._get_path(stream)
-                sftp.remove(path)
+                self.sftp.remove(path)
             except IOError as err:
                 # Ignore the case where the file doesn't exist, only raise the
                 # exception if it's something else
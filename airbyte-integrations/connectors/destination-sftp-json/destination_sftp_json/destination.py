@@ -42,8 +42,9 @@ class DestinationSftpJson(Destination):
             for message in input_messages:
                 if message.type == Type.STATE:
                     # Emitting a state message indicates that all records which came
-                    # before it have been written to the destination. We don't need to
-                    # do anything specific to save the data so we just re-emit these
+                    # before it have been written to the destination, so the buffered
+                    # records are written out before the state is re-emitted
+                    writer.flush()
                     yield message
                 elif message.type == Type.RECORD:
                     record = message.record
@@ -73,6 +74,7 @@ class DestinationSftpJson(Destination):
 
             with SftpClient(**config) as writer:
                 writer.write(stream, {"value": "_airbyte_connection_check"})
+                writer.flush()
                 writer.delete(stream)
             return AirbyteConnectionStatus(status=Status.SUCCEEDED)
         except Exception as e:
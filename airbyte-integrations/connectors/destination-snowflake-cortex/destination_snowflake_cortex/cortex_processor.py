@@ -3,7 +3,13 @@
 
 from __future__ import annotations
 
+import gzip
+import logging
+import shutil
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from textwrap import dedent, indent
 from typing import TYPE_CHECKING, Any
@@ -42,6 +48,31 @@ if TYPE_CHECKING:
     from pathlib import Path
 
 
+logger = logging.getLogger("airbyte")
+
+DEFAULT_STAGING_FILE_TARGET_SIZE = 128 * 1024 * 1024
+"""The default compressed size to aim for when combining files before uploading them."""
+
+DEFAULT_MAX_CONCURRENT_PUTS = 8
+"""The default number of files to upload to the stage at the same time."""
+
+
+@dataclass
+class StagingLoadStats:
+    """Counters for the files staged and loaded for a stream."""
+
+    staged_files: int = 0
+    staged_bytes: int = 0
+    put_seconds: float = 0.0
+    copy_seconds: float = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.staged_files} file(s), {self.staged_bytes / 1024 / 1024:,.1f} MB staged, "
+            f"{self.put_seconds:,.1f}s in PUT, {self.copy_seconds:,.1f}s in COPY"
+        )
+
+
 class SnowflakeCortexConfig(SqlConfig):
     """A Snowflake configuration for use with Cortex functions."""
 
@@ -153,10 +184,16 @@ class SnowflakeCortexSqlProcessor(SqlProcessorBase):
         catalog_provider: CatalogProvider,
         temp_dir: Path,
         temp_file_cleanup: bool = True,
+        staging_file_target_size: int = DEFAULT_STAGING_FILE_TARGET_SIZE,
+        max_concurrent_puts: int = DEFAULT_MAX_CONCURRENT_PUTS,
     ) -> None:
         """Initialize the Snowflake processor."""
         self.splitter_config = splitter_config
         self.embedder_config = embedder_config
+        self.staging_file_target_size = staging_file_target_size
+        self.max_concurrent_puts = max_concurrent_puts
+        self.load_stats: dict[str, StagingLoadStats] = {}
+        """Staging and load counters, by stream name."""
         super().__init__(
             sql_config=sql_config,
             catalog_provider=catalog_provider,
@@ -190,28 +227,33 @@ class SnowflakeCortexSqlProcessor(SqlProcessorBase):
     ) -> str:
         """Write files to a new table.
 
-        This is the same as PyAirbyte's SnowflakeSqlProcessor implementation, migrated here for
+        This is based on PyAirbyte's SnowflakeSqlProcessor implementation, migrated here for
         stability. The main differences lie within `_get_sql_column_definitions()`, whose logic is
         abstracted out of this method.
+
+        The local files are first combined into gzip files of roughly `staging_file_target_size`
+        bytes, which are uploaded in parallel and then loaded with a single COPY statement, so that
+        Snowflake can load the files in parallel.
         """
         temp_table_name = self._create_table_for_loading(
             stream_name=stream_name,
             batch_id=batch_id,
         )
         internal_sf_stage_name = f"@%{temp_table_name}"
+        stats = self.load_stats.setdefault(stream_name, StagingLoadStats())
+
+        staging_files = self._combine_staging_files(files, batch_id=batch_id)
+        stats.staged_files += len(staging_files)
+        stats.staged_bytes += sum(file_path.stat().st_size for file_path in staging_files)
 
         def path_str(path: Path) -> str:
             return str(path.absolute()).replace("\\", "\\\\")
 
-        for file_path in files:
-            query = f"PUT 'file://{path_str(file_path)}' {internal_sf_stage_name};"
-            self._execute_sql(query)
-
         columns_list = [
             self._quote_identifier(c)
             for c in list(self._get_sql_column_definitions(stream_name).keys())
         ]
-        files_list = ", ".join([f"'{f.name}'" for f in files])
+        files_list = ", ".join([f"'{f.name}'" for f in staging_files])
         columns_list_str: str = indent("\n, ".join(columns_list), " " * 12)
 
         # following block is different from SnowflakeSqlProcessor
@@ -238,9 +280,71 @@ class SnowflakeCortexSqlProcessor(SqlProcessorBase):
             ;
             """
         )
-        self._execute_sql(copy_statement)
+        try:
+            put_start = time.monotonic()
+            with ThreadPoolExecutor(
+                max_workers=self.max_concurrent_puts,
+                thread_name_prefix="snowflake-put",
+            ) as executor:
+                # Each PUT runs on its own connection. `list()` re-raises the first failure, if any.
+                list(
+                    executor.map(
+                        lambda file_path: self._execute_sql(
+                            f"PUT 'file://{path_str(file_path)}' {internal_sf_stage_name} "
+                            "AUTO_COMPRESS = FALSE SOURCE_COMPRESSION = GZIP;"
+                        ),
+                        staging_files,
+                    )
+                )
+            stats.put_seconds += time.monotonic() - put_start
+
+            copy_start = time.monotonic()
+            self._execute_sql(copy_statement)
+            stats.copy_seconds += time.monotonic() - copy_start
+        finally:
+            for file_path in set(staging_files) - set(files):
+                # The combined files are ours to clean up, also when a PUT or the COPY failed; the
+                # originals are owned by the file writer.
+                file_path.unlink(missing_ok=True)
+
+        logger.info(
+            f"Loaded {len(staging_files)} staging file(s) into '{stream_name}'. "
+            f"Totals for this stream: {stats}"
+        )
         return temp_table_name
 
+    def _combine_staging_files(self, files: list[Path], batch_id: str) -> list[Path]:
+        """Combine the local gzip files into files of roughly `staging_file_target_size` bytes.
+
+        Files are grouped in order by their compressed size. Groups of a single file are used
+        as-is, larger groups are re-compressed into one new file next to the originals. Files
+        larger than the target are never split.
+        """
+        groups: list[list[Path]] = []
+        group_size = 0
+        for file_path in files:
+            file_size = file_path.stat().st_size
+            if not groups or group_size + file_size > self.staging_file_target_size:
+                groups.append([])
+                group_size = 0
+            groups[-1].append(file_path)
+            group_size += file_size
+
+        staging_files: list[Path] = []
+        for group_number, group in enumerate(groups):
+            if len(group) == 1:
+                staging_files.append(group[0])
+                continue
+
+            combined_path = group[0].with_name(f"staging_{batch_id}_{group_number}.jsonl.gz")
+            with gzip.open(combined_path, "wb") as combined_file:
+                for file_path in group:
+                    with gzip.open(file_path, "rb") as source_file:
+                        shutil.copyfileobj(source_file, combined_file)
+            staging_files.append(combined_path)
+
+        return staging_files
+
     @overrides
     def _init_connection_settings(self, connection: Connection) -> None:
         """We set Snowflake-specific settings for the session.
@@ -0,0 +1,133 @@
+#
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+#
+
+import gzip
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, Mock, PropertyMock, patch
+
+from airbyte.secrets import SecretString
+
+from destination_snowflake_cortex.cortex_processor import (
+    SnowflakeCortexConfig,
+    SnowflakeCortexSqlProcessor,
+)
+
+
+class TestSnowflakeCortexSqlProcessor(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        with patch.object(SnowflakeCortexSqlProcessor, "_ensure_schema_exists"):
+            self.processor = SnowflakeCortexSqlProcessor(
+                sql_config=SnowflakeCortexConfig(
+                    host="account",
+                    username="user",
+                    password=SecretString("password"),
+                    warehouse="warehouse",
+                    database="database",
+                    role="role",
+                    schema_name="schema",
+                ),
+                splitter_config=Mock(),
+                embedder_config=Mock(),
+                catalog_provider=MagicMock(),
+                temp_dir=self.temp_dir,
+                max_concurrent_puts=2,
+            )
+
+    def _write_file(self, name: str, num_random_bytes: int) -> Path:
+        file_path = self.temp_dir / name
+        with gzip.open(file_path, "wb") as file:
+            # Random content does not compress, so the file size is predictable.
+            file.write(b'{"data": "' + os.urandom(num_random_bytes).hex().encode() + b'"}\n')
+        return file_path
+
+    def test_combine_staging_files_groups_files_by_size(self):
+        small_files = [
+            self._write_file(f"small_{i}.jsonl.gz", num_random_bytes=1_000) for i in range(3)
+        ]
+        large = self._write_file("large.jsonl.gz", num_random_bytes=10_000)
+        self.processor.staging_file_target_size = 5_000
+
+        staging_files = self.processor._combine_staging_files(
+            [small_files[0], small_files[1], large, small_files[2]],
+            batch_id="batch",
+        )
+
+        self.assertEqual(len(staging_files), 3)
+        self.assertEqual(staging_files[1:], [large, small_files[2]])
+        self.assertNotIn(staging_files[0], small_files)
+        with gzip.open(staging_files[0], "rb") as combined_file:
+            combined_lines = combined_file.readlines()
+        expected_lines = []
+        for file_path in small_files[:2]:
+            with gzip.open(file_path, "rb") as source_file:
+                expected_lines += source_file.readlines()
+        self.assertEqual(combined_lines, expected_lines)
+
+    @patch("destination_snowflake_cortex.cortex_processor.SnowflakeCortexSqlProcessor._execute_sql")
+    def test_write_files_to_new_table_puts_files_in_parallel_and_copies_once(
+        self, mock_execute_sql
+    ):
+        files = [self._write_file(f"file_{i}.jsonl.gz", num_random_bytes=100) for i in range(3)]
+        self.processor.staging_file_target_size = 1
+
+        with (
+            patch.object(self.processor, "_create_table_for_loading", return_value="temp_table"),
+            patch.object(
+                SnowflakeCortexSqlProcessor,
+                "embedding_dimensions",
+                new_callable=PropertyMock,
+                return_value=2,
+            ),
+        ):
+            table_name = self.processor._write_files_to_new_table(
+                files=files, stream_name="mystream", batch_id="batch"
+            )
+
+        self.assertEqual(table_name, "temp_table")
+        statements = [call.args[0] for call in mock_execute_sql.call_args_list]
+        put_statements = [statement for statement in statements if statement.startswith("PUT")]
+        copy_statements = [statement for statement in statements if "COPY INTO" in statement]
+        self.assertEqual(len(put_statements), 3)
+        self.assertTrue(all("@%temp_table" in statement for statement in put_statements))
+        self.assertEqual(len(copy_statements), 1)
+        for file_path in files:
+            self.assertIn(f"'{file_path.name}'", copy_statements[0])
+
+        stats = self.processor.load_stats["mystream"]
+        self.assertEqual(stats.staged_files, 3)
+        self.assertEqual(stats.staged_bytes, sum(file_path.stat().st_size for file_path in files))
+
+    @patch("destination_snowflake_cortex.cortex_processor.SnowflakeCortexSqlProcessor._execute_sql")
+    def test_write_files_to_new_table_removes_combined_files_when_copy_fails(
+        self, mock_execute_sql
+    ):
+        files = [self._write_file(f"file_{i}.jsonl.gz", num_random_bytes=100) for i in range(3)]
+        self.processor.staging_file_target_size = 1_000_000
+        mock_execute_sql.side_effect = lambda statement: self._fail_on_copy(statement)
+
+        with (
+            patch.object(self.processor, "_create_table_for_loading", return_value="temp_table"),
+            patch.object(
+                SnowflakeCortexSqlProcessor,
+                "embedding_dimensions",
+                new_callable=PropertyMock,
+                return_value=2,
+            ),
+        ):
+            with self.assertRaises(RuntimeError):
+                self.processor._write_files_to_new_table(
+                    files=files, stream_name="mystream", batch_id="batch"
+                )
+
+        # The originals stay with the file writer, only the combined file is removed.
+        self.assertEqual(sorted(self.temp_dir.iterdir()), sorted(files))
+
+    @staticmethod
+    def _fail_on_copy(statement: str) -> None:
+        if "COPY INTO" in statement:
+            raise RuntimeError("COPY failed")
@@ -10,12 +10,17 @@ import sqlite3
 import uuid
 from asyncio.log import logger
 from collections import defaultdict
-from typing import Any, Iterable, Mapping
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
 
 from airbyte_cdk.destinations import Destination
 from airbyte_cdk.models import AirbyteConnectionStatus, AirbyteMessage, ConfiguredAirbyteCatalog, DestinationSyncMode, Status, Type
 
 
+# Flush buffered records once either limit is reached, regardless of how often the source emits state messages
+MAX_BUFFERED_RECORDS = 10_000
+MAX_BUFFERED_BYTES = 16 * 1024 * 1024
+
+
 class DestinationSqlite(Destination):
     @staticmethod
     def _get_destination_path(destination_path: str) -> str:
@@ -34,6 +39,14 @@ class DestinationSqlite(Destination):
 
         return destination_path
 
+    @staticmethod
+    def _flush_buffer(con: sqlite3.Connection, insert_queries: Mapping[str, str], buffer: Dict[str, List[Tuple[str, str, str]]]) -> None:
+        for stream_name, records in buffer.items():
+            # the query strings are built once per stream, so sqlite3 reuses the same prepared statement on every flush
+            con.executemany(insert_queries[stream_name], records)
+
+        con.commit()
+
     def write(
         self, config: Mapping[str, Any], configured_catalog: ConfiguredAirbyteCatalog, input_messages: Iterable[AirbyteMessage]
     ) -> Iterable[AirbyteMessage]:
@@ -57,6 +70,12 @@ class DestinationSqlite(Destination):
             path = ""
         path = self._get_destination_path(path)
         con = sqlite3.connect(path)
+        if config.get("wal_mode", False):
+            # WAL lets each commit append to the log instead of rewriting the journal,
+            # and with synchronous=NORMAL commits no longer wait for an fsync.
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+
         with con:
             # create the tables if needed
             for configured_stream in configured_catalog.streams:
@@ -78,21 +97,25 @@ class DestinationSqlite(Destination):
                 """.format(table_name=table_name)
                 con.execute(query)
 
+            insert_queries = {
+                name: """
+                INSERT INTO {table_name}
+                VALUES (?,?,?)
+                """.format(table_name=f"_airbyte_raw_{name}")
+                for name in streams
+            }
+
             buffer = defaultdict(list)
+            buffered_records = 0
+            buffered_bytes = 0
 
             for message in input_messages:
                 if message.type == Type.STATE:
                     # flush the buffer
-                    for stream_name in buffer.keys():
-                        query = """
-                        INSERT INTO {table_name}
-                        VALUES (?,?,?)
-                        """.format(table_name=f"_airbyte_raw_{stream_name}")
-
-                        con.executemany(query, buffer[stream_name])
-
-                    con.commit()
+                    self._flush_buffer(con, insert_queries, buffer)
                     buffer = defaultdict(list)
+                    buffered_records = 0
+                    buffered_bytes = 0
 
                     yield message
                 elif message.type == Type.RECORD:
@@ -103,18 +126,23 @@ class DestinationSqlite(Destination):
                         continue
 
                     # add to buffer
-                    buffer[stream].append((str(uuid.uuid4()), datetime.datetime.now().isoformat(), json.dumps(data)))
+                    serialized = json.dumps(data)
+                    buffer[stream].append((str(uuid.uuid4()), datetime.datetime.now().isoformat(), serialized))
+                    buffered_records += 1
+                    buffered_bytes += len(serialized)
 
-            # flush any remaining messages
-            for stream_name in buffer.keys():
-                query = """
-                INSERT INTO {table_name}
-                VALUES (?,?,?)
-                """.format(table_name=f"_airbyte_raw_{stream_name}")
+                    if buffered_records >= MAX_BUFFERED_RECORDS or buffered_bytes >= MAX_BUFFERED_BYTES:
+                        self._flush_buffer(con, insert_queries, buffer)
+                        buffer = defaultdict(list)
+                        buffered_records = 0
+                        buffered_bytes = 0
 
-                con.executemany(query, buffer[stream_name])
+            # flush any remaining messages
+            self._flush_buffer(con, insert_queries, buffer)
 
-            con.commit()
+            if config.get("wal_mode", False):
+                # move the log back into the database file so that it can be read on its own
+                con.execute("PRAGMA wal_checkpoint(TRUNCATE)")
 
     def check(self, logger: logging.Logger, config: Mapping[str, Any]) -> AirbyteConnectionStatus:
         """
@@ -2,8 +2,22 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 #
 
+import sqlite3
+
 import pytest
 from destination_sqlite import DestinationSqlite
+from destination_sqlite import destination as destination_module
+
+from airbyte_cdk.models import (
+    AirbyteMessage,
+    AirbyteRecordMessage,
+    AirbyteStream,
+    ConfiguredAirbyteCatalog,
+    ConfiguredAirbyteStream,
+    DestinationSyncMode,
+    SyncMode,
+    Type,
+)
 
 
 def test_get_destination_path():
@@ -22,3 +36,35 @@ def test_get_destination_path():
     invalid_input = "/sqlite.db"
     with pytest.raises(ValueError):
         _ = DestinationSqlite._get_destination_path(invalid_input)
+
+
+def test_write_flushes_buffer_when_size_limit_is_reached(tmp_path, monkeypatch):
+    monkeypatch.setattr(DestinationSqlite, "_get_destination_path", staticmethod(lambda path: path))
+    monkeypatch.setattr(destination_module, "MAX_BUFFERED_RECORDS", 2)
+    path = str(tmp_path / "sqlite.db")
+    catalog = ConfiguredAirbyteCatalog(
+        streams=[
+            ConfiguredAirbyteStream(
+                stream=AirbyteStream(name="stream", json_schema={"type": "object"}, supported_sync_modes=[SyncMode.full_refresh]),
+                sync_mode=SyncMode.full_refresh,
+                destination_sync_mode=DestinationSyncMode.overwrite,
+            )
+        ]
+    )
+    flushed_counts = []
+
+    def messages():
+        for i in range(5):
+            yield AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="stream", data={"id": i}, emitted_at=0))
+            # records are written before any state message is received
+            with sqlite3.connect(path) as con:
+                flushed_counts.append(con.execute("SELECT COUNT(*) FROM _airbyte_raw_stream").fetchone()[0])
+
+    config = {"destination_path": path, "wal_mode": True}
+    result = list(DestinationSqlite().write(config=config, configured_catalog=catalog, input_messages=messages()))
+
+    assert result == []
+    assert flushed_counts == [0, 2, 2, 4, 4]
+    with sqlite3.connect(path) as con:
+        assert con.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert con.execute("SELECT COUNT(*) FROM _airbyte_raw_stream").fetchone()[0] == 5
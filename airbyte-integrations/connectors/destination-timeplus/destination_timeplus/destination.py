@@ -20,6 +20,8 @@ from airbyte_cdk.models import (
     Type,
 )
 
+from .writer import TimeplusWriter
+
 
 logger = getLogger("airbyte")
 
@@ -82,22 +84,23 @@ class DestinationTimeplus(Destination):
                 DestinationTimeplus.create_stream(env, configured_stream.stream)
                 logger.info(f"Stream {configured_stream.stream.name} created successfully")
 
+        writer = TimeplusWriter(env, batch_size=config.get("batch_size", TimeplusWriter.DEFAULT_BATCH_SIZE))
         for message in input_messages:
             if message.type == Type.STATE:
                 # Emitting a state message indicates that all records which came before it have been written to the destination. So we flush
                 # the queue to ensure writes happen, then output the state message to indicate it's safe to checkpoint state
+                writer.flush()
                 yield message
             elif message.type == Type.RECORD:
                 record = message.record
-
-                # this code is to send data to a single-column stream
-                # Stream(env=env).name(record.stream).column("raw", "string").ingest(payload=record.data)
-
-                Stream(env=env).name(record.stream).ingest(payload=record.data, format="streaming")
+                writer.queue_write_operation(record.stream, record.data)
             else:
                 # ignore other message types for now
                 continue
 
+        # flush any remaining records
+        writer.flush()
+
     @staticmethod
     def create_stream(env, stream: AirbyteStream):
         # singlel-column stream
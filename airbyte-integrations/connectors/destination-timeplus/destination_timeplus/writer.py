@@ -0,0 +1,110 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+import json
+import time
+from logging import getLogger
+from typing import Any, Dict, List, Mapping
+
+from timeplus import Environment, Stream
+
+
+logger = getLogger("airbyte")
+
+
+class StreamBuffer:
+    """
+    Rows buffered for one Timeplus stream, kept in the columnar layout of the compact ingest format.
+    """
+
+    def __init__(self):
+        self.columns: List[str] = []
+        self.column_index: Dict[str, int] = {}
+        self.rows: List[List[Any]] = []
+        self.size_bytes = 0
+        self.first_row_at = 0.0
+
+    def append(self, data: Mapping[str, Any]):
+        if not self.rows:
+            self.first_row_at = time.monotonic()
+        row = [None] * len(self.columns)
+        for name, value in data.items():
+            if isinstance(value, dict):
+                # object properties are created as string columns, see DestinationTimeplus.type_mapping
+                value = json.dumps(value)
+            index = self.column_index.get(name)
+            if index is None:
+                index = self.column_index[name] = len(self.columns)
+                self.columns.append(name)
+                row.append(None)
+            row[index] = value
+        self.rows.append(row)
+        self.size_bytes += len(json.dumps(row, default=str))
+
+    def take(self):
+        columns = list(self.columns)
+        # rows buffered before a column showed up are shorter than the final column list
+        rows = [row + [None] * (len(columns) - len(row)) for row in self.rows]
+        self.columns, self.column_index, self.rows, self.size_bytes = [], {}, [], 0
+        return columns, rows
+
+    def __len__(self):
+        return len(self.rows)
+
+
+class TimeplusWriter:
+    """
+    Buffers records per stream and ingests them in batches with the compact format,
+    i.e. {"columns": [...], "data": [[...], ...]}, instead of one ingest request per record.
+
+    A stream's buffer is sent once it holds `batch_size` rows, `max_batch_bytes` of data, or
+    rows older than `max_batch_latency_seconds`. Stream handles are created once per stream and reused.
+    """
+
+    DEFAULT_BATCH_SIZE = 1000
+    DEFAULT_MAX_BATCH_BYTES = 4 * 1024 * 1024
+    DEFAULT_MAX_BATCH_LATENCY_SECONDS = 5.0
+
+    def __init__(
+        self,
+        env: Environment,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        max_batch_latency_seconds: float = DEFAULT_MAX_BATCH_LATENCY_SECONDS,
+    ):
+        self.env = env
+        self.batch_size = batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.max_batch_latency_seconds = max_batch_latency_seconds
+        self.streams: Dict[str, Stream] = {}
+        self.buffers: Dict[str, StreamBuffer] = {}
+
+    def queue_write_operation(self, stream_name: str, data: Mapping[str, Any]):
+        buffer = self.buffers.setdefault(stream_name, StreamBuffer())
+        buffer.append(data)
+        if (
+            len(buffer) >= self.batch_size
+            or buffer.size_bytes >= self.max_batch_bytes
+            or time.monotonic() - buffer.first_row_at >= self.max_batch_latency_seconds
+        ):
+            self._flush_stream(stream_name)
+
+    def flush(self):
+        """
+        Ingests every buffered row. Returns once Timeplus acknowledged all of them, so a state message
+        received after the buffered records can be emitted.
+        """
+        for stream_name in self.buffers:
+            self._flush_stream(stream_name)
+
+    def _flush_stream(self, stream_name: str):
+        buffer = self.buffers[stream_name]
+        if not buffer:
+            return
+        columns, rows = buffer.take()
+        stream = self.streams.get(stream_name)
+        if stream is None:
+            stream = self.streams[stream_name] = Stream(env=self.env).name(stream_name)
+        logger.debug(f"Ingesting {len(rows)} rows into stream {stream_name}")
+        stream.ingest(columns, rows)
@@ -2,7 +2,10 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 #
 
+from unittest.mock import MagicMock, patch
+
 from destination_timeplus import DestinationTimeplus
+from destination_timeplus.writer import StreamBuffer, TimeplusWriter
 
 
 def test_type_mapping():
@@ -15,3 +18,35 @@ def test_type_mapping():
     }
     for k, v in expected.items():
         assert k == DestinationTimeplus.type_mapping(v)
+
+
+def test_stream_buffer_is_columnar():
+    buffer = StreamBuffer()
+    buffer.append({"a": 1, "b": {"x": 1}})
+    buffer.append({"b": None, "c": [1, 2]})
+    assert len(buffer) == 2
+    columns, rows = buffer.take()
+    assert columns == ["a", "b", "c"]
+    assert rows == [[1, '{"x": 1}', None], [None, None, [1, 2]]]
+    assert len(buffer) == 0
+    assert buffer.size_bytes == 0
+
+
+@patch("destination_timeplus.writer.Stream")
+def test_writer_flushes_full_batches_and_reuses_stream_handles(mock_stream_class):
+    writer = TimeplusWriter(env=MagicMock(), batch_size=2)
+    handle = mock_stream_class.return_value.name.return_value
+
+    writer.queue_write_operation("s1", {"id": 1})
+    handle.ingest.assert_not_called()
+    writer.queue_write_operation("s1", {"id": 2})
+    handle.ingest.assert_called_once_with(["id"], [[1], [2]])
+
+    writer.queue_write_operation("s1", {"id": 3})
+    writer.flush()
+    assert handle.ingest.call_count == 2
+    handle.ingest.assert_called_with(["id"], [[3]])
+    mock_stream_class.assert_called_once()
+
+    writer.flush()
+    assert handle.ingest.call_count == 2
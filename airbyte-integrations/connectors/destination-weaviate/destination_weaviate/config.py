@@ -65,6 +65,12 @@ class WeaviateIndexingConfigModel(BaseModel):
         ..., title="Authentication", description="Authentication method", discriminator="mode", type="object", order=2
     )
     batch_size: int = Field(title="Batch Size", description="The number of records to send to Weaviate in each batch", default=128)
+    num_workers: int = Field(
+        title="Number of Workers",
+        description="The number of batches sent to Weaviate concurrently. With more than one worker, batch sizes are adjusted to the server's response times, starting from the batch size",
+        default=1,
+        ge=1,
+    )
     text_field: str = Field(title="Text Field", description="The field in the object that contains the embedded text", default="text")
     tenant_id: str = Field(title="Tenant ID", description="The tenant ID to use for multi tenancy", airbyte_secret=True, default="")
     default_vectorizer: str = Field(
@@ -9,7 +9,7 @@ import os
 import re
 import uuid
 from collections import defaultdict
-from typing import Optional
+from typing import Dict, List, Optional
 
 import weaviate
 
@@ -27,12 +27,19 @@ class WeaviatePartialBatchError(Exception):
 
 CLOUD_DEPLOYMENT_MODE = "cloud"
 
+INVALID_CLASS_NAME_CHARS = re.compile("[^0-9A-Za-z_]+")
+INVALID_PROPERTY_NAME_CHARS = re.compile(r"[^0-9A-Za-z_]")
+VALID_PROPERTY_NAME_START = re.compile(r"^[_A-Za-z]")
+
 
 class WeaviateIndexer(Indexer):
     config: WeaviateIndexingConfigModel
 
     def __init__(self, config: WeaviateIndexingConfigModel):
         super().__init__(config)
+        self._class_names: Dict[str, str] = {}
+        self._property_names: Dict[str, str] = {}
+        self._batch_errors: List[dict] = []
 
     def _create_client(self):
         headers = {
@@ -48,10 +55,21 @@ class WeaviateIndexer(Indexer):
         else:
             self.client = weaviate.Client(url=self.config.host, additional_headers=headers)
 
-        # disable dynamic batching because it's handled asynchroniously in the client
-        self.client.batch.configure(
-            batch_size=None, dynamic=False, weaviate_error_retries=weaviate.WeaviateErrorRetryConf(number_retries=5)
-        )
+        if self.config.num_workers > 1:
+            # batches are sent by the client's worker threads as soon as they are full, sized by the
+            # observed server throughput; errors are collected by the callback and raised in `index`
+            self.client.batch.configure(
+                batch_size=self.config.batch_size,
+                dynamic=True,
+                num_workers=self.config.num_workers,
+                callback=self._collect_batch_errors,
+                weaviate_error_retries=weaviate.WeaviateErrorRetryConf(number_retries=5),
+            )
+        else:
+            # disable dynamic batching because it's handled asynchroniously in the client
+            self.client.batch.configure(
+                batch_size=None, dynamic=False, weaviate_error_retries=weaviate.WeaviateErrorRetryConf(number_retries=5)
+            )
 
     def _add_tenant_to_class_if_missing(self, class_name: str):
         class_tenants = self.client.schema.get_class_tenants(class_name=class_name)
@@ -141,39 +159,54 @@ class WeaviateIndexer(Indexer):
         if len(document_chunks) == 0:
             return
 
+        if self.config.num_workers > 1:
+            # the client creates batches in the background while objects are added, wait for all of them before returning
+            for chunk in document_chunks:
+                self._add_chunk(chunk)
+            self.client.batch.flush()
+            self._raise_batch_errors()
+            return
+
         # As a single record can be split into lots of documents, break them into batches as configured to not overwhelm the cluster
         batches = create_chunks(document_chunks, batch_size=self.config.batch_size)
         for batch in batches:
-            for i in range(len(batch)):
-                chunk = batch[i]
-                weaviate_object = {**self._normalize(chunk.metadata)}
-                if chunk.page_content is not None:
-                    weaviate_object[self.config.text_field] = chunk.page_content
-                object_id = str(uuid.uuid4())
-                class_name = self._stream_to_class_name(chunk.record.stream)
-                if self.config.tenant_id.strip():
-                    self.client.batch.add_data_object(
-                        weaviate_object, class_name, object_id, vector=chunk.embedding, tenant=self.config.tenant_id
-                    )
-                else:
-                    self.client.batch.add_data_object(weaviate_object, class_name, object_id, vector=chunk.embedding)
+            for chunk in batch:
+                self._add_chunk(chunk)
             self._flush()
 
+    def _add_chunk(self, chunk):
+        weaviate_object = {**self._normalize(chunk.metadata)}
+        if chunk.page_content is not None:
+            weaviate_object[self.config.text_field] = chunk.page_content
+        object_id = str(uuid.uuid4())
+        class_name = self._stream_to_class_name(chunk.record.stream)
+        if self.config.tenant_id.strip():
+            self.client.batch.add_data_object(weaviate_object, class_name, object_id, vector=chunk.embedding, tenant=self.config.tenant_id)
+        else:
+            self.client.batch.add_data_object(weaviate_object, class_name, object_id, vector=chunk.embedding)
+
     def _stream_to_class_name(self, stream_name: str) -> str:
-        pattern = "[^0-9A-Za-z_]+"
-        stream_name = re.sub(pattern, "", stream_name)
-        stream_name = stream_name.replace(" ", "")
-        return stream_name[0].upper() + stream_name[1:]
+        class_name = self._class_names.get(stream_name)
+        if class_name is None:
+            class_name = INVALID_CLASS_NAME_CHARS.sub("", stream_name)
+            class_name = class_name.replace(" ", "")
+            class_name = self._class_names[stream_name] = class_name[0].upper() + class_name[1:]
+        return class_name
 
     def _normalize_property_name(self, field_name: str) -> str:
+        normalized = self._property_names.get(field_name)
+        if normalized is not None:
+            return normalized
+
         # Remove invalid characters and replace spaces with underscores
-        normalized = re.sub(r"[^0-9A-Za-z_]", "", field_name.replace(" ", "_"))
+        normalized = INVALID_PROPERTY_NAME_CHARS.sub("", field_name.replace(" ", "_"))
 
         # Ensure the name starts with a letter or underscore
-        if not re.match(r"^[_A-Za-z]", normalized):
+        if not VALID_PROPERTY_NAME_START.match(normalized):
             normalized = "_" + normalized
 
-        return normalized[0].lower() + normalized[1:]
+        normalized = self._property_names[field_name] = normalized[0].lower() + normalized[1:]
+        return normalized
 
     def _normalize(self, metadata: dict) -> dict:
         result = {}
@@ -196,14 +229,17 @@ class WeaviateIndexer(Indexer):
         return result
 
     def _flush(self, retries: int = 3):
-        results = self.client.batch.create_objects()
-        all_errors = []
+        self._collect_batch_errors(self.client.batch.create_objects())
+        self._raise_batch_errors()
 
-        for result in results:
+    def _collect_batch_errors(self, results: Optional[list]):
+        for result in results or []:
             errors = result.get("result", {}).get("errors", [])
             if errors:
-                all_errors.extend(errors)
+                self._batch_errors.extend(errors)
 
-        if len(all_errors) > 0:
+    def _raise_batch_errors(self):
+        if len(self._batch_errors) > 0:
+            all_errors, self._batch_errors = self._batch_errors, []
             error_msg = "Errors while loading: " + ", ".join([str(error) for error in all_errors])
             raise WeaviatePartialBatchError(error_msg)
@@ -201,6 +201,38 @@ class TestWeaviateIndexer(unittest.TestCase):
         self.indexer.index([mock_chunk1, mock_chunk2, mock_chunk3], None, "test")
         assert mock_client.batch.create_objects.call_count == 2
 
+    @patch("destination_weaviate.indexer.weaviate.Client")
+    def test_concurrent_batching_configures_dynamic_batches(self, MockClient):
+        self.indexer.config.num_workers = 4
+        self.indexer._create_client()
+        MockClient.return_value.batch.configure.assert_called_once_with(
+            batch_size=128, dynamic=True, num_workers=4, callback=self.indexer._collect_batch_errors, weaviate_error_retries=ANY
+        )
+
+    def test_concurrent_index_flushes_once_and_propagates_error(self):
+        mock_client = Mock()
+        self.indexer.client = mock_client
+        self.indexer.config.num_workers = 2
+        self.indexer.config.batch_size = 1
+        mock_client.batch.flush.side_effect = lambda: self.indexer._collect_batch_errors([{"result": {"errors": ["some_error"]}}])
+        chunks = [
+            Chunk(
+                page_content=f"content_{i}",
+                embedding=[i],
+                metadata={"someField": i},
+                record=AirbyteRecordMessage(stream="test", data={"someField": i}, emitted_at=0),
+            )
+            for i in range(3)
+        ]
+        with self.assertRaises(WeaviatePartialBatchError):
+            self.indexer.index(chunks, None, "test")
+        assert mock_client.batch.add_data_object.call_count == 3
+        mock_client.batch.flush.assert_called_once()
+        mock_client.batch.create_objects.assert_not_called()
+
+        mock_client.batch.flush.side_effect = None
+        self.indexer.index(chunks, None, "test")
+
     def test_index_on_empty_batch(self):
         mock_client = Mock()
         self.indexer.client = mock_client
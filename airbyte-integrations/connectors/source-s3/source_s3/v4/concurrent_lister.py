@@ -0,0 +1,172 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from botocore.client import BaseClient
+
+from airbyte_cdk.sources.file_based.remote_file import RemoteFile
+
+
+class _ListingStopped(Exception):
+    """Raised in the listing threads once the consumer stopped reading the results."""
+
+
+class ConcurrentPrefixLister:
+    """
+    Lists the objects below several S3 prefixes on a thread pool.
+
+    Every prefix is listed in its own task. Prefixes less than `split_depth` levels below the requested ones are
+    listed with a "/" delimiter first: the objects directly below them are handled right away and every sub-prefix
+    found (e.g. every "folder") is listed in a task of its own, so a single large prefix is listed in parallel as well.
+
+    Listing threads put the files they find into a bounded queue, so listing pauses when the consumer falls behind.
+    """
+
+    def __init__(
+        self,
+        s3: BaseClient,
+        bucket: str,
+        handle_object: Callable[[Dict[str, Any]], Iterable[RemoteFile]],
+        logger: logging.Logger,
+        max_workers: int = 8,
+        split_depth: int = 1,
+        queue_size: int = 10_000,
+    ):
+        """
+        :param handle_object: converts an object of a `list_objects_v2` response into the matching remote files, if any.
+        """
+        self.s3 = s3
+        self.bucket = bucket
+        self.handle_object = handle_object
+        self.logger = logger
+        self.max_workers = max_workers
+        self.split_depth = split_depth
+        self.queue_size = queue_size
+
+    @staticmethod
+    def remove_nested_prefixes(prefixes: Iterable[Optional[str]]) -> List[Optional[str]]:
+        """
+        Drops the prefixes that another prefix already covers, e.g. "a/b/" when "a/" is listed as well.
+        An empty prefix covers the whole bucket.
+        """
+        kept: List[str] = []
+        # a prefix sorts before every longer prefix starting with it
+        for prefix in sorted({prefix or "" for prefix in prefixes}):
+            if not any(prefix.startswith(covering) for covering in kept):
+                kept.append(prefix)
+        return [prefix or None for prefix in kept]
+
+    def list(self, prefixes: Iterable[Optional[str]]) -> Iterator[RemoteFile]:
+        results: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stopped = threading.Event()
+        finished = threading.Event()
+        lock = threading.Lock()
+        pending_tasks = 0
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="s3-lister")
+
+        def put(item: Any) -> None:
+            while not stopped.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+            raise _ListingStopped()
+
+        def submit(prefix: Optional[str], depth: int) -> None:
+            nonlocal pending_tasks
+            if stopped.is_set():
+                raise _ListingStopped()
+            with lock:
+                pending_tasks += 1
+            executor.submit(run, prefix, depth)
+
+        def task_done() -> None:
+            nonlocal pending_tasks
+            with lock:
+                pending_tasks -= 1
+                if pending_tasks == 0:
+                    # every file was put into the queue before this point
+                    finished.set()
+
+        def run(prefix: Optional[str], depth: int) -> None:
+            try:
+                for sub_prefix in self._list_prefix(prefix, depth, put, stopped):
+                    submit(sub_prefix, depth + 1)
+            except _ListingStopped:
+                return
+            except Exception as exc:
+                stopped.set()
+                # the consumer may no longer read from a full queue, make room for the error
+                while True:
+                    try:
+                        results.put_nowait(exc)
+                        break
+                    except queue.Full:
+                        with suppress(queue.Empty):
+                            results.get_nowait()
+                return
+            task_done()
+
+        prefixes = self.remove_nested_prefixes(prefixes)
+        try:
+            # the seeding counts as a task, so that listing is not reported as done before every prefix was submitted
+            pending_tasks += 1
+            for prefix in prefixes:
+                submit(prefix, 0)
+            task_done()
+            while True:
+                try:
+                    item = results.get(timeout=0.1)
+                except queue.Empty:
+                    if finished.is_set() and results.empty():
+                        return
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stopped.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _list_prefix(self, prefix: Optional[str], depth: int, put: Callable[[Any], None], stopped: threading.Event) -> Iterator[str]:
+        """
+        Pages through the objects below the prefix, puts the matching files into the queue and yields the sub-prefixes to list next.
+        Stops before the next page once the consumer stopped reading, e.g. when only the first file was requested.
+        """
+        total_n_keys_for_prefix = 0
+        kwargs = {"Bucket": self.bucket}
+        if prefix:
+            kwargs["Prefix"] = prefix
+        if depth < self.split_depth:
+            kwargs["Delimiter"] = "/"
+        while True:
+            if stopped.is_set():
+                raise _ListingStopped()
+            response = self.s3.list_objects_v2(**kwargs)
+            key_count = response.get("KeyCount")
+            total_n_keys_for_prefix += key_count
+            self.logger.info(f"Received {key_count} objects from S3 for prefix '{prefix}'.")
+
+            if "Contents" in response:
+                for file in response["Contents"]:
+                    for remote_file in self.handle_object(file):
+                        put(remote_file)
+            elif not response.get("CommonPrefixes"):
+                self.logger.warning(f"Invalid response from S3; missing 'Contents' key. kwargs={kwargs}.")
+
+            for common_prefix in response.get("CommonPrefixes", []):
+                yield common_prefix["Prefix"]
+
+            if next_token := response.get("NextContinuationToken"):
+                kwargs["ContinuationToken"] = next_token
+            else:
+                self.logger.info(f"Finished listing objects from S3 for prefix={prefix}. Found {total_n_keys_for_prefix} objects.")
+                break
@@ -0,0 +1,96 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+import shutil
+import threading
+from contextlib import contextmanager
+from os.path import dirname
+from typing import Callable, Iterator, Optional
+
+from boto3.s3.transfer import TransferConfig
+from botocore.client import BaseClient
+
+from airbyte_cdk import FailureType
+from airbyte_cdk.sources.file_based.exceptions import FileSizeLimitError
+
+
+MB = 1024 * 1024
+
+
+class S3FileDownloader:
+    """
+    Downloads S3 objects to local files for the file transfer mode.
+
+    Objects larger than `multipart_threshold` are downloaded as ranges of `multipart_chunksize` bytes, with up to
+    `max_concurrency_per_file` ranges in flight. The stream partitions of a sync call `download` from several threads;
+    at most `max_concurrent_files` downloads run at the same time, and a download only starts once its whole size fits
+    on the disk next to the downloads still running, keeping `disk_space_reserve` bytes free.
+    """
+
+    MAX_CONCURRENT_FILES = 4
+    MAX_CONCURRENCY_PER_FILE = 10
+    MULTIPART_THRESHOLD = 64 * MB
+    MULTIPART_CHUNKSIZE = 64 * MB
+    DISK_SPACE_RESERVE = 512 * MB
+
+    def __init__(
+        self,
+        s3_client: BaseClient,
+        bucket: str,
+        max_concurrent_files: int = MAX_CONCURRENT_FILES,
+        max_concurrency_per_file: int = MAX_CONCURRENCY_PER_FILE,
+        multipart_threshold: int = MULTIPART_THRESHOLD,
+        multipart_chunksize: int = MULTIPART_CHUNKSIZE,
+        disk_space_reserve: int = DISK_SPACE_RESERVE,
+    ):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.disk_space_reserve = disk_space_reserve
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_chunksize,
+            max_concurrency=max_concurrency_per_file,
+            use_threads=True,
+        )
+        self._download_slots = threading.Semaphore(max_concurrent_files)
+        self._disk_space = threading.Condition()
+        self._reserved_bytes = 0
+
+    def file_size(self, key: str) -> int:
+        """
+        Returns the size of an object with a HEAD request, without opening its body.
+        """
+        return self.s3_client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+
+    def download(self, key: str, local_file_path: str, file_size: int, callback: Optional[Callable[[int], None]] = None) -> None:
+        with self._download_slots, self._reserve_disk_space(file_size, dirname(local_file_path)):
+            self.s3_client.download_file(self.bucket, key, local_file_path, Config=self.transfer_config, Callback=callback)
+
+    @contextmanager
+    def _reserve_disk_space(self, file_size: int, directory: str) -> Iterator[None]:
+        """
+        Waits until the file fits on the disk next to the running downloads and holds its size until the download finished.
+
+        Running downloads count with their full size even though part of it was already written, so the estimate is on the safe side.
+        """
+        with self._disk_space:
+            while True:
+                available = shutil.disk_usage(directory).free - self.disk_space_reserve - self._reserved_bytes
+                if file_size <= available:
+                    break
+                if not self._reserved_bytes:
+                    # no running download will free up space, waiting would not help
+                    message = (
+                        f"The file size of {file_size / MB:,.2f} MB exceeds the available disk space of "
+                        f"{max(available, 0) / MB:,.2f} MB for file transfers."
+                    )
+                    raise FileSizeLimitError(message=message, internal_message=message, failure_type=FailureType.system_error)
+                self._disk_space.wait()
+            self._reserved_bytes += file_size
+        try:
+            yield
+        finally:
+            with self._disk_space:
+                self._reserved_bytes -= file_size
+                self._disk_space.notify_all()
@@ -3,12 +3,13 @@
 #
 
 import logging
+import threading
 import time
 from datetime import datetime
 from io import IOBase
 from os import getenv
 from os.path import basename, dirname
-from typing import Dict, Iterable, List, Optional, Set, Tuple, cast
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import boto3.session
 import pendulum
@@ -24,11 +25,13 @@ from typing_extensions import override
 
 from airbyte_cdk import FailureType
 from airbyte_cdk.models import AirbyteRecordMessageFileReference
-from airbyte_cdk.sources.file_based.exceptions import CustomFileBasedException, ErrorListingFiles, FileBasedSourceError, FileSizeLimitError
+from airbyte_cdk.sources.file_based.exceptions import CustomFileBasedException, ErrorListingFiles, FileBasedSourceError
 from airbyte_cdk.sources.file_based.file_based_stream_reader import AbstractFileBasedStreamReader, FileReadMode
 from airbyte_cdk.sources.file_based.file_record_data import FileRecordData
 from airbyte_cdk.sources.file_based.remote_file import RemoteFile
+from source_s3.v4.concurrent_lister import ConcurrentPrefixLister
 from source_s3.v4.config import Config
+from source_s3.v4.file_transfer import S3FileDownloader
 from source_s3.v4.zip_reader import DecompressedStream, RemoteFileInsideArchive, ZipContentReader, ZipFileHandler
 
 
@@ -36,11 +39,19 @@ AWS_EXTERNAL_ID = getenv("AWS_ASSUME_ROLE_EXTERNAL_ID")
 
 
 class SourceS3StreamReader(AbstractFileBasedStreamReader):
-    FILE_SIZE_LIMIT = 1_500_000_000
+    # number of threads listing prefixes in parallel
+    LISTING_CONCURRENCY = 8
+    # prefixes are split into their sub-prefixes ("folders") down to this many levels below the ones derived from the globs
+    LISTING_SPLIT_DEPTH = 1
+    # enough connections for the listing threads and for every range request of the concurrent file transfers
+    MAX_POOL_CONNECTIONS = LISTING_CONCURRENCY + S3FileDownloader.MAX_CONCURRENT_FILES * S3FileDownloader.MAX_CONCURRENCY_PER_FILE
 
     def __init__(self):
         super().__init__()
         self._s3_client = None
+        self._downloader: Optional[S3FileDownloader] = None
+        self._downloader_lock = threading.Lock()
+        self._start_date: Optional[datetime] = None
 
     @property
     def config(self) -> Config:
@@ -59,6 +70,8 @@ class SourceS3StreamReader(AbstractFileBasedStreamReader):
         """
         assert isinstance(value, Config)
         self._config = value
+        # parsed once here rather than for every listed object
+        self._start_date = pendulum.parse(value.start_date).naive() if value.start_date else None
 
     @property
     def s3_client(self) -> BaseClient:
@@ -74,6 +87,9 @@ class SourceS3StreamReader(AbstractFileBasedStreamReader):
             if self.config.region_name:
                 client_kv_args["region_name"] = self.config.region_name
 
+            pool_config = ClientConfig(max_pool_connections=self.MAX_POOL_CONNECTIONS)
+            client_kv_args["config"] = client_kv_args["config"].merge(pool_config) if "config" in client_kv_args else pool_config
+
             if self.config.role_arn:
                 self._s3_client = self._get_iam_s3_client(client_kv_args)
             else:
@@ -86,6 +102,15 @@ class SourceS3StreamReader(AbstractFileBasedStreamReader):
 
         return self._s3_client
 
+    @property
+    def downloader(self) -> S3FileDownloader:
+        # created once, as it limits the downloads running concurrently across all streams
+        # the transfer settings are not part of the spec on purpose: MAX_POOL_CONNECTIONS is sized for their defaults
+        with self._downloader_lock:
+            if self._downloader is None:
+                self._downloader = S3FileDownloader(self.s3_client, self.config.bucket)
+        return self._downloader
+
     def _get_iam_s3_client(self, client_kv_args: dict) -> BaseClient:
         """
         Creates an S3 client using AWS Security Token Service (STS) with assumed role credentials. This method handles
@@ -141,11 +166,20 @@ class SourceS3StreamReader(AbstractFileBasedStreamReader):
         prefixes = [prefix] if prefix else self.get_prefixes_from_globs(globs)
         seen = set()
         total_n_keys = 0
+        lister = ConcurrentPrefixLister(
+            s3,
+            self.config.bucket,
+            lambda file: self._matching_files(file, globs),
+            logger,
+            max_workers=self.LISTING_CONCURRENCY,
+            split_depth=self.LISTING_SPLIT_DEPTH,
+        )
 
         try:
-            for current_prefix in prefixes if prefixes else [None]:
-                for remote_file in self._page(s3, globs, self.config.bucket, current_prefix, seen, logger):
-                    total_n_keys += 1
+            for remote_file in lister.list(prefixes if prefixes else [None]):
+                total_n_keys += 1
+                if remote_file.uri not in seen:
+                    seen.add(remote_file.uri)
                     yield remote_file
 
             logger.info(f"Finished listing objects from S3. Found {total_n_keys} objects total ({len(seen)} unique objects).")
@@ -251,13 +285,9 @@ class SourceS3StreamReader(AbstractFileBasedStreamReader):
             Tuple[FileRecordData, AirbyteRecordMessageFileReference]: Contains file record data and file reference for Airbyte protocol.
 
         Raises:
-            FileSizeLimitError: If the file size exceeds the predefined limit (1 GB).
+            FileSizeLimitError: If the file does not fit into the available disk space.
         """
         file_size = self.file_size(file)
-        # I'm putting this check here so we can remove the safety wheels per connector when ready.
-        if file_size > self.FILE_SIZE_LIMIT:
-            message = "File size exceeds the 1 GB limit."
-            raise FileSizeLimitError(message=message, internal_message=message, failure_type=FailureType.config_error)
 
         file_paths = self._get_file_transfer_paths(file.uri, local_directory)
         local_file_path = file_paths[self.LOCAL_FILE_PATH]
@@ -267,10 +297,9 @@ class SourceS3StreamReader(AbstractFileBasedStreamReader):
         logger.info(
             f"Starting to download the file {file.uri} with size: {file_size / (1024 * 1024):,.2f} MB ({file_size / (1024 * 1024 * 1024):.2f} GB)"
         )
-        # at some moment maybe we will require to play with the max_pool_connections and max_concurrency of s3 config
         start_download_time = time.time()
         progress_handler = self.create_progress_handler(file_size, local_file_path, logger)
-        self.s3_client.download_file(self.config.bucket, file.uri, local_file_path, Callback=progress_handler)
+        self.downloader.download(file.uri, local_file_path, file_size, callback=progress_handler)
         write_duration = time.time() - start_download_time
         logger.info(f"Finished downloading the file {file.uri} and saved to {local_file_path} in {write_duration:,.2f} seconds.")
 
@@ -292,57 +321,29 @@ class SourceS3StreamReader(AbstractFileBasedStreamReader):
 
     @override
     def file_size(self, file: RemoteFile) -> int:
-        s3_object: boto3.s3.Object = self.s3_client.get_object(
-            Bucket=self.config.bucket,
-            Key=file.uri,
-        )
-        return cast(int, s3_object["ContentLength"])
+        return self.downloader.file_size(file.uri)
 
     @staticmethod
     def _is_folder(file) -> bool:
         return file["Key"].endswith("/")
 
-    def _page(
-        self, s3: BaseClient, globs: List[str], bucket: str, prefix: Optional[str], seen: Set[str], logger: logging.Logger
-    ) -> Iterable[RemoteFile]:
+    def _matching_files(self, file, globs: List[str]) -> Iterable[RemoteFile]:
         """
-        Page through lists of S3 objects.
+        Returns the remote files of a listed S3 object that match the globs and the start date. Runs on the listing threads.
         """
-        total_n_keys_for_prefix = 0
-        kwargs = {"Bucket": bucket}
-        while True:
-            response = s3.list_objects_v2(Prefix=prefix, **kwargs) if prefix else s3.list_objects_v2(**kwargs)
-            key_count = response.get("KeyCount")
-            total_n_keys_for_prefix += key_count
-            logger.info(f"Received {key_count} objects from S3 for prefix '{prefix}'.")
-
-            if "Contents" in response:
-                for file in response["Contents"]:
-                    if self._is_folder(file):
-                        continue
-
-                    for remote_file in self._handle_file(file):
-                        if (
-                            self.file_matches_globs(remote_file, globs)
-                            and self.is_modified_after_start_date(remote_file.last_modified)
-                            and remote_file.uri not in seen
-                        ):
-                            seen.add(remote_file.uri)
-                            yield remote_file
-            else:
-                logger.warning(f"Invalid response from S3; missing 'Contents' key. kwargs={kwargs}.")
-
-            if next_token := response.get("NextContinuationToken"):
-                kwargs["ContinuationToken"] = next_token
-            else:
-                logger.info(f"Finished listing objects from S3 for prefix={prefix}. Found {total_n_keys_for_prefix} objects.")
-                break
+        if self._is_folder(file):
+            return []
+        return [
+            remote_file
+            for remote_file in self._handle_file(file)
+            if self.file_matches_globs(remote_file, globs) and self.is_modified_after_start_date(remote_file.last_modified)
+        ]
 
     def is_modified_after_start_date(self, last_modified_date: Optional[datetime]) -> bool:
         """Returns True if given date higher or equal than start date or something is missing"""
-        if not (self.config.start_date and last_modified_date):
+        if not (self._start_date and last_modified_date):
             return True
-        return last_modified_date >= pendulum.parse(self.config.start_date).naive()
+        return last_modified_date >= self._start_date
 
     def _handle_file(self, file):
         if file["Key"].endswith(".zip"):
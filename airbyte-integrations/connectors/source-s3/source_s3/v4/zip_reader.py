@@ -1,5 +1,6 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 
+import codecs
 import io
 import struct
 import zipfile
@@ -163,8 +164,8 @@ class DecompressedStream(io.IOBase):
         self.compressed_size = file_info.compressed_size
         self.uncompressed_size = file_info.uncompressed_size
         self.compression_method = file_info.compression_method
-        self._buffer = bytearray()
         self.buffer_size = buffer_size
+        self._clear_buffer()
         self._reset_decompressor()
         self.position = 0  # Current position in uncompressed stream
         self._file.seek(self.file_start)
@@ -190,6 +191,13 @@ class DecompressedStream(io.IOBase):
         name_len, extra_len = struct.unpack("<HH", self._file.read(4))  # Extract the lengths
         return file_start + self.LOCAL_FILE_HEADER_SIZE + name_len + extra_len  # Calculate the actual start by skipping the header
 
+    def _clear_buffer(self):
+        """
+        Drop the decompressed data that was not read yet.
+        """
+        self._buffer = memoryview(b"")
+        self._buffer_offset = 0
+
     def _reset_decompressor(self):
         """
         Reset the decompressor object.
@@ -204,53 +212,65 @@ class DecompressedStream(io.IOBase):
             return chunk
         return self.decompressor.decompress(chunk)
 
-    def read(self, size: int = -1) -> bytes:
+    def _read_block(self) -> bytes:
         """
-        Read a specified number of bytes from the stream.
+        Read and decompress the next block of the compressed data. Returns empty bytes at the end of the file.
         """
-        # Size not specified, read till end
-        if size == -1:
-            size = self.uncompressed_size - self.position
-
-        # If buffer already has enough data, return it directly
-        if size <= len(self._buffer):
-            data = self._buffer[:size]
-            self._buffer = self._buffer[size:]
-            self.position += len(data)
-            return data
-
-        data = self._buffer
-        self._buffer = bytearray()
-        while len(data) < size and self._file.tell() - self.file_start < self.compressed_size:
+        while self._file.tell() - self.file_start < self.compressed_size:
             max_read_size = min(self.buffer_size, self.compressed_size + self.file_start - self._file.tell())
             chunk = self._file.read(max_read_size)
-
             if not chunk:
                 break
-
             decompressed_data = self._decompress_chunk(chunk)
+            # a compressed chunk does not necessarily produce output on its own
+            if decompressed_data:
+                return decompressed_data
+        return b""
 
-            # Buffer excessive data for future reads
-            if len(data) + len(decompressed_data) > size:
-                desired_length = size - len(data)
-                data += decompressed_data[:desired_length]
-                self._buffer = decompressed_data[desired_length:]
-            else:
-                data += decompressed_data
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read a specified number of bytes from the stream.
+        """
+        # Size not specified, read till end
+        if size is None or size < 0:
+            size = self.uncompressed_size - self.position
 
+        # The unread part of the last decompressed block is kept as is and consumed by moving `_buffer_offset`,
+        # so that serving a read never copies the rest of the block.
+        parts = []
+        remaining = size
+        while remaining > 0:
+            if self._buffer_offset >= len(self._buffer):
+                self._buffer = memoryview(self._read_block())
+                self._buffer_offset = 0
+                if not self._buffer:
+                    break
+            part = self._buffer[self._buffer_offset : self._buffer_offset + remaining]
+            self._buffer_offset += len(part)
+            remaining -= len(part)
+            parts.append(part)
+
+        data = b"".join(parts)
         self.position += len(data)
         return data
 
+    def readinto(self, buffer) -> int:
+        """
+        Read bytes into a pre-allocated, writable bytes-like object.
+        """
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
     def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
         """
         Seek to a specific position in the uncompressed stream.
         """
-        if whence == io.SEEK_SET:
-            self._buffer = bytearray()
-        elif whence == io.SEEK_CUR:
+        if whence == io.SEEK_CUR:
             offset = self.position + offset
         elif whence == io.SEEK_END:
             offset = self.uncompressed_size + offset
+        self._clear_buffer()
 
         # Ensure the offset is within the file's boundaries
         offset = max(0, min(offset, self.uncompressed_size))
@@ -265,7 +285,8 @@ class DecompressedStream(io.IOBase):
         # Read till desired offset
         while self.position < offset:
             read_size = min(self.buffer_size, offset - self.position)
-            self.read(read_size)
+            if not self.read(read_size):
+                break
 
         return self.position
 
@@ -294,10 +315,14 @@ class DecompressedStream(io.IOBase):
         self._file.close()
 
 
-class ZipContentReader:
+class ZipContentReader(io.IOBase):
     """
     A custom reader class that provides buffered reading capabilities on a decompressed stream.
     Supports reading lines, reading chunks, and iterating over the content.
+
+    The stream is read in blocks of `buffer_size` bytes, which are decoded incrementally (so that characters split between
+    blocks are decoded correctly) and kept in a buffer that is consumed by moving an offset. Lines are split with `find`
+    on the whole block. "\n", "\r" and "\r\n" end a line and are returned as part of it, like `open(..., newline="")` does.
     """
 
     def __init__(self, decompressed_stream: DecompressedStream, encoding: Optional[str] = None, buffer_size: int = BUFFER_SIZE_DEFAULT):
@@ -311,8 +336,71 @@ class ZipContentReader:
         self.raw = decompressed_stream
         self.encoding = encoding
         self.buffer_size = buffer_size
-        self.buffer = bytearray()
-        self._closed = False
+        self._decoder = codecs.getincrementaldecoder(encoding)() if encoding else None
+        self._empty, self._cr, self._lf = ("", "\r", "\n") if encoding else (b"", b"\r", b"\n")
+        self._clear_buffer()
+
+    def _clear_buffer(self):
+        """
+        Drop the buffered data and start decoding from scratch.
+        """
+        self._buffer = self._empty
+        self._pos = 0
+        self._eof = False
+        # positions of the next "\r" and "\n" at or after the last searched position, len(self._buffer) if there is none
+        self._next_cr = self._next_lf = -1
+        if self._decoder:
+            self._decoder.reset()
+
+    def _read_block(self) -> Union[str, bytes]:
+        """
+        Read and decode the next block of the stream. Returns an empty string/bytes at the end of the stream.
+        """
+        while not self._eof:
+            chunk = self.raw.read(self.buffer_size)
+            self._eof = not chunk
+            data = self._decoder.decode(chunk, final=self._eof) if self._decoder else bytes(chunk)
+            # a block ending in the middle of a multibyte character might not decode to anything on its own
+            if data:
+                return data
+        return self._empty
+
+    def _fill(self) -> bool:
+        """
+        Append the next block to the unread part of the buffer. Returns False if the stream is exhausted.
+        """
+        data = self._read_block()
+        if not data:
+            return False
+        # only the unread rest of the buffer is copied, which is shorter than a line or a requested read
+        self._buffer = self._buffer[self._pos :] + data
+        self._pos = 0
+        self._next_cr = self._next_lf = -1
+        return True
+
+    def _line_end(self, start: int) -> Optional[int]:
+        """
+        Return the position right after the first line ending at or after `start`, or None if the buffer has no complete one.
+        """
+        if self._next_lf < start:
+            self._next_lf = self._buffer.find(self._lf, start)
+            if self._next_lf == -1:
+                self._next_lf = len(self._buffer)
+        if self._next_cr < start:
+            self._next_cr = self._buffer.find(self._cr, start)
+            if self._next_cr == -1:
+                self._next_cr = len(self._buffer)
+
+        end = min(self._next_cr, self._next_lf)
+        if end == len(self._buffer):
+            return None
+        if end == self._next_cr:
+            if end + 1 == len(self._buffer) and not self._eof:
+                # "\r" at the end of the buffer, the next block might start with the "\n" of a "\r\n"
+                return None
+            if self._buffer[end + 1 : end + 2] == self._lf:
+                return end + 2
+        return end + 1
 
     def __iter__(self):
         """
@@ -329,71 +417,119 @@ class ZipContentReader:
             raise StopIteration
         return line
 
-    def readline(self, limit: int = -1) -> Union[str, bytes]:
+    def readline(self, limit: Optional[int] = -1) -> Union[str, bytes]:
         """
-        Read a single line from the stream.
+        Read a single line from the stream, or at most `limit` bytes/characters of it.
         """
-        if limit != -1:
-            raise NotImplementedError("Limits other than -1 not implemented yet")
-
-        line = ""
+        if limit is None:
+            limit = -1
+        # the buffer holds no line ending between self._pos and self._pos + scanned
+        scanned = 0
         while True:
-            char = self.read(1)
-            if not char:
+            end = self._line_end(self._pos + scanned)
+            if end is not None:
                 break
-
-            line += char
-            if char in ["\n", "\r"]:
-                # Handling different types of newlines
-                next_char = self.read(1)
-                if char == "\r" and next_char == "\n":
-                    line += next_char
-                else:
-                    self.buffer = next_char.encode(self.encoding) + self.buffer
+            scanned = min(self._next_cr, self._next_lf) - self._pos
+            if 0 <= limit <= scanned or not self._fill():
+                end = len(self._buffer)
                 break
+
+        if 0 <= limit < end - self._pos:
+            end = self._pos + limit
+        line = self._buffer[self._pos : end]
+        self._pos = end
         return line
 
-    def read(self, size: int = -1) -> Union[str, bytes]:
+    def read(self, size: Optional[int] = -1) -> Union[str, bytes]:
         """
         Read a specified number of bytes/characters from the reader.
         """
-        while len(self.buffer) < size:
-            chunk = self.raw.read(self.buffer_size)
-            if not chunk:
+        if size is None:
+            size = -1
+        parts = [self._buffer[self._pos :]]
+        available = len(parts[0])
+        while size < 0 or available < size:
+            data = self._read_block()
+            if not data:
                 break
-            self.buffer += chunk
+            parts.append(data)
+            available += len(data)
+
+        # joined once, so that reading large sizes does not copy the data once per block
+        data = self._empty.join(parts)
+        self._buffer = data[size:] if 0 <= size < len(data) else self._empty
+        self._pos = 0
+        self._next_cr = self._next_lf = -1
+        return data[:size] if size >= 0 else data
+
+    def read1(self, size: Optional[int] = -1) -> Union[str, bytes]:
+        """
+        Read at most `size` bytes/characters, reading at most one block from the stream.
+        """
+        if self._pos >= len(self._buffer):
+            self._fill()
+        end = len(self._buffer) if size is None or size < 0 else min(len(self._buffer), self._pos + size)
+        data = self._buffer[self._pos : end]
+        self._pos = end
+        return data
 
-        data = self.buffer[:size]
-        self.buffer = self.buffer[size:]
+    def peek(self, size: int = 0) -> Union[str, bytes]:
+        """
+        Return buffered data without consuming it, reading one block from the stream if the buffer is empty.
+        """
+        if self._pos >= len(self._buffer):
+            self._fill()
+        return self._buffer[self._pos :]
 
-        return data.decode(self.encoding) if self.encoding else bytes(data)
+    def readinto(self, buffer) -> int:
+        """
+        Read bytes into a pre-allocated, writable bytes-like object.
+        """
+        if self.encoding:
+            raise io.UnsupportedOperation("readinto is only supported when reading bytes")
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
 
     def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
         """
         Seek to a specific position in the decompressed stream.
         """
-        self.buffer = bytearray()
+        if whence == io.SEEK_CUR:
+            # the stream is ahead of the reader by the buffered data
+            offset, whence = self.tell() + offset, io.SEEK_SET
+        self._clear_buffer()
         return self.raw.seek(offset, whence)
 
     def close(self):
         """
         Close the reader and underlying decompressed stream.
         """
-        self._closed = True
-        self.raw.close()
+        if not self.closed:
+            self.raw.close()
+        super().close()
 
     def tell(self) -> int:
         """
-        Return the current position in the decompressed stream.
+        Return the position in the decompressed stream up to which the data was read.
+        When reading text, the position is exact for encodings that don't use a byte order mark or other state.
         """
-        return self.raw.tell()
+        unread = self._buffer[self._pos :]
+        if self._decoder:
+            unread = unread.encode(self.encoding) + self._decoder.getstate()[0]
+        return self.raw.tell() - len(unread)
 
-    @property
-    def closed(self) -> bool:
+    def readable(self) -> bool:
         """
-        Check if the reader is closed.
+        Return if the reader is readable.
         """
-        return self._closed
+        return True
+
+    def seekable(self) -> bool:
+        """
+        Return if the reader is seekable.
+        """
+        return True
 
     def __enter__(self) -> "ZipContentReader":
         """Enter the runtime context for the reader."""
@@ -0,0 +1,90 @@
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+
+import threading
+from collections import namedtuple
+from unittest.mock import MagicMock, patch
+
+import pytest
+from source_s3.v4.file_transfer import S3FileDownloader
+
+from airbyte_cdk.sources.file_based.exceptions import FileSizeLimitError
+
+
+DiskUsage = namedtuple("DiskUsage", ["free"])
+
+
+@pytest.fixture
+def s3_client():
+    return MagicMock()
+
+
+def test_file_size(s3_client):
+    s3_client.head_object.return_value = {"ContentLength": 42}
+
+    assert S3FileDownloader(s3_client, "bucket").file_size("key") == 42
+    s3_client.head_object.assert_called_once_with(Bucket="bucket", Key="key")
+
+
+@patch("shutil.disk_usage", return_value=DiskUsage(free=1000))
+def test_download_raises_when_file_does_not_fit_on_disk(disk_usage_mock, s3_client):
+    downloader = S3FileDownloader(s3_client, "bucket", disk_space_reserve=100)
+
+    with pytest.raises(FileSizeLimitError):
+        downloader.download("key", "/tmp/staging/key", 901)
+    s3_client.download_file.assert_not_called()
+
+
+@patch("shutil.disk_usage", return_value=DiskUsage(free=1000))
+def test_download_waits_for_disk_space_of_running_downloads(disk_usage_mock, s3_client):
+    downloader = S3FileDownloader(s3_client, "bucket", disk_space_reserve=0)
+    first_download_started = threading.Event()
+    finish_first_download = threading.Event()
+    downloaded = []
+
+    def download_file(bucket, key, local_file_path, Config, Callback):
+        if key == "first":
+            first_download_started.set()
+            finish_first_download.wait(timeout=5)
+        downloaded.append(key)
+
+    s3_client.download_file.side_effect = download_file
+    first = threading.Thread(target=downloader.download, args=("first", "/tmp/staging/first", 600))
+    first.start()
+    first_download_started.wait(timeout=5)
+    second = threading.Thread(target=downloader.download, args=("second", "/tmp/staging/second", 600))
+    second.start()
+
+    second.join(timeout=0.2)
+    # both files don't fit on the disk at the same time
+    assert second.is_alive()
+    finish_first_download.set()
+    first.join(timeout=5)
+    second.join(timeout=5)
+    assert downloaded == ["first", "second"]
+
+
+@patch("shutil.disk_usage", return_value=DiskUsage(free=10_000))
+def test_download_limits_concurrent_files(disk_usage_mock, s3_client):
+    downloader = S3FileDownloader(s3_client, "bucket", max_concurrent_files=2, disk_space_reserve=0)
+    lock = threading.Lock()
+    running = []
+    max_running = 0
+
+    def download_file(bucket, key, local_file_path, Config, Callback):
+        nonlocal max_running
+        with lock:
+            running.append(key)
+            max_running = max(max_running, len(running))
+        threading.Event().wait(0.05)
+        with lock:
+            running.remove(key)
+
+    s3_client.download_file.side_effect = download_file
+    threads = [threading.Thread(target=downloader.download, args=(f"key{i}", f"/tmp/staging/key{i}", 10)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert s3_client.download_file.call_count == 6
+    assert max_running == 2
@@ -5,6 +5,7 @@
 
 import io
 import logging
+import threading
 from datetime import datetime, timedelta
 from itertools import product
 from typing import Any, Dict, List, Optional, Set
@@ -14,7 +15,9 @@ import pytest
 from botocore.stub import Stubber
 from moto import mock_sts
 from pydantic.v1 import AnyUrl
+from source_s3.v4.concurrent_lister import ConcurrentPrefixLister
 from source_s3.v4.config import Config
+from source_s3.v4.file_transfer import S3FileDownloader
 from source_s3.v4.stream_reader import SourceS3StreamReader
 
 from airbyte_cdk.sources.file_based.config.abstract_file_based_spec import AbstractFileBasedSpec
@@ -357,3 +360,133 @@ def test_filter_file_by_start_date(start_date: datetime, last_modified_date: dat
     )
 
     assert expected_result == reader.is_modified_after_start_date(last_modified_date)
+
+
+def test_get_matching_files_lists_sub_prefixes_in_parallel():
+    reader = SourceS3StreamReader()
+    reader.config = Config(bucket="test", aws_access_key_id="test", aws_secret_access_key="test", streams=[])
+    responses = {
+        "data/": {
+            "Contents": [{"Key": "data/top.csv", "LastModified": datetime.now()}],
+            "CommonPrefixes": [{"Prefix": "data/a/"}, {"Prefix": "data/b/"}],
+            "KeyCount": 3,
+        },
+        "data/a/": {"Contents": [{"Key": "data/a/1.csv", "LastModified": datetime.now()}], "KeyCount": 1},
+        "data/b/": {
+            "Contents": [{"Key": "data/b/2.csv", "LastModified": datetime.now()}, {"Key": "data/b/", "LastModified": datetime.now()}],
+            "KeyCount": 2,
+        },
+    }
+
+    with patch.object(SourceS3StreamReader, "s3_client", new_callable=MagicMock) as mock_s3_client:
+        mock_s3_client.list_objects_v2 = MagicMock(side_effect=lambda Bucket, Prefix, **kwargs: responses[Prefix])
+        files = list(reader.get_matching_files(["data/**/*.csv", "data/a/*.csv"], None, logger))
+
+    assert sorted(f.uri for f in files) == ["data/a/1.csv", "data/b/2.csv", "data/top.csv"]
+    calls = {call.kwargs["Prefix"]: call.kwargs for call in mock_s3_client.list_objects_v2.call_args_list}
+    # "data/a/" is covered by "data/" and only listed once, as a sub-prefix
+    assert mock_s3_client.list_objects_v2.call_count == 3
+    assert calls["data/"]["Delimiter"] == "/"
+    assert "Delimiter" not in calls["data/a/"]
+
+
+def test_get_matching_files_raises_error_from_listing_thread():
+    reader = SourceS3StreamReader()
+    reader.config = Config(bucket="test", aws_access_key_id="test", aws_secret_access_key="test", streams=[])
+
+    def list_objects_v2(Bucket, Prefix, **kwargs):
+        if Prefix == "b/":
+            raise ValueError("listing failed")
+        return {"Contents": [{"Key": f"{Prefix}{i}.csv", "LastModified": datetime.now()} for i in range(10)], "KeyCount": 10}
+
+    with patch.object(SourceS3StreamReader, "s3_client", new_callable=MagicMock) as mock_s3_client:
+        mock_s3_client.list_objects_v2 = MagicMock(side_effect=list_objects_v2)
+        with pytest.raises(ErrorListingFiles):
+            list(reader.get_matching_files(["a/*.csv", "b/*.csv"], None, logger))
+
+
+@pytest.mark.parametrize(
+    "prefixes, expected_prefixes",
+    (
+        (["a/", "a/b/", "b"], ["a/", "b"]),
+        (["a/b/", None], [None]),
+        (["ab/", "a/"], ["a/", "ab/"]),
+    ),
+)
+def test_remove_nested_prefixes(prefixes, expected_prefixes) -> None:
+    assert ConcurrentPrefixLister.remove_nested_prefixes(prefixes) == expected_prefixes
+
+
+def test_start_date_is_parsed_once_when_config_is_set() -> None:
+    reader = SourceS3StreamReader()
+    reader.config = Config(
+        bucket="test", aws_access_key_id="test", aws_secret_access_key="test", streams=[], start_date="2024-01-01T00:00:00Z"
+    )
+
+    with patch("pendulum.parse") as parse_mock:
+        assert reader.is_modified_after_start_date(datetime(2024, 1, 2))
+        assert not reader.is_modified_after_start_date(datetime(2023, 12, 31))
+    parse_mock.assert_not_called()
+
+
+@patch("boto3.client")
+def test_file_size_uses_head_object(boto3_client_mock) -> None:
+    boto3_client_mock.return_value.head_object.return_value = {"ContentLength": 1234}
+    reader = SourceS3StreamReader()
+    reader.config = Config(bucket="test", aws_access_key_id="test", aws_secret_access_key="test", streams=[])
+
+    assert reader.file_size(RemoteFile(uri="directory/file.txt", last_modified=datetime.now())) == 1234
+    boto3_client_mock.return_value.head_object.assert_called_once_with(Bucket="test", Key="directory/file.txt")
+    boto3_client_mock.return_value.get_object.assert_not_called()
+    assert boto3_client_mock.call_args.kwargs["config"].max_pool_connections == SourceS3StreamReader.MAX_POOL_CONNECTIONS
+
+
+@patch("source_s3.v4.stream_reader.SourceS3StreamReader.file_size")
+@patch("boto3.client")
+def test_upload_downloads_ranges_concurrently(mock_boto_client, s3_reader_file_size_mock, tmp_path) -> None:
+    s3_reader_file_size_mock.return_value = 100
+    reader = SourceS3StreamReader()
+    reader.config = Config(
+        bucket="test",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+        streams=[],
+        delivery_method={"delivery_type": "use_file_transfer"},
+    )
+
+    reader.upload(RemoteFile(uri="directory/file.txt", last_modified=datetime.now()), str(tmp_path), logger)
+
+    transfer_config = mock_boto_client.return_value.download_file.call_args.kwargs["Config"]
+    assert transfer_config.max_concurrency == S3FileDownloader.MAX_CONCURRENCY_PER_FILE
+    assert transfer_config.multipart_chunksize == S3FileDownloader.MULTIPART_CHUNKSIZE
+
+
+def test_closing_the_listing_stops_paging():
+    lock = threading.Lock()
+    calls = []
+
+    def list_objects_v2(Bucket, Prefix, **kwargs):
+        with lock:
+            calls.append(Prefix)
+        threading.Event().wait(0.01)
+        # "b/" only holds objects that don't match, in more pages than the listing could go through during the test
+        key = f"{Prefix}file.csv" if Prefix == "a/" else f"{Prefix}file.txt"
+        response = {"Contents": [{"Key": key, "LastModified": datetime.now()}], "KeyCount": 1}
+        if len(calls) < 1000:
+            response["NextContinuationToken"] = "next"
+        return response
+
+    s3 = MagicMock()
+    s3.list_objects_v2 = MagicMock(side_effect=list_objects_v2)
+    handle_object = lambda file: [RemoteFile(uri=file["Key"], last_modified=file["LastModified"])] if file["Key"].endswith(".csv") else []
+    lister = ConcurrentPrefixLister(s3, "test", handle_object, logger, split_depth=0, queue_size=1)
+
+    files = lister.list(["a/", "b/"])
+    assert next(files).uri == "a/file.csv"
+    files.close()
+
+    threading.Event().wait(0.05)
+    with lock:
+        n_calls = len(calls)
+    threading.Event().wait(0.2)
+    assert len(calls) == n_calls
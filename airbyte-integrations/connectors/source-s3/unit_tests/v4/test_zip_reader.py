@@ -138,3 +138,55 @@ def test_zip_content_reader_iteration():
 
     # Verify the lines extracted match expected values
     assert lines == ["line1\n", "line2\r", "line3\r\n", "line4\n"]
+
+
+def _zip_member_reader(content: bytes, compression: int, encoding=None, buffer_size: int = 7) -> ZipContentReader:
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", compression=compression) as zf:
+        zf.writestr("data.csv", content)
+    with zipfile.ZipFile(archive) as zf:
+        zip_info = zf.getinfo("data.csv")
+    file_info = RemoteFileInsideArchive(
+        uri="archive.zip#data.csv",
+        last_modified=datetime.datetime(2022, 12, 28),
+        start_offset=zip_info.header_offset,
+        compressed_size=zip_info.compress_size,
+        uncompressed_size=zip_info.file_size,
+        compression_method=zip_info.compress_type,
+    )
+    archive.seek(0)
+    return ZipContentReader(DecompressedStream(archive, file_info, buffer_size=buffer_size), encoding, buffer_size=buffer_size)
+
+
+@pytest.mark.parametrize("compression", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+def test_zip_content_reader_splits_lines_across_blocks(compression):
+    text = "id,name\r\n1,zürich\r2,日本語の名前\n\n3,a very long line that spans several blocks\r\n4,last"
+    reader = _zip_member_reader(text.encode("utf-8"), compression, encoding="utf-8")
+
+    assert list(reader) == text.splitlines(keepends=True)
+
+
+def test_zip_content_reader_reads_bytes():
+    content = b"a,b\r\n" * 1000
+    reader = _zip_member_reader(content, zipfile.ZIP_DEFLATED)
+
+    assert reader.readline() == b"a,b\r\n"
+    assert reader.readline(2) == b"a,"
+    assert reader.tell() == 7
+    assert reader.read(3) == b"b\r\n"
+    buffer = bytearray(5)
+    assert reader.readinto(buffer) == 5
+    assert bytes(buffer) == b"a,b\r\n"
+    assert reader.read() == content[15:]
+    assert reader.read() == b""
+
+
+def test_zip_content_reader_seek_start_and_close():
+    reader = _zip_member_reader("héllo\nworld\n".encode("utf-8"), zipfile.ZIP_DEFLATED, encoding="utf-8")
+
+    assert reader.read() == "héllo\nworld\n"
+    reader.seek(0)
+    assert reader.readlines() == ["héllo\n", "world\n"]
+    with reader:
+        pass
+    assert reader.closed